@@ -5,7 +5,8 @@ Clean and format MCP response text using regex and URL metadata support
 
 import copy
 import json
-import re
+
+from src.utils.text_normalizer import normalize_pdf_text
 
 # Import the new result formatter
 try:
@@ -16,59 +17,8 @@ except ImportError:
 
 
 def clean_text_content(text):
-    """Clean text content using regex patterns"""
-
-    # Remove excessive whitespace and normalize line breaks
-    text = re.sub(r"\r\n", "\n", text)  # Convert Windows line endings
-    text = re.sub(r"\r", "\n", text)  # Convert old Mac line endings
-
-    # Fix common PDF extraction issues
-    text = re.sub(r"([a-z])([A-Z])", r"\1 \2", text)  # Add space between camelCase
-    text = re.sub(r"([a-z])(\d)", r"\1 \2", text)  # Add space between letter and number
-    text = re.sub(r"(\d)([A-Z])", r"\1 \2", text)  # Add space between number and letter
-
-    # Fix hyphenated words split across lines
-    text = re.sub(r"([a-z])-\s*\n\s*([a-z])", r"\1\2", text)
-
-    # Remove excessive spaces
-    text = re.sub(r" {2,}", " ", text)
-
-    # Fix paragraph breaks
-    text = re.sub(r"\n{3,}", "\n\n", text)
-
-    # Remove trailing whitespace from lines
-    text = re.sub(r"[ \t]+$", "", text, flags=re.MULTILINE)
-
-    # Fix broken words at line endings (common in PDFs)
-    text = re.sub(r"([a-z])\s*\n\s*([a-z])", r"\1\2", text)
-
-    # Fix spacing around punctuation
-    text = re.sub(r"\s+([,.;:!?])", r"\1", text)
-    text = re.sub(r"([,.;:!?])([A-Za-z])", r"\1 \2", text)
-
-    # Fix common PDF text extraction issues
-    text = re.sub(r"([a-z])([A-Z][a-z])", r"\1 \2", text)  # camelCase fixes
-    text = re.sub(r"(\w)(\d+)", r"\1 \2", text)  # word-number spacing
-    text = re.sub(r"(\d+)([A-Za-z])", r"\1 \2", text)  # number-word spacing
-
-    # Fix common encoding issues
-    text = re.sub(r"â\x80\x99", "'", text)  # Fix apostrophes
-    text = re.sub(r"â\x80\x9c", '"', text)  # Fix opening quotes
-    text = re.sub(r"â\x80\x9d", '"', text)  # Fix closing quotes
-    text = re.sub(r"â\x80\x93", "–", text)  # Fix en-dash
-    text = re.sub(r"â\x80\x94", "—", text)  # Fix em-dash
-    text = re.sub(r"â\x80\xa6", "...", text)  # Fix ellipsis
-
-    # Remove control characters except newlines and tabs
-    text = re.sub(r"[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]", "", text)
-
-    # Fix common PDF artifacts
-    text = re.sub(r"\x0c", "\n", text)  # Form feed to newline
-    text = re.sub(r"\\r\\n", "\n", text)  # Escaped line breaks
-    text = re.sub(r"\\n", "\n", text)  # Escaped newlines
-    text = re.sub(r"\\t", "\t", text)  # Escaped tabs
-
-    return text.strip()
+    """Clean text content using the precompiled PDF normalization rules"""
+    return normalize_pdf_text(text)
 
 
 def format_bitcoin_content(content_item):
@@ -1,4 +1,6 @@
 # Gunicorn configuration for Bitcoin Knowledge Assistant
+import os
+
 bind = "0.0.0.0:8000"
 workers = 4
 worker_class = "uvicorn.workers.UvicornWorker"
@@ -25,3 +27,25 @@ proc_name = "bitcoin-assistant-api"
 limit_request_line = 4096
 limit_request_fields = 100
 limit_request_field_size = 8190
+
+# Share URL validation/accessibility results between workers (SQLite, WAL)
+os.environ.setdefault("URL_PERSISTENT_CACHE_PATH", "data/url_cache.db")
+
+# Workers write their metrics to per-process files here so /metrics and the
+# admin stats report the whole server rather than one worker
+os.environ.setdefault("METRICS_MULTIPROC_DIR", "data/metrics")
+
+# Write URL metadata logs from a background thread, not the request path
+os.environ.setdefault("URL_METADATA_LOG_ASYNC", "true")
+
+
+def on_starting(server):
+    from btc_max_knowledge_agent.utils.metrics_multiprocess import clear_directory
+
+    clear_directory()
+
+
+def child_exit(server, worker):
+    from btc_max_knowledge_agent.utils.metrics_multiprocess import mark_process_dead
+
+    mark_process_dead(worker.pid)
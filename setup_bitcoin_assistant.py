@@ -30,7 +30,11 @@ def main():
         # Step 1: Collect Bitcoin documents
         print("1. Collecting Bitcoin and blockchain documents...")
         collector = BitcoinDataCollector()
-        documents = collector.collect_all_documents(max_news_articles=50)
+        # Checkpointed so an interrupted run resumes instead of re-downloading
+        documents = collector.collect_all_documents(
+            max_news_articles=50,
+            checkpoint_path="data/collection_checkpoint.jsonl",
+        )
 
         if not documents:
             print("❌ No documents collected. Exiting.")
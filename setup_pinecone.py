@@ -44,7 +44,11 @@ def main():
         collector = BitcoinDataCollector()
 
         print("4. Collecting Bitcoin and blockchain documents...")
-        documents = collector.collect_all_documents(max_news_articles=50)
+        # Checkpointed so an interrupted run resumes instead of re-downloading
+        documents = collector.collect_all_documents(
+            max_news_articles=50,
+            checkpoint_path="data/collection_checkpoint.jsonl",
+        )
 
         if not documents:
             print("❌ No documents collected. Exiting.")
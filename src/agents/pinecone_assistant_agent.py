@@ -1,6 +1,11 @@
 from dataclasses import dataclass, field
 from typing import Any, Awaitable, Callable, Dict, List, Optional
 
+try:
+    from btc_max_knowledge_agent.utils.url_metadata_logger import get_correlation_id
+except ImportError:  # pragma: no cover
+    from src.utils.url_metadata_logger import get_correlation_id  # type: ignore
+
 
 # Type alias for DI: matches secure_preprocess(text, context) signature
 SecurityProcessor = Callable[[str, Optional[Dict[str, Any]]], Awaitable[Any]]
@@ -51,6 +56,9 @@ class PineconeAssistantAgent:
         """
         sec_proc = await self._get_security_processor()
 
+        # Callers inside a correlation context need not pass the ID along
+        request_id = request_id or get_correlation_id()
+
         context: Dict[str, Any] = {}
         if session_id:
             context["session_id"] = session_id
@@ -0,0 +1 @@
+../../utils/async_url_checker.py
\ No newline at end of file
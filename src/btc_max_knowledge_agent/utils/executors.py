@@ -0,0 +1 @@
+../../utils/executors.py
\ No newline at end of file
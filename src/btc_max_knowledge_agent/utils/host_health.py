@@ -0,0 +1 @@
+../../utils/host_health.py
\ No newline at end of file
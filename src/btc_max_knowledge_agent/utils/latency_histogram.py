@@ -0,0 +1 @@
+../../utils/latency_histogram.py
\ No newline at end of file
@@ -0,0 +1 @@
+../../utils/log_sampling.py
\ No newline at end of file
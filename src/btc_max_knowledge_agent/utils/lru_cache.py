@@ -0,0 +1 @@
+../../utils/lru_cache.py
\ No newline at end of file
@@ -0,0 +1 @@
+../../utils/metrics_multiprocess.py
\ No newline at end of file
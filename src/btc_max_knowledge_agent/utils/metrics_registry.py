@@ -0,0 +1 @@
+../../utils/metrics_registry.py
\ No newline at end of file
@@ -0,0 +1 @@
+../../utils/persistent_url_cache.py
\ No newline at end of file
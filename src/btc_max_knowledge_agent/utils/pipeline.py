@@ -0,0 +1 @@
+../../utils/pipeline.py
\ No newline at end of file
@@ -0,0 +1 @@
+../../utils/ssrf_guard.py
\ No newline at end of file
@@ -0,0 +1 @@
+../../utils/text_normalizer.py
\ No newline at end of file
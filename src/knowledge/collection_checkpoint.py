@@ -0,0 +1,216 @@
+"""
+Checkpoint journal for resumable document collection runs.
+
+A checkpoint is an append-only JSON Lines file. Every event (a collected
+document, a finished work item such as an RSS feed, a finished source) is
+written and flushed as soon as it happens, so a crash loses at most the
+record that was being written. On restart the journal is replayed, and a
+torn last record cut off, to find out which sources are already complete
+and which items of a partially collected source can be skipped.
+"""
+
+import json
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_FORMAT_VERSION = 1
+
+
+class CollectionCheckpoint:
+    """Persist per-source progress and collected documents for a collection run."""
+
+    def __init__(self, path: Union[str, Path], fsync: bool = True):
+        """
+        Open (or create) a checkpoint journal.
+
+        Args:
+            path: Location of the JSON Lines journal file
+            fsync: Whether to fsync after every appended event. Disable only
+                   for tests or when durability is handled elsewhere.
+        """
+        self.path = Path(path)
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._sources: Dict[str, Dict[str, Any]] = {}
+        self.run_id: Optional[str] = None
+        self.started_at: Optional[str] = None
+        self.run_complete = False
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._load()
+        if self.run_id is None:
+            self._start_run()
+
+    # ------------------------------------------------------------------
+    # Journal replay / append
+    # ------------------------------------------------------------------
+    def _load(self) -> None:
+        """Replay an existing journal, cutting off a torn trailing record."""
+        if not self.path.exists():
+            return
+
+        valid_end = 0
+        with open(self.path, "rb") as f:
+            for line_number, raw in enumerate(f, start=1):
+                try:
+                    if not raw.endswith(b"\n"):
+                        raise ValueError("unterminated record")
+                    line = raw.decode("utf-8").strip()
+                    event = json.loads(line) if line else None
+                except ValueError:
+                    # A crash mid-write leaves a partial last line; anything
+                    # after it cannot be trusted either.
+                    logger.warning(
+                        "Ignoring corrupt checkpoint record at %s:%d",
+                        self.path,
+                        line_number,
+                    )
+                    break
+                if event is not None:
+                    self._apply(event)
+                valid_end += len(raw)
+
+        # New events must follow the last good record, or every later replay
+        # would stop at the torn one and lose them
+        if valid_end < self.path.stat().st_size:
+            with open(self.path, "r+b") as f:
+                f.truncate(valid_end)
+
+    def _apply(self, event: Dict[str, Any]) -> None:
+        """Apply a single journal event to the in-memory state."""
+        kind = event.get("event")
+        source = event.get("source")
+
+        if kind == "run_start":
+            self.run_id = event.get("run_id")
+            self.started_at = event.get("timestamp")
+            return
+        if kind == "run_complete":
+            self.run_complete = True
+            return
+        if source is None:
+            return
+
+        state = self._source_state(source)
+        if kind == "document":
+            state["documents"].append(event.get("document", {}))
+            if event.get("item") is not None:
+                state["items"].add(event["item"])
+        elif kind == "item":
+            state["items"].add(event.get("item"))
+        elif kind == "source_complete":
+            state["complete"] = True
+
+    def _append(self, event: Dict[str, Any]) -> None:
+        """Apply an event and append it durably to the journal."""
+        event.setdefault("timestamp", datetime.now(timezone.utc).isoformat())
+        line = json.dumps(event, ensure_ascii=False)
+        with self._lock:
+            self._apply(event)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+
+    def _source_state(self, source: str) -> Dict[str, Any]:
+        if source not in self._sources:
+            self._sources[source] = {
+                "documents": [],
+                "items": set(),
+                "complete": False,
+            }
+        return self._sources[source]
+
+    def _start_run(self) -> None:
+        self._append(
+            {
+                "event": "run_start",
+                "run_id": str(uuid.uuid4()),
+                "version": CHECKPOINT_FORMAT_VERSION,
+            }
+        )
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def is_source_complete(self, source: str) -> bool:
+        """Return True if every item of ``source`` has been collected."""
+        with self._lock:
+            return self._sources.get(source, {}).get("complete", False)
+
+    def is_item_done(self, source: str, item: str) -> bool:
+        """Return True if ``item`` (e.g. a feed or article URL) was already handled."""
+        with self._lock:
+            state = self._sources.get(source)
+            return bool(state) and item in state["items"]
+
+    def source_documents(self, source: str) -> List[Dict[str, Any]]:
+        """Return a copy of the documents collected so far for ``source``."""
+        with self._lock:
+            state = self._sources.get(source)
+            return list(state["documents"]) if state else []
+
+    def progress(self) -> Dict[str, Dict[str, Any]]:
+        """Summarise per-source progress for logging and reporting."""
+        with self._lock:
+            return {
+                source: {
+                    "documents": len(state["documents"]),
+                    "items_done": len(state["items"]),
+                    "complete": state["complete"],
+                }
+                for source, state in self._sources.items()
+            }
+
+    # ------------------------------------------------------------------
+    # Mutations
+    # ------------------------------------------------------------------
+    def record_document(
+        self, source: str, document: Dict[str, Any], item: Optional[str] = None
+    ) -> None:
+        """Persist a collected document, optionally marking ``item`` as done."""
+        event: Dict[str, Any] = {
+            "event": "document",
+            "source": source,
+            "document": document,
+        }
+        if item is not None:
+            event["item"] = item
+        self._append(event)
+
+    def mark_item_done(self, source: str, item: str) -> None:
+        """Mark a unit of work within ``source`` as handled."""
+        self._append({"event": "item", "source": source, "item": item})
+
+    def mark_source_complete(self, source: str) -> None:
+        """Mark ``source`` as fully collected."""
+        self._append(
+            {
+                "event": "source_complete",
+                "source": source,
+                "document_count": len(self.source_documents(source)),
+            }
+        )
+
+    def mark_run_complete(self) -> None:
+        """Mark the whole run as finished; the next run starts from scratch."""
+        self._append({"event": "run_complete"})
+
+    def reset(self) -> None:
+        """Discard all recorded progress and start a new run."""
+        with self._lock:
+            self._sources.clear()
+            self.run_id = None
+            self.started_at = None
+            self.run_complete = False
+            if self.path.exists():
+                self.path.unlink()
+        self._start_run()
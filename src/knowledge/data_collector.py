@@ -1,13 +1,17 @@
 import json
 import os
 import time
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import feedparser
 import requests
 from newspaper import Article
 
 from btc_max_knowledge_agent.monitoring.url_metadata_monitor import URLMetadataMonitor
+from btc_max_knowledge_agent.utils.executors import get_executor
+from btc_max_knowledge_agent.utils.log_sampling import log_sampler
+from btc_max_knowledge_agent.utils.text_normalizer import normalize_article_text
+from knowledge.collection_checkpoint import CollectionCheckpoint
 from utils.url_error_handler import (
     FallbackURLStrategy,
     GracefulDegradation,
@@ -21,6 +25,9 @@ from utils.url_utils import extract_domain, sanitize_url_for_storage, validate_u
 
 # Add src to path to ensure imports work
 
+# Source names used as checkpoint keys, in collection order
+COLLECTION_SOURCES = ("bitcoin_basics", "genius_act", "dapp", "rss")
+
 
 class BitcoinDataCollector:
     def __init__(self, check_url_accessibility: bool = False):
@@ -92,9 +99,24 @@ class BitcoinDataCollector:
         raise_on_exhaust=False,
         fallback_result=[],
     )
-    def collect_from_rss(self, max_articles: int = 20) -> List[Dict[str, Any]]:
-        """Collect articles from RSS feeds with retry logic"""
-        articles: List[Dict[str, Any]] = []
+    def collect_from_rss(
+        self,
+        max_articles: int = 20,
+        checkpoint: Optional[CollectionCheckpoint] = None,
+    ) -> List[Dict[str, Any]]:
+        """Collect articles from RSS feeds with retry logic
+
+        Args:
+            max_articles: Maximum number of articles to take from each feed
+            checkpoint: Optional checkpoint journal. When given, previously
+                collected articles are reused, finished feeds and articles are
+                skipped, and every new article is persisted as soon as it is
+                extracted.
+        """
+        # Seed with checkpointed articles so generated ids stay contiguous
+        articles: List[Dict[str, Any]] = (
+            checkpoint.source_documents("rss") if checkpoint else []
+        )
 
         with correlation_context() as correlation_id:
             self.validation_logger.info(
@@ -107,6 +129,9 @@ class BitcoinDataCollector:
             )
 
         for feed_url in self.rss_feeds:
+            if checkpoint and checkpoint.is_item_done("rss", feed_url):
+                continue
+
             with correlation_context() as feed_correlation_id:
                 try:
                     print(f"Fetching RSS feed: {feed_url}")
@@ -136,95 +161,21 @@ class BitcoinDataCollector:
                         },
                     )
 
-                    for entry in feed.entries[:max_articles]:
-                        try:
-                            article_start = time.time()
-                            self.validation_logger.info(
-                                "Processing article",
-                                extra={
-                                    "correlation_id": feed_correlation_id,
-                                    "article_url": entry.link,
-                                    "feed_url": feed_url,
-                                },
-                            )
-
-                            article = Article(entry.link)
-                            article.download()
-                            article.parse()
-
-                            article_duration = (time.time() - article_start) * 1000
-
-                            if (
-                                len(article.text) > 500
-                            ):  # Only include substantial articles
-                                # Sanitize URL before adding
-                                sanitized_url = sanitize_url_for_storage(entry.link)
-                                if not sanitized_url:
-                                    sanitized_url = FallbackURLStrategy.domain_only_url(
-                                        entry.link
-                                    )
-
-                                article_data = {
-                                    "id": f"rss_{len(articles)}",
-                                    "title": entry.title,
-                                    "content": article.text,
-                                    "source": feed_url,
-                                    "category": "news",
-                                    "url": sanitized_url or entry.link,
-                                    "published": entry.get("published", ""),
-                                }
-                                articles.append(article_data)
-
-                                self.validation_logger.info(
-                                    "Article extracted successfully",
-                                    extra={
-                                        "correlation_id": feed_correlation_id,
-                                        "article_url": entry.link,
-                                        "article_title": entry.title,
-                                        "content_length": len(article.text),
-                                        "duration_ms": article_duration,
-                                    },
-                                )
-
-                                # Record URL extraction metric
-                                self.monitor.record_validation(
-                                    url=entry.link,
-                                    valid=True,
-                                    duration_ms=article_duration,
-                                    correlation_id=feed_correlation_id,
-                                )
-                            else:
-                                self.validation_logger.warning(
-                                    "Article too short",
-                                    extra={
-                                        "correlation_id": feed_correlation_id,
-                                        "article_url": entry.link,
-                                        "content_length": len(article.text),
-                                    },
-                                )
-
-                            time.sleep(1)  # Be respectful
-
-                        except Exception as e:
-                            print(f"Error processing article {entry.link}: {e}")
-                            self.validation_logger.error(
-                                "Failed to process article",
-                                extra={
-                                    "correlation_id": feed_correlation_id,
-                                    "article_url": entry.link,
-                                    "error": str(e),
-                                },
-                            )
+                    entries = feed.entries[:max_articles]
+                    self.collect_feed_entries(
+                        feed_url,
+                        entries,
+                        articles=articles,
+                        checkpoint=checkpoint,
+                        correlation_id=feed_correlation_id,
+                    )
 
-                            # Record failure metric
-                            self.monitor.record_validation(
-                                url=entry.link,
-                                valid=False,
-                                duration_ms=(time.time() - article_start) * 1000,
-                                error=str(e),
-                                correlation_id=feed_correlation_id,
-                            )
-                            continue
+                    # The feed is finished once every article was extracted or
+                    # skipped as too short; failed ones are retried on resume
+                    if checkpoint and all(
+                        checkpoint.is_item_done("rss", entry.link) for entry in entries
+                    ):
+                        checkpoint.mark_item_done("rss", feed_url)
 
                 except Exception as e:
                     print(f"Error fetching RSS feed {feed_url}: {e}")
@@ -238,6 +189,7 @@ class BitcoinDataCollector:
                     )
                     continue
 
+        log_sampler.flush_summaries()
         self.metrics_logger.info(
             "RSS collection completed",
             extra={
@@ -246,6 +198,140 @@ class BitcoinDataCollector:
             },
         )
 
+        # Only a run where every feed was fetched counts as complete; failed
+        # feeds are retried on the next resume.
+        if checkpoint and all(
+            checkpoint.is_item_done("rss", feed_url) for feed_url in self.rss_feeds
+        ):
+            checkpoint.mark_source_complete("rss")
+
+        return articles
+
+    def collect_feed_entries(
+        self,
+        feed_url: str,
+        entries: List[Any],
+        articles: Optional[List[Dict[str, Any]]] = None,
+        checkpoint: Optional[CollectionCheckpoint] = None,
+        correlation_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Download and extract the articles behind already-fetched feed entries
+
+        Args:
+            feed_url: Feed the entries came from (stored as the article source)
+            entries: feedparser entries to process
+            articles: List to append extracted articles to; generated ids
+                continue from its current length
+            checkpoint: Optional checkpoint journal (see ``collect_from_rss``)
+            correlation_id: Correlation ID for log records and metrics
+
+        Returns:
+            The ``articles`` list with newly extracted articles appended
+        """
+        if articles is None:
+            articles = []
+
+        for entry in entries:
+            if checkpoint and checkpoint.is_item_done("rss", entry.link):
+                continue
+
+            try:
+                article_start = time.time()
+                # Per-article progress is sampled (the first article of each
+                # feed always); warnings and failures are always logged
+                log_article = log_sampler.should_log(
+                    "rss_article", feed_url, logger=self.validation_logger
+                )
+                if log_article:
+                    self.validation_logger.info(
+                        "Processing article",
+                        extra={
+                            "correlation_id": correlation_id,
+                            "article_url": entry.link,
+                            "feed_url": feed_url,
+                        },
+                    )
+
+                article = Article(entry.link)
+                article.download()
+                article.parse()
+                text = normalize_article_text(article.text or "")
+
+                article_duration = (time.time() - article_start) * 1000
+
+                if len(text) > 500:  # Only include substantial articles
+                    # Sanitize URL before adding
+                    sanitized_url = sanitize_url_for_storage(entry.link)
+                    if not sanitized_url:
+                        sanitized_url = FallbackURLStrategy.domain_only_url(entry.link)
+
+                    article_data = {
+                        "id": f"rss_{len(articles)}",
+                        "title": entry.title,
+                        "content": text,
+                        "source": feed_url,
+                        "category": "news",
+                        "url": sanitized_url or entry.link,
+                        "published": entry.get("published", ""),
+                    }
+                    articles.append(article_data)
+                    if checkpoint:
+                        checkpoint.record_document("rss", article_data, item=entry.link)
+
+                    if log_article:
+                        self.validation_logger.info(
+                            "Article extracted successfully",
+                            extra={
+                                "correlation_id": correlation_id,
+                                "article_url": entry.link,
+                                "article_title": entry.title,
+                                "content_length": len(text),
+                                "duration_ms": article_duration,
+                            },
+                        )
+
+                    # Record URL extraction metric
+                    self.monitor.record_validation(
+                        url=entry.link,
+                        valid=True,
+                        duration_ms=article_duration,
+                        correlation_id=correlation_id,
+                    )
+                else:
+                    self.validation_logger.warning(
+                        "Article too short",
+                        extra={
+                            "correlation_id": correlation_id,
+                            "article_url": entry.link,
+                            "content_length": len(text),
+                        },
+                    )
+                    if checkpoint:
+                        checkpoint.mark_item_done("rss", entry.link)
+
+                time.sleep(1)  # Be respectful
+
+            except Exception as e:
+                print(f"Error processing article {entry.link}: {e}")
+                self.validation_logger.error(
+                    "Failed to process article",
+                    extra={
+                        "correlation_id": correlation_id,
+                        "article_url": entry.link,
+                        "error": str(e),
+                    },
+                )
+
+                # Record failure metric
+                self.monitor.record_validation(
+                    url=entry.link,
+                    valid=False,
+                    duration_ms=(time.time() - article_start) * 1000,
+                    error=str(e),
+                    correlation_id=correlation_id,
+                )
+                continue
+
         return articles
 
     @exponential_backoff_retry(
@@ -938,66 +1024,179 @@ class BitcoinDataCollector:
 
             return validated_documents
 
+    def _collect_source(
+        self,
+        source: str,
+        collector: Callable[[], Optional[List[Dict[str, Any]]]],
+        checkpoint: Optional[CollectionCheckpoint],
+        correlation_id: str,
+        self_checkpointing: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Run one source collector, reusing checkpointed results when available.
+
+        Args:
+            source: Source name used as the checkpoint key
+            collector: Callable returning the collected documents
+            checkpoint: Optional checkpoint journal for the current run
+            correlation_id: Correlation ID of the surrounding collection run
+            self_checkpointing: True if ``collector`` records its own
+                progress in the checkpoint (e.g. per RSS article)
+
+        Returns:
+            List of documents for the source
+        """
+        if checkpoint and checkpoint.is_source_complete(source):
+            documents = checkpoint.source_documents(source)
+            self.validation_logger.info(
+                "Reusing checkpointed source",
+                extra={
+                    "correlation_id": correlation_id,
+                    "source": source,
+                    "document_count": len(documents),
+                },
+            )
+            return documents
+
+        documents = collector()
+        if documents is None:
+            # Retry decorator exhausted without a result; leave the source
+            # incomplete so a resumed run tries it again.
+            raise RuntimeError(f"Collector for {source} returned no result")
+
+        if checkpoint and not self_checkpointing:
+            for document in documents:
+                checkpoint.record_document(source, document)
+            checkpoint.mark_source_complete(source)
+
+        return documents
+
     def collect_all_documents(
-        self, max_news_articles: int = 30
+        self,
+        max_news_articles: int = 30,
+        checkpoint_path: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
-        """Collect all documents from various sources"""
+        """Collect all documents from various sources
+
+        Args:
+            max_news_articles: Maximum number of articles to take per RSS feed
+            checkpoint_path: Optional path of a checkpoint journal. When set,
+                progress and collected documents are written to disk as the
+                run proceeds, and an interrupted run with the same path
+                resumes where it stopped instead of starting over.
+
+        Returns:
+            List of collected documents with validated URLs
+        """
         all_documents = []
 
+        checkpoint = None
+        if checkpoint_path:
+            checkpoint = CollectionCheckpoint(checkpoint_path)
+            if checkpoint.run_complete:
+                # Previous run finished cleanly; start a fresh one
+                checkpoint.reset()
+
         with correlation_context() as main_correlation_id:
             self.validation_logger.info(
                 "Starting document collection",
                 extra={
                     "correlation_id": main_correlation_id,
                     "max_news_articles": max_news_articles,
+                    "checkpoint_path": checkpoint_path,
+                    "checkpoint_progress": (
+                        checkpoint.progress() if checkpoint else None
+                    ),
                 },
             )
 
             collection_start = time.time()
 
-            try:
-                print("Collecting Bitcoin basics...")
-                bitcoin_docs = self.collect_bitcoin_basics()
-                all_documents.extend(bitcoin_docs)
-            except Exception as e:
-                self.validation_logger.error(
-                    "Failed to collect Bitcoin basics",
-                    extra={"correlation_id": main_correlation_id, "error": str(e)},
-                )
-
-            try:
-                print("Collecting GENIUS Act information...")
-                genius_docs = self.collect_genius_act_info()
-                all_documents.extend(genius_docs)
-            except Exception as e:
-                self.validation_logger.error(
-                    "Failed to collect GENIUS Act info",
-                    extra={"correlation_id": main_correlation_id, "error": str(e)},
-                )
+            # (checkpoint key, label, collector, records its own checkpoint)
+            source_jobs = [
+                (
+                    "bitcoin_basics",
+                    "Bitcoin basics",
+                    self.collect_bitcoin_basics,
+                    False,
+                ),
+                (
+                    "genius_act",
+                    "GENIUS Act information",
+                    self.collect_genius_act_info,
+                    False,
+                ),
+                (
+                    "dapp",
+                    "dApp information",
+                    self.collect_dapp_information,
+                    False,
+                ),
+                (
+                    "rss",
+                    "news articles",
+                    lambda: self.collect_from_rss(
+                        max_news_articles, checkpoint=checkpoint
+                    ),
+                    True,
+                ),
+            ]
 
-            try:
-                print("Collecting dApp information...")
-                dapp_docs = self.collect_dapp_information()
-                all_documents.extend(dapp_docs)
-            except Exception as e:
-                self.validation_logger.error(
-                    "Failed to collect dApp information",
-                    extra={"correlation_id": main_correlation_id, "error": str(e)},
+            def run_source(
+                source: str,
+                label: str,
+                collector: Callable[[], Optional[List[Dict[str, Any]]]],
+                self_checkpointing: bool,
+            ) -> Tuple[List[Dict[str, Any]], float]:
+                """Collect one source; returns its documents and start time."""
+                print(f"Collecting {label}...")
+                source_start = time.time()
+                documents = self._collect_source(
+                    source,
+                    collector,
+                    checkpoint,
+                    main_correlation_id,
+                    self_checkpointing=self_checkpointing,
                 )
-
-            try:
-                print("Collecting news articles...")
-                news_docs = self.collect_from_rss(max_news_articles)
-                all_documents.extend(news_docs)
-            except Exception as e:
-                self.validation_logger.error(
-                    "Failed to collect news articles",
-                    extra={"correlation_id": main_correlation_id, "error": str(e)},
+                return documents, source_start
+
+            # Sources are independent: run them concurrently on the shared
+            # I/O pool so the whole collection takes roughly as long as the
+            # slowest source. Each source's URLs are validated here as soon
+            # as it finishes: from a pool worker the batch validation would
+            # run inline, one URL at a time. A failing source is logged and
+            # skipped without affecting others.
+            source_results: Dict[str, List[Dict[str, Any]]] = {}
+            for job, future in get_executor("io").map_unordered(
+                lambda job: run_source(*job), source_jobs
+            ):
+                source, label = job[:2]
+                try:
+                    documents, source_start = future.result()
+                    documents = self.validate_document_urls(documents)
+                except Exception as e:
+                    self.validation_logger.error(
+                        f"Failed to collect {label}",
+                        extra={
+                            "correlation_id": main_correlation_id,
+                            "source": source,
+                            "error": str(e),
+                        },
+                    )
+                    continue
+                self.metrics_logger.info(
+                    "Source collection completed",
+                    extra={
+                        "correlation_id": main_correlation_id,
+                        "source": source,
+                        "document_count": len(documents),
+                        "duration_ms": (time.time() - source_start) * 1000,
+                    },
                 )
+                source_results[source] = documents
 
-            # Validate all document URLs in batch
-            print("Validating document URLs...")
-            all_documents = self.validate_document_urls(all_documents)
+            # Keep a deterministic document order regardless of finish order
+            for source in COLLECTION_SOURCES:
+                all_documents.extend(source_results.get(source, []))
 
             collection_duration = (time.time() - collection_start) * 1000
 
@@ -1014,6 +1213,16 @@ class BitcoinDataCollector:
                 },
             )
 
+            # A run is only finished once every source completed; otherwise
+            # keep the checkpoint so the next call resumes the missing parts.
+            if checkpoint:
+                progress = checkpoint.progress()
+                if all(
+                    progress.get(source, {}).get("complete")
+                    for source in COLLECTION_SOURCES
+                ):
+                    checkpoint.mark_run_complete()
+
             print(f"Total documents collected: {len(all_documents)}")
             return all_documents
 
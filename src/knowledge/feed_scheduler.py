@@ -0,0 +1,479 @@
+"""
+Adaptive per-feed polling scheduler for incremental RSS collection.
+
+Instead of re-fetching every feed on a fixed cycle, each feed gets its own
+poll interval learned from the publish timestamps of its entries. A feed
+that posts every half hour is polled often; a feed that posts weekly is
+polled rarely. Intervals are smoothed, bounded by ``min_interval`` and
+``max_interval``, backed off when a poll finds nothing new, and jittered so
+feeds do not synchronise into bursts.
+
+Polls are conditional (ETag / Last-Modified) and only entries that have not
+been seen before are downloaded, via
+``BitcoinDataCollector.collect_feed_entries``. Collected documents are
+handed to an ``on_documents`` callback, e.g. an ingest pipeline run.
+"""
+
+import calendar
+import copy
+import hashlib
+import json
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Union
+
+import feedparser
+
+from btc_max_knowledge_agent.utils.url_metadata_logger import (
+    URLMetadataLogger,
+    correlation_context,
+)
+
+# Number of most recent entry timestamps used to estimate a feed's cadence
+MAX_CADENCE_SAMPLES = 20
+
+# Number of entry links remembered per feed to detect new entries
+MAX_SEEN_LINKS = 500
+
+DocumentsCallback = Callable[[List[Dict[str, Any]]], None]
+
+# FeedState fields that record fetch progress; rolled back when the
+# collected documents could not be delivered
+PROGRESS_FIELDS = ("seen_links", "etag", "last_modified", "newest_entry_at")
+
+
+def entry_timestamp(entry: Any) -> Optional[float]:
+    """Return an entry's publish (or update) time as a UTC epoch, if known."""
+    for key in ("published_parsed", "updated_parsed"):
+        parsed = entry.get(key)
+        if parsed:
+            return float(calendar.timegm(parsed))
+    return None
+
+
+def estimate_publish_interval(
+    timestamps: Sequence[float], now: Optional[float] = None
+) -> Optional[float]:
+    """
+    Estimate the typical time between posts from entry timestamps.
+
+    Uses the median gap between the most recent ``MAX_CADENCE_SAMPLES``
+    entries. The time elapsed since the newest entry counts as one more gap,
+    so a feed that has gone quiet is estimated as slower than its history.
+
+    Args:
+        timestamps: Entry publish times (epoch seconds), in any order
+        now: Current time; defaults to ``time.time()``
+
+    Returns:
+        Estimated seconds between posts, or None without any timestamps
+    """
+    if not timestamps:
+        return None
+    now = time.time() if now is None else now
+    recent = sorted(timestamps, reverse=True)[:MAX_CADENCE_SAMPLES]
+    gaps = [newer - older for newer, older in zip(recent, recent[1:])]
+    gaps.append(max(0.0, now - recent[0]))
+    positive = [gap for gap in gaps if gap > 0]
+    return statistics.median(positive) if positive else None
+
+
+def stable_document_id(url: str) -> str:
+    """Derive an id that stays the same across polls for the same article."""
+    return "rss_" + hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+
+
+class HandledEntries:
+    """
+    Checkpoint stand-in passed to ``collect_feed_entries``.
+
+    Records which entry links were collected or deliberately skipped (too
+    short), so entries that failed to download are not marked as seen.
+    """
+
+    def __init__(self) -> None:
+        self.links: Set[str] = set()
+
+    def is_item_done(self, source: str, item: str) -> bool:
+        return False
+
+    def record_document(
+        self, source: str, document: Dict[str, Any], item: Optional[str] = None
+    ) -> None:
+        if item is not None:
+            self.links.add(item)
+
+    def mark_item_done(self, source: str, item: str) -> None:
+        self.links.add(item)
+
+
+@dataclass
+class FeedState:
+    """Learned schedule and incremental-fetch state for one feed."""
+
+    feed_url: str
+    interval: float
+    next_poll_at: float = 0.0
+    last_polled_at: Optional[float] = None
+    newest_entry_at: Optional[float] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    seen_links: List[str] = field(default_factory=list)
+    polls: int = 0
+    empty_polls: int = 0
+    failures: int = 0
+
+
+class AdaptiveFeedScheduler:
+    """Poll each RSS feed on its own learned cadence and collect new entries."""
+
+    def __init__(
+        self,
+        collector: Any,
+        on_documents: Optional[DocumentsCallback] = None,
+        min_interval: float = 300.0,
+        max_interval: float = 6 * 3600.0,
+        initial_interval: float = 1800.0,
+        jitter: float = 0.1,
+        polls_per_post: float = 2.0,
+        smoothing: float = 0.5,
+        backoff_factor: float = 1.5,
+        max_articles: int = 20,
+        state_path: Optional[Union[str, Path]] = None,
+        clock: Callable[[], float] = time.time,
+        rng: Optional[random.Random] = None,
+    ):
+        """
+        Args:
+            collector: BitcoinDataCollector (provides rss_feeds, session and
+                collect_feed_entries)
+            on_documents: Called with the documents collected by each poll
+                cycle that found new articles
+            min_interval: Shortest allowed poll interval in seconds
+            max_interval: Longest allowed poll interval in seconds
+            initial_interval: Interval for feeds without any history
+            jitter: Random spread applied to each interval (0.1 = ±10%)
+            polls_per_post: How many polls to aim for per expected post
+            smoothing: Weight of the newest cadence estimate (0..1)
+            backoff_factor: Interval growth after a poll with no new entries
+            max_articles: Maximum number of new articles collected per poll
+            state_path: Optional JSON file persisting learned schedules so a
+                restart keeps cadences and does not re-collect seen entries
+            clock: Time source, injectable for tests
+            rng: Random source for jitter, injectable for tests
+        """
+        if min_interval <= 0 or max_interval < min_interval:
+            raise ValueError("Require 0 < min_interval <= max_interval")
+        if not 0 <= jitter < 1:
+            raise ValueError("jitter must be in [0, 1)")
+        if not 0 < smoothing <= 1:
+            raise ValueError("smoothing must be in (0, 1]")
+
+        self.collector = collector
+        self.on_documents = on_documents
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.initial_interval = self._clamp(initial_interval)
+        self.jitter = jitter
+        self.polls_per_post = polls_per_post
+        self.smoothing = smoothing
+        self.backoff_factor = backoff_factor
+        self.max_articles = max_articles
+        self.state_path = Path(state_path) if state_path else None
+        self.clock = clock
+        self.rng = rng or random.Random()
+
+        self.logger = URLMetadataLogger.get_logger("validation")
+        self.metrics_logger = URLMetadataLogger.get_logger("metrics")
+
+        self._lock = threading.Lock()
+        self._states: Dict[str, FeedState] = {}
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._load_state()
+        self._sync_feeds()
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+    def due_feeds(self, now: Optional[float] = None) -> List[str]:
+        """Return feeds whose next poll time has passed, most overdue first."""
+        now = self.clock() if now is None else now
+        self._sync_feeds()
+        with self._lock:
+            due = [s for s in self._states.values() if s.next_poll_at <= now]
+            return [s.feed_url for s in sorted(due, key=lambda s: s.next_poll_at)]
+
+    def seconds_until_next_poll(self, now: Optional[float] = None) -> float:
+        """Return how long to wait before any feed becomes due."""
+        now = self.clock() if now is None else now
+        with self._lock:
+            if not self._states:
+                return self.max_interval
+            next_at = min(s.next_poll_at for s in self._states.values())
+        return max(0.0, next_at - now)
+
+    def run_once(self) -> List[Dict[str, Any]]:
+        """
+        Poll every due feed once and collect its new entries.
+
+        Returns:
+            Documents collected in this cycle (also passed to ``on_documents``)
+        """
+        documents: List[Dict[str, Any]] = []
+        progress: Dict[str, Dict[str, Any]] = {}
+        for feed_url in self.due_feeds():
+            progress[feed_url] = self._progress(feed_url)
+            documents.extend(self.poll_feed(feed_url))
+
+        if documents and self.on_documents:
+            try:
+                self.on_documents(documents)
+            except Exception as e:
+                # Forget this cycle's entries so the next poll collects them
+                # again; keep the new poll times so a failing callback does
+                # not turn into a tight retry loop.
+                self._restore_progress(progress)
+                self.logger.error(
+                    "Feed scheduler document callback failed",
+                    extra={"error": str(e), "document_count": len(documents)},
+                )
+                return documents
+        self._save_state()
+        return documents
+
+    def run(self, stop_event: Optional[threading.Event] = None) -> None:
+        """Poll due feeds until ``stop_event`` (or ``stop()``) is set."""
+        stop_event = stop_event or self._stop_event
+        while not stop_event.is_set():
+            self.run_once()
+            stop_event.wait(self.seconds_until_next_poll())
+
+    def start(self) -> None:
+        """Run the scheduler loop in a background daemon thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self.run, name="feed-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the background loop and wait for the current cycle to finish."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def get_schedule(self) -> Dict[str, Dict[str, Any]]:
+        """Summarise the learned schedule of every feed."""
+        now = self.clock()
+        with self._lock:
+            return {
+                url: {
+                    "interval_seconds": state.interval,
+                    "next_poll_in_seconds": max(0.0, state.next_poll_at - now),
+                    "last_polled_at": state.last_polled_at,
+                    "newest_entry_at": state.newest_entry_at,
+                    "polls": state.polls,
+                    "empty_polls": state.empty_polls,
+                    "failures": state.failures,
+                }
+                for url, state in self._states.items()
+            }
+
+    # ------------------------------------------------------------------
+    # Polling
+    # ------------------------------------------------------------------
+    def poll_feed(self, feed_url: str) -> List[Dict[str, Any]]:
+        """
+        Fetch one feed conditionally and collect entries not seen before.
+
+        Returns:
+            Newly collected article documents with stable ids
+        """
+        with self._lock:
+            state = self._states.get(feed_url) or self._new_state(feed_url)
+            self._states[feed_url] = state
+
+        with correlation_context() as correlation_id:
+            now = self.clock()
+            try:
+                headers = {}
+                if state.etag:
+                    headers["If-None-Match"] = state.etag
+                if state.last_modified:
+                    headers["If-Modified-Since"] = state.last_modified
+
+                response = self.collector.session.get(
+                    feed_url, timeout=10, headers=headers
+                )
+                if response.status_code == 304:
+                    self._reschedule(state, now, estimate=None, found_new=False)
+                    return []
+                response.raise_for_status()
+                feed = feedparser.parse(response.content)
+            except Exception as e:
+                self.logger.error(
+                    "Scheduled RSS poll failed",
+                    extra={
+                        "correlation_id": correlation_id,
+                        "feed_url": feed_url,
+                        "error": str(e),
+                    },
+                )
+                with self._lock:
+                    state.failures += 1
+                self._reschedule(state, now, estimate=None, found_new=False)
+                return []
+
+            with self._lock:
+                seen = set(state.seen_links)
+
+            entries = [e for e in feed.entries if e.get("link")]
+            new_entries = [e for e in entries if e.link not in seen]
+            timestamps = [t for t in map(entry_timestamp, entries) if t is not None]
+
+            documents: List[Dict[str, Any]] = []
+            handled = HandledEntries()
+            if new_entries:
+                documents = self.collector.collect_feed_entries(
+                    feed_url,
+                    new_entries[: self.max_articles],
+                    articles=[],
+                    checkpoint=handled,
+                    correlation_id=correlation_id,
+                )
+                for document in documents:
+                    document["id"] = stable_document_id(document["url"])
+
+            with self._lock:
+                # Only collected or deliberately skipped entries count as
+                # seen; entries over max_articles and failed downloads are
+                # picked up by the next poll.
+                fresh = [e.link for e in new_entries if e.link in handled.links]
+                state.seen_links = (state.seen_links + fresh)[-MAX_SEEN_LINKS:]
+                if len(fresh) == len(new_entries):
+                    # A 304 must not hide entries that are still pending
+                    state.etag = response.headers.get("ETag") or state.etag
+                    state.last_modified = (
+                        response.headers.get("Last-Modified") or state.last_modified
+                    )
+                if timestamps:
+                    state.newest_entry_at = max(
+                        timestamps + [state.newest_entry_at or 0.0]
+                    )
+            self._reschedule(
+                state,
+                now,
+                estimate=estimate_publish_interval(timestamps, now),
+                found_new=bool(new_entries),
+            )
+
+            self.metrics_logger.info(
+                "Scheduled RSS poll completed",
+                extra={
+                    "correlation_id": correlation_id,
+                    "feed_url": feed_url,
+                    "entry_count": len(entries),
+                    "new_entries": len(new_entries),
+                    "documents": len(documents),
+                    "interval_seconds": state.interval,
+                },
+            )
+            return documents
+
+    def _reschedule(
+        self,
+        state: FeedState,
+        now: float,
+        estimate: Optional[float],
+        found_new: bool,
+    ) -> None:
+        """Update a feed's interval from the latest poll and set its next poll."""
+        with self._lock:
+            interval = state.interval
+            if estimate is not None:
+                target = estimate / self.polls_per_post
+                interval = self.smoothing * target + (1 - self.smoothing) * interval
+            if not found_new:
+                interval = max(interval, state.interval * self.backoff_factor)
+                state.empty_polls += 1
+            state.interval = self._clamp(interval)
+
+            spread = self.rng.uniform(-self.jitter, self.jitter)
+            state.next_poll_at = now + state.interval * (1 + spread)
+            state.last_polled_at = now
+            state.polls += 1
+
+    def _progress(self, feed_url: str) -> Dict[str, Any]:
+        with self._lock:
+            state = self._states[feed_url]
+            return {name: copy.copy(getattr(state, name)) for name in PROGRESS_FIELDS}
+
+    def _restore_progress(self, progress: Dict[str, Dict[str, Any]]) -> None:
+        with self._lock:
+            for feed_url, fields in progress.items():
+                state = self._states[feed_url]
+                for name, value in fields.items():
+                    setattr(state, name, value)
+
+    def _clamp(self, interval: float) -> float:
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def _new_state(self, feed_url: str) -> FeedState:
+        # New feeds are due immediately
+        return FeedState(feed_url=feed_url, interval=self.initial_interval)
+
+    def _sync_feeds(self) -> None:
+        """Track feeds added to the collector since the scheduler started."""
+        with self._lock:
+            for feed_url in self.collector.rss_feeds:
+                if feed_url not in self._states:
+                    self._states[feed_url] = self._new_state(feed_url)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def _load_state(self) -> None:
+        if not self.state_path or not self.state_path.exists():
+            return
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            with self._lock:
+                for item in data.get("feeds", []):
+                    state = FeedState(**item)
+                    state.interval = self._clamp(state.interval)
+                    self._states[state.feed_url] = state
+        except (OSError, ValueError, TypeError) as e:
+            self.logger.warning(
+                "Ignoring unreadable feed schedule state",
+                extra={"path": str(self.state_path), "error": str(e)},
+            )
+
+    def _save_state(self) -> None:
+        if not self.state_path:
+            return
+        with self._lock:
+            data = {"feeds": [asdict(state) for state in self._states.values()]}
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.state_path.parent, prefix=".feed_schedule_", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.state_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
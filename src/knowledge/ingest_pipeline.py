@@ -0,0 +1,289 @@
+"""
+Staged ingest pipeline: fetch → parse → validate → chunk → embed → upsert.
+
+Wires the document collection, URL validation and Pinecone upsert steps into
+a ``StagedPipeline`` so they overlap instead of handing whole document lists
+from one phase to the next. Each stage has its own concurrency and bounded
+input queue; a slow embedder or vector store applies backpressure all the
+way back to RSS fetching.
+
+Input items are document dicts. Items that already carry ``content`` (the
+static educational, legislative and dApp resources) pass straight through
+fetch and parse; items with only a ``url`` (RSS entries) are downloaded and
+extracted.
+"""
+
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+import feedparser
+from newspaper import Article
+
+from btc_max_knowledge_agent.utils.config import Config
+from btc_max_knowledge_agent.utils.pipeline import (
+    PipelineResult,
+    PipelineStage,
+    StagedPipeline,
+)
+from btc_max_knowledge_agent.utils.text_normalizer import normalize_article_text
+from btc_max_knowledge_agent.utils.url_error_handler import (
+    FallbackURLStrategy,
+    GracefulDegradation,
+)
+from btc_max_knowledge_agent.utils.url_metadata_logger import URLMetadataLogger
+from btc_max_knowledge_agent.utils.url_utils import sanitize_url_for_storage
+from knowledge.data_collector import BitcoinDataCollector
+
+# Minimum extracted article length, matching BitcoinDataCollector.collect_from_rss
+MIN_ARTICLE_LENGTH = 500
+
+# Embedder contract: list of texts in, one vector per text out
+Embedder = Callable[[List[str]], List[List[float]]]
+
+
+def iter_rss_items(
+    collector: BitcoinDataCollector, max_articles: int = 20
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield unfetched article items from the collector's RSS feeds.
+
+    Feeds are fetched lazily, so the pipeline starts downloading articles
+    from the first feed while later feeds are still being requested.
+    """
+    logger = URLMetadataLogger.get_logger("validation")
+    for feed_url in collector.rss_feeds:
+        try:
+            response = collector.session.get(feed_url, timeout=10)
+            response.raise_for_status()
+            feed = feedparser.parse(response.content)
+        except Exception as e:
+            logger.error(
+                "Failed to fetch RSS feed",
+                extra={"feed_url": feed_url, "error": str(e)},
+            )
+            continue
+
+        for entry in feed.entries[:max_articles]:
+            yield {
+                "url": entry.link,
+                "title": entry.get("title", ""),
+                "source": feed_url,
+                "category": "news",
+                "published": entry.get("published", ""),
+            }
+
+
+def fetch_stage(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Download article HTML for items that do not carry content yet."""
+    if item.get("content"):
+        return item
+    article = Article(item["url"])
+    article.download()
+    return {**item, "_article": article}
+
+
+def parse_stage(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Extract article text; drops articles too short to be useful."""
+    article = item.get("_article")
+    if article is None:
+        return item
+    article.parse()
+    text = normalize_article_text(article.text or "")
+    if len(text) <= MIN_ARTICLE_LENGTH:
+        return None
+    document = {k: v for k, v in item.items() if k != "_article"}
+    document["content"] = text
+    document.setdefault("title", article.title or "")
+    return document
+
+
+def validate_stage(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Sanitize the document URL and make metadata null-safe."""
+    url = item.get("url")
+    if url:
+        sanitized = sanitize_url_for_storage(url)
+        if not sanitized:
+            sanitized = FallbackURLStrategy.domain_only_url(url) or ""
+        item = {**item, "url": sanitized}
+    return GracefulDegradation.null_safe_metadata(item)
+
+
+def make_chunk_stage(
+    chunk_size: int = Config.CHUNK_SIZE, chunk_overlap: int = Config.CHUNK_OVERLAP
+) -> Callable[[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Build a stage that splits a document into overlapping text chunks."""
+    if chunk_overlap >= chunk_size:
+        raise ValueError("chunk_overlap must be smaller than chunk_size")
+    step = chunk_size - chunk_overlap
+
+    def chunk_stage(document: Dict[str, Any]) -> List[Dict[str, Any]]:
+        content = str(document.get("content", ""))
+        if not content:
+            return []
+        starts = range(0, max(len(content) - chunk_overlap, 1), step)
+        chunks = []
+        for number, start in enumerate(starts):
+            chunk = {
+                **document,
+                "content": content[start : start + chunk_size],
+                "chunk_index": number,
+                "parent_id": document.get("id", ""),
+            }
+            chunk["id"] = f"{document.get('id', 'doc')}_chunk_{number}"
+            chunks.append(chunk)
+        return chunks
+
+    return chunk_stage
+
+
+def make_embed_stage(
+    embedder: Embedder,
+) -> Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]:
+    """Build a batched stage that attaches an ``embedding`` to each chunk."""
+
+    def embed_stage(chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        vectors = embedder([chunk["content"] for chunk in chunks])
+        if len(vectors) != len(chunks):
+            raise ValueError(
+                f"Embedder returned {len(vectors)} vectors for {len(chunks)} chunks"
+            )
+        return [
+            {**chunk, "embedding": list(vector)}
+            for chunk, vector in zip(chunks, vectors)
+        ]
+
+    return embed_stage
+
+
+def make_upsert_stage(
+    pinecone_client: Any,
+) -> Callable[[List[Dict[str, Any]]], List[str]]:
+    """Build a batched stage that upserts embedded chunks; emits their ids."""
+
+    def upsert_stage(chunks: List[Dict[str, Any]]) -> List[str]:
+        pinecone_client.upsert_documents(chunks)
+        return [chunk["id"] for chunk in chunks]
+
+    return upsert_stage
+
+
+def build_ingest_pipeline(
+    pinecone_client: Any,
+    embedder: Embedder,
+    fetch_concurrency: int = 8,
+    parse_concurrency: int = 2,
+    validate_concurrency: int = 4,
+    embed_concurrency: int = 2,
+    embed_batch_size: int = 32,
+    upsert_batch_size: int = 100,
+    queue_size: int = 64,
+    chunk_size: int = Config.CHUNK_SIZE,
+    chunk_overlap: int = Config.CHUNK_OVERLAP,
+) -> StagedPipeline:
+    """
+    Build the fetch → parse → validate → chunk → embed → upsert pipeline.
+
+    Args:
+        pinecone_client: Object with an ``upsert_documents(documents)`` method
+        embedder: Callable mapping a list of texts to a list of vectors
+        fetch_concurrency: Parallel article downloads (I/O bound)
+        parse_concurrency: Parallel HTML extractions (CPU bound)
+        validate_concurrency: Parallel URL validations
+        embed_concurrency: Parallel embedding batches
+        embed_batch_size: Chunks per embedding call
+        upsert_batch_size: Chunks per upsert call
+        queue_size: Capacity of each stage's input queue
+        chunk_size: Characters per chunk
+        chunk_overlap: Characters shared by consecutive chunks
+
+    Returns:
+        Configured StagedPipeline; call ``run(items)`` to ingest
+    """
+    stages = [
+        PipelineStage(
+            "fetch", fetch_stage, concurrency=fetch_concurrency, queue_size=queue_size
+        ),
+        PipelineStage(
+            "parse", parse_stage, concurrency=parse_concurrency, queue_size=queue_size
+        ),
+        PipelineStage(
+            "validate",
+            validate_stage,
+            concurrency=validate_concurrency,
+            queue_size=queue_size,
+        ),
+        PipelineStage(
+            "chunk",
+            make_chunk_stage(chunk_size, chunk_overlap),
+            queue_size=queue_size,
+            fan_out=True,
+        ),
+        PipelineStage(
+            "embed",
+            make_embed_stage(embedder),
+            concurrency=embed_concurrency,
+            queue_size=max(queue_size, embed_batch_size),
+            batch_size=embed_batch_size,
+        ),
+        PipelineStage(
+            "upsert",
+            make_upsert_stage(pinecone_client),
+            queue_size=max(queue_size, upsert_batch_size),
+            batch_size=upsert_batch_size,
+            batch_timeout=0.5,
+        ),
+    ]
+    return StagedPipeline(stages, name="ingest")
+
+
+def run_ingest(
+    collector: BitcoinDataCollector,
+    pinecone_client: Any,
+    embedder: Embedder,
+    static_documents: Optional[Iterable[Dict[str, Any]]] = None,
+    max_news_articles: int = 30,
+    **pipeline_options: Any,
+) -> PipelineResult:
+    """
+    Ingest static resources and RSS articles through the staged pipeline.
+
+    Args:
+        collector: Collector providing RSS feeds and the HTTP session
+        pinecone_client: Object with an ``upsert_documents(documents)`` method
+        embedder: Callable mapping a list of texts to a list of vectors
+        static_documents: Pre-built documents; defaults to the collector's
+            basics, GENIUS Act and dApp resources
+        max_news_articles: Maximum number of articles to take per RSS feed
+        **pipeline_options: Forwarded to ``build_ingest_pipeline``
+
+    Returns:
+        PipelineResult listing upserted chunk ids, item errors and stage stats
+    """
+    metrics_logger = URLMetadataLogger.get_logger("metrics")
+    pipeline = build_ingest_pipeline(pinecone_client, embedder, **pipeline_options)
+
+    if static_documents is None:
+        static_documents = [
+            *(collector.collect_bitcoin_basics() or []),
+            *(collector.collect_genius_act_info() or []),
+            *(collector.collect_dapp_information() or []),
+        ]
+
+    def items() -> Iterator[Dict[str, Any]]:
+        yield from static_documents
+        for number, item in enumerate(iter_rss_items(collector, max_news_articles)):
+            item.setdefault("id", f"rss_{number}")
+            yield item
+
+    start = time.time()
+    result = pipeline.run(items())
+    metrics_logger.info(
+        "Ingest pipeline completed",
+        extra={
+            "duration_ms": (time.time() - start) * 1000,
+            "chunks_upserted": len(result.outputs),
+            "errors": len(result.errors),
+            "stages": result.stats.get("stages", {}),
+        },
+    )
+    return result
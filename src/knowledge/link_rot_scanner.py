@@ -0,0 +1,498 @@
+"""
+Background link-rot scanner for source URLs already in the knowledge base.
+
+Source URLs are only checked when documents are collected, so a page that
+disappears afterwards stays in the index unnoticed. ``LinkRotScanner`` walks
+the stored URLs in the background, oldest-checked first (never-checked URLs
+before all others), at a fixed rate so it never competes with ingest or
+query traffic. Each result is recorded through
+``URLMetadataMonitor.record_validation`` (failures with
+``error_type="broken_link"``), which makes the ``broken_links_rate`` alert
+reflect the real state of the corpus.
+
+Progress is checkpointed to a JSON state file every ``checkpoint_every``
+checks, so a restart resumes where the scan stopped. Every pass produces a
+``ScanReport`` describing what changed since the previous check of each URL:
+newly broken links, recovered links and links that are still broken.
+
+URLs come from a ``url_source`` callable, e.g. ``iter_index_urls`` over the
+Pinecone index or ``urls_from_documents`` over collected documents.
+"""
+
+import heapq
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import requests
+
+from btc_max_knowledge_agent.utils.host_health import host_health_tracker, host_of
+from btc_max_knowledge_agent.utils.persistent_url_cache import get_persistent_url_cache
+from btc_max_knowledge_agent.utils.url_metadata_logger import (
+    URLMetadataLogger,
+    correlation_context,
+)
+from btc_max_knowledge_agent.utils.url_utils import (
+    HEAD_UNSUPPORTED_STATUSES,
+    find_private_address,
+    is_server_disconnect,
+)
+
+UrlSource = Callable[[], Iterable[str]]
+
+
+@dataclass
+class LinkState:
+    """What the scanner knows about one URL."""
+
+    url: str
+    last_checked_at: Optional[float] = None
+    ok: Optional[bool] = None
+    error: Optional[str] = None
+    broken_since: Optional[float] = None
+    checks: int = 0
+
+
+@dataclass
+class ScanReport:
+    """Changes found by one scan pass."""
+
+    started_at: float
+    finished_at: Optional[float] = None
+    checked: int = 0
+    deferred: int = 0  # Skipped because the host's circuit is open
+    newly_broken: List[Dict[str, Any]] = field(default_factory=list)
+    recovered: List[str] = field(default_factory=list)
+    still_broken: int = 0
+    total_urls: int = 0
+    total_broken: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def urls_from_documents(documents: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """Yield the source URLs of collected documents (``url`` field)."""
+    for document in documents:
+        url = document.get("url")
+        if url:
+            yield url
+
+
+def iter_index_urls(index: Any, batch_size: int = 100) -> Iterator[str]:
+    """
+    Yield the ``url`` metadata of every vector in a Pinecone index.
+
+    Uses ``index.list()`` to page through vector ids and ``index.fetch()``
+    to read their metadata, ``batch_size`` ids at a time. Chunks of one
+    document share a URL, so duplicates are removed.
+    """
+    seen = set()
+    for ids in index.list(limit=batch_size):
+        if not ids:
+            continue
+        vectors = index.fetch(ids=list(ids)).vectors
+        for vector in vectors.values():
+            metadata = getattr(vector, "metadata", None) or {}
+            url = metadata.get("url")
+            if url and url not in seen:
+                seen.add(url)
+                yield url
+
+
+class LinkRotScanner:
+    """Re-check stored source URLs in the background, oldest-checked first."""
+
+    def __init__(
+        self,
+        url_source: UrlSource,
+        monitor: Any = None,
+        rate_per_second: float = 1.0,
+        batch_size: int = 100,
+        recheck_interval: float = 7 * 24 * 3600.0,
+        broken_recheck_interval: float = 24 * 3600.0,
+        refresh_interval: float = 24 * 3600.0,
+        checkpoint_every: int = 50,
+        timeout: float = 10.0,
+        state_path: Optional[Union[str, Path]] = None,
+        report_path: Optional[Union[str, Path]] = None,
+        session: Optional[requests.Session] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            url_source: Returns the URLs currently stored in the corpus
+            monitor: URLMetadataMonitor receiving results (defaults to the
+                module-level ``url_metadata_monitor``)
+            rate_per_second: Maximum URL checks per second
+            batch_size: Maximum URLs checked per ``run_once`` pass
+            recheck_interval: Seconds before a working URL is checked again
+            broken_recheck_interval: Seconds before a broken URL is checked again
+            refresh_interval: Seconds between reloads of ``url_source``
+            checkpoint_every: Save state after this many checks
+            timeout: Request timeout in seconds
+            state_path: JSON file persisting scan progress across restarts
+            report_path: JSON file receiving the latest ``ScanReport``
+            session: requests session reused for all checks
+            clock: Time source, injectable for tests
+        """
+        if rate_per_second <= 0:
+            raise ValueError("rate_per_second must be positive")
+        if monitor is None:
+            from btc_max_knowledge_agent.monitoring.url_metadata_monitor import (
+                url_metadata_monitor as monitor,
+            )
+
+        self.url_source = url_source
+        self.monitor = monitor
+        self.min_check_interval = 1.0 / rate_per_second
+        self.batch_size = batch_size
+        self.recheck_interval = recheck_interval
+        self.broken_recheck_interval = broken_recheck_interval
+        self.refresh_interval = refresh_interval
+        self.checkpoint_every = max(1, checkpoint_every)
+        self.timeout = timeout
+        self.state_path = Path(state_path) if state_path else None
+        self.report_path = Path(report_path) if report_path else None
+        if session is None:
+            session = requests.Session()
+            session.headers["User-Agent"] = "BTC-Max-Knowledge-Agent/1.0"
+        self.session = session
+        self.clock = clock
+
+        self.logger = URLMetadataLogger.get_logger("validation")
+        self.metrics_logger = URLMetadataLogger.get_logger("metrics")
+
+        self._lock = threading.Lock()
+        self._links: Dict[str, LinkState] = {}
+        self._last_refresh_at: Optional[float] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._load_state()
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+    def refresh_urls(self) -> int:
+        """
+        Reload URLs from ``url_source``; new URLs are checked first and URLs
+        no longer in the corpus are forgotten.
+
+        Returns:
+            Number of URLs now tracked
+        """
+        urls = set(self.url_source())
+        with self._lock:
+            for url in urls:
+                if url not in self._links:
+                    self._links[url] = LinkState(url=url)
+            for url in [u for u in self._links if u not in urls]:
+                del self._links[url]
+            self._last_refresh_at = self.clock()
+            return len(self._links)
+
+    def due_urls(
+        self, limit: Optional[int] = None, now: Optional[float] = None
+    ) -> List[str]:
+        """Return URLs due for a check, never-checked first, then oldest-checked."""
+        now = self.clock() if now is None else now
+        limit = self.batch_size if limit is None else limit
+        with self._lock:
+            due = [link for link in self._links.values() if self._is_due(link, now)]
+            oldest = heapq.nsmallest(
+                limit, due, key=lambda link: link.last_checked_at or float("-inf")
+            )
+            return [link.url for link in oldest]
+
+    def _is_due(self, link: LinkState, now: float) -> bool:
+        if link.last_checked_at is None:
+            return True
+        interval = self.recheck_interval if link.ok else self.broken_recheck_interval
+        return now - link.last_checked_at >= interval
+
+    def run_once(self, stop_event: Optional[threading.Event] = None) -> ScanReport:
+        """
+        Check up to ``batch_size`` due URLs at the configured rate.
+
+        Returns:
+            Diff report of this pass (also written to ``report_path``)
+        """
+        stop_event = stop_event or self._stop_event
+        now = self.clock()
+        if (
+            self._last_refresh_at is None
+            or now - self._last_refresh_at >= self.refresh_interval
+        ):
+            try:
+                self.refresh_urls()
+            except Exception as e:
+                self.logger.error(
+                    "Link-rot scanner could not load corpus URLs",
+                    extra={"error": str(e)},
+                )
+
+        report = ScanReport(started_at=now)
+        with correlation_context() as correlation_id:
+            for url in self.due_urls():
+                if stop_event.is_set():
+                    break
+                started = time.monotonic()
+                if self.check_url(url, report, correlation_id):
+                    report.checked += 1
+                    if report.checked % self.checkpoint_every == 0:
+                        self._save_state()
+                    # Rate limit: spread checks evenly, but wake up on stop
+                    stop_event.wait(
+                        max(0.0, self.min_check_interval - (time.monotonic() - started))
+                    )
+                else:
+                    report.deferred += 1
+
+        self._finish_report(report)
+        self._save_state()
+        return report
+
+    def run(self, stop_event: Optional[threading.Event] = None) -> None:
+        """Scan until ``stop_event`` (or ``stop()``) is set."""
+        stop_event = stop_event or self._stop_event
+        while not stop_event.is_set():
+            report = self.run_once(stop_event)
+            if report.checked == 0:
+                # Nothing due (or every due host is down): look again later
+                stop_event.wait(min(3600.0, self.broken_recheck_interval))
+
+    def start(self) -> None:
+        """Run the scanner loop in a background daemon thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self.run, name="link-rot-scanner", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the background loop after the current check."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def get_status(self) -> Dict[str, Any]:
+        """Summarise scan coverage and the currently broken links."""
+        now = self.clock()
+        with self._lock:
+            links = list(self._links.values())
+        checked = [link for link in links if link.last_checked_at is not None]
+        return {
+            "total_urls": len(links),
+            "checked_urls": len(checked),
+            "due_urls": sum(1 for link in links if self._is_due(link, now)),
+            "broken_urls": {
+                link.url: link.error for link in checked if link.ok is False
+            },
+            "oldest_check_age_seconds": (
+                now - min(link.last_checked_at for link in checked) if checked else None
+            ),
+        }
+
+    # ------------------------------------------------------------------
+    # Checking
+    # ------------------------------------------------------------------
+    def check_url(
+        self,
+        url: str,
+        report: Optional[ScanReport] = None,
+        correlation_id: Optional[str] = None,
+    ) -> bool:
+        """
+        Check one URL, record the result and update ``report``.
+
+        Returns:
+            False if the check was deferred because the host's circuit is open
+        """
+        host = host_of(url)
+        if not host_health_tracker.allow_request(host):
+            return False
+
+        start = time.time()
+        # Same SSRF rule as check_url_accessibility: stored URLs whose host
+        # resolves to an internal address are never requested
+        private_address = find_private_address(host)
+        if private_address:
+            ok, error, error_type = (
+                False,
+                f"private_ip: {private_address}",
+                "private_ip",
+            )
+            duration_ms = (time.time() - start) * 1000
+        else:
+            ok, status, error, host_down = self._probe(url)
+            error_type = None if ok else "broken_link"
+            duration_ms = (time.time() - start) * 1000
+            if host_down:
+                host_health_tracker.record_failure(host, error, duration_ms)
+            elif status is not None:
+                host_health_tracker.record_success(host, duration_ms)
+
+        self.monitor.record_validation(
+            url,
+            ok,
+            duration_ms,
+            error_type=error_type,
+            correlation_id=correlation_id,
+        )
+        shared = get_persistent_url_cache()
+        if shared is not None:
+            shared.put("accessibility", url, ok, error)
+
+        now = self.clock()
+        with self._lock:
+            link = self._links.setdefault(url, LinkState(url=url))
+            was_ok = link.ok
+            link.last_checked_at = now
+            link.checks += 1
+            link.ok = ok
+            link.error = error
+            if ok:
+                link.broken_since = None
+            elif link.broken_since is None:
+                link.broken_since = now
+
+        if report is not None:
+            if not ok and was_ok is not False:
+                report.newly_broken.append({"url": url, "error": error})
+            elif ok and was_ok is False:
+                report.recovered.append(url)
+            elif not ok:
+                report.still_broken += 1
+
+        if not ok:
+            self.logger.warning(
+                "Broken source link",
+                extra={
+                    "correlation_id": correlation_id,
+                    "url": url,
+                    "error": error,
+                    "previously_ok": was_ok,
+                },
+            )
+        return True
+
+    def _probe(self, url: str) -> Tuple[bool, Optional[int], Optional[str], bool]:
+        """
+        Check ``url`` with HEAD, falling back to GET only when the server
+        does not support HEAD (405/501, or it drops the connection).
+
+        Returns:
+            ``(ok, status_code, error, host_down)`` where ``host_down`` marks
+            connection errors, timeouts and 5xx responses
+        """
+        try:
+            try:
+                response = self.session.head(
+                    url, timeout=self.timeout, allow_redirects=True
+                )
+                head_supported = response.status_code not in HEAD_UNSUPPORTED_STATUSES
+            except requests.exceptions.ConnectionError as e:
+                # Refused connections and DNS/TLS failures fail the same way
+                # with GET; only a dropped HEAD is worth a second request
+                if not is_server_disconnect(e):
+                    raise
+                head_supported = False
+            if not head_supported:
+                response = self.session.get(
+                    url, timeout=self.timeout, allow_redirects=True, stream=True
+                )
+                response.close()  # Don't download the body
+        except requests.RequestException as e:
+            host_down = isinstance(
+                e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+            )
+            return False, None, str(e), host_down
+        status = response.status_code
+        ok = status < 400
+        return ok, status, None if ok else f"HTTP {status}", status >= 500
+
+    # ------------------------------------------------------------------
+    # Reporting and persistence
+    # ------------------------------------------------------------------
+    def _finish_report(self, report: ScanReport) -> None:
+        report.finished_at = self.clock()
+        with self._lock:
+            report.total_urls = len(self._links)
+            report.total_broken = sum(
+                1 for link in self._links.values() if link.ok is False
+            )
+
+        self.metrics_logger.info(
+            "Link-rot scan pass completed",
+            extra={
+                "checked": report.checked,
+                "deferred": report.deferred,
+                "newly_broken": len(report.newly_broken),
+                "recovered": len(report.recovered),
+                "still_broken": report.still_broken,
+                "total_broken": report.total_broken,
+                "total_urls": report.total_urls,
+            },
+        )
+        if self.report_path and (report.checked or report.deferred):
+            self._write_json(self.report_path, report.to_dict(), ".link_report_")
+
+    def _load_state(self) -> None:
+        if not self.state_path or not self.state_path.exists():
+            return
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            with self._lock:
+                for item in data.get("links", []):
+                    link = LinkState(**item)
+                    self._links[link.url] = link
+        except (OSError, ValueError, TypeError) as e:
+            self.logger.warning(
+                "Ignoring unreadable link-rot scanner state",
+                extra={"path": str(self.state_path), "error": str(e)},
+            )
+
+    def _save_state(self) -> None:
+        if not self.state_path:
+            return
+        with self._lock:
+            data = {"links": [asdict(link) for link in self._links.values()]}
+        self._write_json(self.state_path, data, ".link_state_")
+
+    def _write_json(self, path: Path, data: Dict[str, Any], prefix: str) -> None:
+        """Write ``data`` atomically so readers never see a partial file."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=prefix, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.logger.warning(
+                "Could not write link-rot scanner file",
+                extra={"path": str(path), "error": str(e)},
+            )
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
@@ -0,0 +1,266 @@
+"""
+Columnar in-memory storage for URL metadata metrics.
+
+Holding one ``URLMetric`` dataclass (with a timezone-aware ``datetime`` and
+several strings) per event costs a few hundred bytes each; at ingest rates
+with 24h retention that is millions of Python objects. ``MetricColumns``
+stores the same fields in parallel ``array`` columns instead: epoch-float
+timestamps, a success flag, float durations and integer IDs for every
+string field. Strings (URLs, error types, correlation IDs, queries) are
+interned once in a shared ``StringTable``, so a URL validated a thousand
+times is stored once.
+
+Columns are copied into NumPy arrays for vectorized summaries, and rows are
+materialized back into ``URLMetric`` objects only when iterated (debugging).
+
+Every row also has a sequence number that keeps increasing as old rows are
+trimmed, so exports can resume from a cursor (``next_seq``) and read rows
+in short slices (``records``) without holding the monitor lock for the whole
+retention window.
+"""
+
+from array import array
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+_NONE = -1
+
+
+class StringTable:
+    """Interns strings as small integer IDs."""
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._strings: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def intern(self, value: Optional[str]) -> int:
+        if value is None:
+            return _NONE
+        value = str(value)
+        string_id = self._ids.get(value)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._ids[value] = string_id
+            self._strings.append(value)
+        return string_id
+
+    def lookup(self, string_id: int) -> Optional[str]:
+        return None if string_id == _NONE else self._strings[string_id]
+
+    def id_of(self, value: str) -> int:
+        """ID of an already interned string, or -1."""
+        return self._ids.get(value, _NONE)
+
+    def compact(self, live_ids: "np.ndarray") -> Dict[int, int]:
+        """Keep only ``live_ids`` and return the old-to-new ID mapping."""
+        remap: Dict[int, int] = {}
+        strings: List[str] = []
+        for old_id in np.unique(live_ids):
+            old_id = int(old_id)
+            if old_id == _NONE:
+                continue
+            remap[old_id] = len(strings)
+            strings.append(self._strings[old_id])
+        self._strings = strings
+        self._ids = {value: i for i, value in enumerate(strings)}
+        return remap
+
+
+class MetricColumns:
+    """
+    Metrics of one operation type as parallel columns.
+
+    Behaves like the deque it replaces for ``len()`` and iteration, which
+    yields ``URLMetric``-compatible objects built on the fly.
+    """
+
+    STRING_FIELDS = ("url", "error_type", "correlation_id", "query")
+    INT_FIELDS = ("metadata_size", "results_count")
+
+    def __init__(
+        self,
+        operation_type: str,
+        strings: StringTable,
+        metric_factory: Callable[..., Any],
+    ):
+        self.operation_type = operation_type
+        self._strings = strings
+        self._metric_factory = metric_factory
+        self.timestamps = array("d")
+        self.success = array("b")
+        self.durations = array("d")
+        self.string_columns = {name: array("q") for name in self.STRING_FIELDS}
+        self.int_columns = {name: array("q") for name in self.INT_FIELDS}
+        # Sequence number of row 0; grows as leading rows are dropped
+        self.first_seq = 0
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __iter__(self) -> Iterator[Any]:
+        for i in range(len(self)):
+            yield self.row(i)
+
+    def append(self, metric: Any) -> None:
+        self.timestamps.append(metric.timestamp.timestamp())
+        self.success.append(1 if metric.success else 0)
+        try:
+            duration = float(metric.duration_ms)
+        except (TypeError, ValueError):
+            duration = float("nan")
+        self.durations.append(duration)
+        for name, column in self.string_columns.items():
+            column.append(self._strings.intern(getattr(metric, name)))
+        for name, column in self.int_columns.items():
+            value = getattr(metric, name)
+            column.append(_NONE if value is None else int(value))
+
+    def row(self, i: int) -> Any:
+        """Materialize row ``i`` as a ``URLMetric``."""
+        fields = {
+            name: self._strings.lookup(column[i])
+            for name, column in self.string_columns.items()
+        }
+        for name, column in self.int_columns.items():
+            fields[name] = None if column[i] == _NONE else column[i]
+        return self._metric_factory(
+            timestamp=datetime.fromtimestamp(self.timestamps[i], timezone.utc),
+            operation_type=self.operation_type,
+            success=bool(self.success[i]),
+            duration_ms=self.durations[i],
+            **fields,
+        )
+
+    @property
+    def next_seq(self) -> int:
+        """Sequence number the next appended row will get."""
+        return self.first_seq + len(self)
+
+    def records(self, start_seq: int, limit: int, cutoff: float = float("-inf")):
+        """
+        Up to ``limit`` rows from sequence ``start_seq`` as export dicts.
+
+        Returns ``(records, next_seq)``; rows older than ``cutoff`` are
+        skipped but still advance the cursor. Rows already trimmed are
+        skipped too.
+        """
+        start = max(start_seq - self.first_seq, 0)
+        stop = min(start + limit, len(self))
+        lookup = self._strings.lookup
+        timestamps = self.timestamps
+        records = []
+        for i in range(start, stop):
+            if timestamps[i] < cutoff:
+                continue
+            record = {
+                "timestamp": datetime.fromtimestamp(
+                    timestamps[i], timezone.utc
+                ).isoformat(),
+                "operation_type": self.operation_type,
+                "success": bool(self.success[i]),
+                "duration_ms": self.durations[i],
+            }
+            for name, column in self.string_columns.items():
+                record[name] = lookup(column[i])
+            for name, column in self.int_columns.items():
+                record[name] = None if column[i] == _NONE else column[i]
+            records.append(record)
+        return records, self.first_seq + stop
+
+    def start_index(self, cutoff: float) -> int:
+        """Index of the first row at or after ``cutoff`` in a leading run.
+
+        Like popping the left of a deque while the head is older than the
+        cutoff, so rows recorded out of order are treated the same way.
+        """
+        if not self.timestamps or self.timestamps[0] >= cutoff:
+            return 0
+        fresh = np.asarray(self.timestamps) >= cutoff
+        return int(np.argmax(fresh)) if fresh.any() else len(self)
+
+    def drop_before(self, cutoff: float) -> int:
+        """Drop the leading rows older than ``cutoff``; returns how many."""
+        n = self.start_index(cutoff)
+        if n:
+            for column in self._all_columns():
+                del column[:n]
+            self.first_seq += n
+        return n
+
+    def columns_since(self, cutoff: float) -> Dict[str, np.ndarray]:
+        """NumPy copies of the rows with a timestamp at or after ``cutoff``."""
+        timestamps = np.array(self.timestamps)
+        mask = timestamps >= cutoff
+        result = {
+            "timestamp": timestamps[mask],
+            "success": np.array(self.success, dtype=bool)[mask],
+            "duration": np.array(self.durations)[mask],
+        }
+        for name, column in self.string_columns.items():
+            result[name] = np.array(column, dtype=np.int64)[mask]
+        return result
+
+    def remap_strings(self, remap: Dict[int, int]) -> None:
+        for name, column in self.string_columns.items():
+            self.string_columns[name] = array(
+                "q", (remap.get(i, _NONE) for i in column)
+            )
+
+    def nbytes(self) -> int:
+        return sum(c.itemsize * len(c) for c in self._all_columns())
+
+    def _all_columns(self) -> List[array]:
+        return [
+            self.timestamps,
+            self.success,
+            self.durations,
+            *self.string_columns.values(),
+            *self.int_columns.values(),
+        ]
+
+
+class ColumnarMetricStore(dict):
+    """
+    ``operation_type -> MetricColumns`` mapping sharing one string table.
+
+    Missing operation types are created on access, like the
+    ``defaultdict(deque)`` this replaces.
+    """
+
+    def __init__(self, metric_factory: Callable[..., Any]):
+        super().__init__()
+        self.strings = StringTable()
+        self._metric_factory = metric_factory
+
+    def __missing__(self, operation_type: str) -> MetricColumns:
+        columns = MetricColumns(operation_type, self.strings, self._metric_factory)
+        self[operation_type] = columns
+        return columns
+
+    def drop_before(self, cutoff: float) -> int:
+        """Trim every operation type and compact the string table if needed."""
+        dropped = sum(columns.drop_before(cutoff) for columns in self.values())
+        rows = sum(len(columns) for columns in self.values())
+        # Interned strings of trimmed rows stay in the table until it is
+        # mostly garbage, then the table is rebuilt from the live rows
+        if dropped and len(self.strings) > 2 * rows + 1024:
+            live = [
+                np.asarray(column)
+                for columns in self.values()
+                for column in columns.string_columns.values()
+            ]
+            remap = self.strings.compact(
+                np.concatenate(live) if live else np.empty(0, dtype=np.int64)
+            )
+            for columns in self.values():
+                columns.remap_strings(remap)
+        return dropped
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns (excluding strings)."""
+        return sum(columns.nbytes() for columns in self.values())
@@ -5,19 +5,52 @@ Tracks validation success rates, broken links, performance metrics, and generate
 
 import json
 import logging
-import statistics
+import math
+import os
 import threading
-from collections import defaultdict, deque
-from concurrent.futures import ThreadPoolExecutor
-from dataclasses import asdict, dataclass
+import time
+from collections import defaultdict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 import requests
 
+from btc_max_knowledge_agent.utils.executors import (
+    PeriodicTask,
+    get_executor,
+    schedule_periodic,
+)
+from btc_max_knowledge_agent.utils.host_health import host_health_tracker, host_of
+from btc_max_knowledge_agent.utils.latency_histogram import LatencyHistogram
+from btc_max_knowledge_agent.utils.metrics_registry import REGISTRY
+from btc_max_knowledge_agent.utils.persistent_url_cache import get_persistent_url_cache
+from btc_max_knowledge_agent.utils.url_utils import (
+    HEAD_UNSUPPORTED_STATUSES,
+    is_server_disconnect,
+)
+
+from .metric_store import ColumnarMetricStore
+
 logger = logging.getLogger(__name__)
 
+# Rows copied per lock acquisition while exporting
+EXPORT_CHUNK_ROWS = 5000
+
+_URL_OPERATIONS = REGISTRY.counter(
+    "url_operations_total",
+    "URL metadata operations by type and result",
+    ["operation", "result"],
+)
+_URL_OPERATION_SECONDS = REGISTRY.histogram(
+    "url_operation_duration_seconds",
+    "Duration of URL metadata operations",
+    ["operation"],
+)
+
 
 @dataclass
 class URLMetric:
@@ -45,6 +78,59 @@ class AlertThreshold:
     cooldown_minutes: int = 60
 
 
+def _is_finite_duration(duration_ms: Any) -> bool:
+    return isinstance(duration_ms, (int, float)) and math.isfinite(duration_ms)
+
+
+@dataclass
+class MetricBucket:
+    """Aggregates for one operation type over one ``bucket_seconds`` slot."""
+
+    slot: int
+    count: int = 0
+    failures: int = 0
+    url_count: int = 0
+    broken_links: int = 0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    success_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    distribution: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+
+class MetricRing:
+    """
+    Fixed-size ring of ``MetricBucket`` indexed by time slot.
+
+    A slot's bucket is recycled once the ring wraps around, so the ring never
+    holds more than ``size`` buckets and needs no separate expiry pass.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._buckets: List[Optional[MetricBucket]] = [None] * size
+        self.newest_slot: Optional[int] = None
+
+    def bucket_for(self, slot: int) -> MetricBucket:
+        index = slot % self.size
+        bucket = self._buckets[index]
+        if bucket is None or bucket.slot != slot:
+            bucket = MetricBucket(slot=slot)
+            self._buckets[index] = bucket
+        if self.newest_slot is None or slot > self.newest_slot:
+            self.newest_slot = slot
+        return bucket
+
+    def window(self, start_slot: int, end_slot: Optional[int] = None):
+        """Yield the buckets for slots ``start_slot`` .. ``end_slot`` (inclusive)."""
+        if self.newest_slot is None:
+            return
+        end_slot = self.newest_slot if end_slot is None else end_slot
+        start_slot = max(start_slot, end_slot - self.size + 1)
+        for slot in range(start_slot, end_slot + 1):
+            bucket = self._buckets[slot % self.size]
+            if bucket is not None and bucket.slot == slot:
+                yield bucket
+
+
 class URLMetadataMonitor:
     """Monitor for URL metadata operations with metrics collection and alerting."""
 
@@ -52,9 +138,19 @@ class URLMetadataMonitor:
         self,
         metrics_retention_hours: int = 24,
         alert_thresholds: Optional[List[AlertThreshold]] = None,
+        cleanup_every: int = 1000,
+        cleanup_interval_seconds: float = 60.0,
     ):
         self.metrics_retention_hours = metrics_retention_hours
-        self.metrics_store: Dict[str, deque] = defaultdict(deque)
+
+        # Expired metrics are trimmed after every ``cleanup_every`` records or
+        # ``cleanup_interval_seconds``, whichever comes first, rather than on
+        # every record
+        self.cleanup_every = cleanup_every
+        self.cleanup_interval_seconds = cleanup_interval_seconds
+        self._records_since_cleanup = 0
+        self._last_cleanup = time.monotonic()
+        self.metrics_store = ColumnarMetricStore(URLMetric)
 
         # Alert configurations
         self.alert_thresholds = alert_thresholds or [
@@ -76,14 +172,23 @@ class URLMetadataMonitor:
             "very_slow": (5000, float("inf")),  # > 5s
         }
 
+        # Per-minute aggregates for each operation type covering the
+        # retention period. Windowed rates, percentiles and summaries read
+        # these, costing O(buckets) instead of a scan of every stored metric.
+        self.bucket_seconds = 60
+        self._ring_size = int(metrics_retention_hours * 3600 // self.bucket_seconds) + 1
+        self._rings: Dict[str, MetricRing] = {}
+
         # Thread safety
         self._lock = threading.Lock()
 
         # Background URL checking
-        self.url_check_executor = ThreadPoolExecutor(
-            max_workers=5, thread_name_prefix="url_checker"
-        )
+        # Shared process-wide io pool; not shut down with the monitor
+        self.url_check_executor = get_executor("io")
         self.broken_urls_cache = {}
+        # Incremental export cursors per target file (operation -> next seq)
+        self._export_cursors: Dict[str, Dict[str, int]] = {}
+        self._export_lock = threading.Lock()
         self._shutdown_lock = threading.Lock()
         self._is_shutdown = False
 
@@ -153,17 +258,73 @@ class URLMetadataMonitor:
         """Add a metric to the store."""
         with self._lock:
             self.metrics_store[metric.operation_type].append(metric)
-        self._clean_old_metrics()
+            self._update_buckets(metric)
+            self._records_since_cleanup += 1
+            if (
+                self._records_since_cleanup >= self.cleanup_every
+                or time.monotonic() - self._last_cleanup
+                >= self.cleanup_interval_seconds
+            ):
+                self._trim_expired_metrics()
+
+        result = "success" if metric.success else "failure"
+        _URL_OPERATIONS.labels(metric.operation_type, result).inc()
+        if _is_finite_duration(metric.duration_ms):
+            _URL_OPERATION_SECONDS.labels(metric.operation_type).observe(
+                metric.duration_ms / 1000.0
+            )
+
+    def _slot(self, timestamp: datetime) -> int:
+        return int(timestamp.timestamp() // self.bucket_seconds)
+
+    def _update_buckets(self, metric: URLMetric) -> None:
+        """Fold a metric into its time bucket (caller holds the lock)."""
+        ring = self._rings.get(metric.operation_type)
+        if ring is None:
+            ring = self._rings[metric.operation_type] = MetricRing(self._ring_size)
+        bucket = ring.bucket_for(self._slot(metric.timestamp))
+
+        bucket.count += 1
+        if not metric.success:
+            bucket.failures += 1
+        if metric.url:
+            bucket.url_count += 1
+            if metric.error_type == "broken_link":
+                bucket.broken_links += 1
+
+        duration = metric.duration_ms
+        if _is_finite_duration(duration):
+            bucket.latency.record(duration)
+            if metric.success:
+                bucket.success_latency.record(duration)
+            for name, (min_ms, max_ms) in self.performance_buckets.items():
+                if min_ms <= duration < max_ms:
+                    bucket.distribution[name] += 1
+                    break
+
+    def _window_buckets(
+        self, operation_type: str, cutoff_time: datetime
+    ) -> List[MetricBucket]:
+        """Buckets of ``operation_type`` from ``cutoff_time``'s minute onwards.
+
+        Caller holds the lock.
+        """
+        ring = self._rings.get(operation_type)
+        if ring is None:
+            return []
+        return list(ring.window(self._slot(cutoff_time)))
 
     def shutdown(self, wait: bool = True) -> None:
         """Shutdown the URL metadata monitor and release resources.
 
+        The URL check executor is the shared io pool, which other subsystems
+        keep using, so it is left running (see ``shutdown_executors``).
+
         Args:
-            wait: If True, wait for all pending tasks to complete. If False, attempt to cancel them.
+            wait: Kept for API compatibility.
         """
         with self._shutdown_lock:
             if not self._is_shutdown:
-                self.url_check_executor.shutdown(wait=wait)
                 self._is_shutdown = True
 
     def __enter__(self):
@@ -177,15 +338,17 @@ class URLMetadataMonitor:
 
     def _clean_old_metrics(self):
         """Remove metrics older than retention period."""
+        with self._lock:
+            self._trim_expired_metrics()
+
+    def _trim_expired_metrics(self) -> None:
+        """Drop expired metrics of every operation type (caller holds the lock)."""
         cutoff_time = datetime.now(timezone.utc) - timedelta(
             hours=self.metrics_retention_hours
         )
-
-        with self._lock:
-            for operation_type, metrics in self.metrics_store.items():
-                # Remove old metrics from the left side of deque
-                while metrics and metrics[0].timestamp < cutoff_time:
-                    metrics.popleft()
+        self.metrics_store.drop_before(cutoff_time.timestamp())
+        self._records_since_cleanup = 0
+        self._last_cleanup = time.monotonic()
 
     def _check_alerts(self):
         """Check all alert thresholds."""
@@ -231,66 +394,39 @@ class URLMetadataMonitor:
         self, operation_type: str, cutoff_time: datetime
     ) -> Optional[float]:
         """Calculate failure rate for an operation type."""
+        total = failures = 0
         with self._lock:
-            metrics = [
-                m
-                for m in self.metrics_store.get(operation_type, [])
-                if m.timestamp >= cutoff_time
-            ]
+            for bucket in self._window_buckets(operation_type, cutoff_time):
+                total += bucket.count
+                failures += bucket.failures
 
-        if not metrics:
+        if not total:
             return None
-
-        failures = sum(1 for m in metrics if not m.success)
-        return failures / len(metrics)
+        return failures / total
 
     def _calculate_response_time_percentile(
         self, percentile: int, cutoff_time: datetime
     ) -> Optional[float]:
-        """Calculate response time percentile."""
+        """Calculate response time percentile across all operation types."""
+        latency = LatencyHistogram()
         with self._lock:
-            all_metrics = []
-            for metrics in self.metrics_store.values():
-                all_metrics.extend([m for m in metrics if m.timestamp >= cutoff_time])
-
-        if not all_metrics:
-            return None
+            for op_type in self._rings:
+                for bucket in self._window_buckets(op_type, cutoff_time):
+                    latency.merge(bucket.latency)
 
-        import math
-
-        durations = [
-            m.duration_ms
-            for m in all_metrics
-            if isinstance(m.duration_ms, (int, float)) and math.isfinite(m.duration_ms)
-        ]
-        if not durations:
-            return None
-        durations.sort()
-        k = max(
-            0,
-            min(
-                len(durations) - 1,
-                int(round((percentile / 100) * (len(durations) - 1))),
-            ),
-        )
-        return durations[k]
+        return latency.percentile(percentile)
 
     def _calculate_broken_links_rate(self, cutoff_time: datetime) -> Optional[float]:
         """Calculate rate of broken links."""
+        checked = broken = 0
         with self._lock:
-            validation_metrics = [
-                m
-                for m in self.metrics_store.get("validation", [])
-                if m.timestamp >= cutoff_time and m.url
-            ]
+            for bucket in self._window_buckets("validation", cutoff_time):
+                checked += bucket.url_count
+                broken += bucket.broken_links
 
-        if not validation_metrics:
+        if not checked:
             return None
-
-        broken_count = sum(
-            1 for m in validation_metrics if m.error_type == "broken_link"
-        )
-        return broken_count / len(validation_metrics)
+        return broken / checked
 
     def _trigger_alert(self, threshold: AlertThreshold, metric_value: float):
         """Trigger an alert and record it."""
@@ -318,27 +454,63 @@ class URLMetadataMonitor:
             if datetime.now(timezone.utc) - check_time < timedelta(hours=1):
                 return is_accessible, None
 
+        # Results probed by other workers and batch jobs on this host
+        shared = get_persistent_url_cache()
+        if shared is not None:
+            cached = shared.get("accessibility", url)
+            if cached is not None:
+                # Failures expire sooner in the shared cache; keep only
+                # successes locally so they are not held for the full hour
+                if cached[0]:
+                    self.broken_urls_cache[url] = (True, datetime.now(timezone.utc))
+                return cached
+
+        # Don't wait out timeouts on a host that is known to be down
+        host = host_of(url)
+        if not host_health_tracker.allow_request(host):
+            return False, "host unavailable (circuit open)"
+
+        start_time = time.time()
         try:
             headers = {"User-Agent": "URLMetadataMonitor/1.0"}
-            # Try HEAD first, fall back to GET if needed
+            # Try HEAD first, fall back to GET only if the server doesn't
+            # support HEAD (405/501, or it drops the connection)
             try:
                 response = requests.head(
                     url, timeout=5, allow_redirects=True, headers=headers
                 )
-            except requests.RequestException:
-                # Some servers don't support HEAD, try GET with streaming
+                head_supported = response.status_code not in HEAD_UNSUPPORTED_STATUSES
+            except requests.exceptions.ConnectionError as e:
+                # Timeouts and refused connections would fail again with GET
+                if not is_server_disconnect(e):
+                    raise
+                head_supported = False
+            if not head_supported:
                 response = requests.get(
                     url, timeout=5, allow_redirects=True, headers=headers, stream=True
                 )
                 response.close()  # Don't download the body
             is_accessible = response.status_code < 400
             error = None if is_accessible else f"HTTP {response.status_code}"
+            latency_ms = (time.time() - start_time) * 1000
+            if response.status_code >= 500:
+                host_health_tracker.record_failure(host, error, latency_ms)
+            else:
+                host_health_tracker.record_success(host, latency_ms)
         except requests.RequestException as e:
             is_accessible = False
             error = str(e)
+            if isinstance(
+                e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+            ):
+                host_health_tracker.record_failure(
+                    host, type(e).__name__, (time.time() - start_time) * 1000
+                )
 
         # Cache the result
         self.broken_urls_cache[url] = (is_accessible, datetime.now(timezone.utc))
+        if shared is not None:
+            shared.put("accessibility", url, is_accessible, error)
 
         # Record as broken link if not accessible
         if not is_accessible:
@@ -357,13 +529,12 @@ class URLMetadataMonitor:
         }
 
         with self._lock:
-            for op_type, metrics in self.metrics_store.items():
-                recent_metrics = [m for m in metrics if m.timestamp >= cutoff_time]
-
-                if recent_metrics:
-                    summary["operations"][op_type] = self._calculate_operation_stats(
-                        recent_metrics
-                    )
+            for op_type in self._rings:
+                stats = self._calculate_bucketed_operation_stats(
+                    self._window_buckets(op_type, cutoff_time)
+                )
+                if stats:
+                    summary["operations"][op_type] = stats
 
         # Add performance distribution
         summary["performance_distribution"] = self._calculate_performance_distribution(
@@ -403,52 +574,62 @@ class URLMetadataMonitor:
             "slowest_operations": [],
         }
 
+        slowest = []
         with self._lock:
-            all_metrics = []
-            for op_type, metrics in self.metrics_store.items():
-                recent_metrics = [m for m in metrics if m.timestamp >= cutoff_time]
-                all_metrics.extend(recent_metrics)
-
-                if recent_metrics:
-                    summary["operations"][op_type] = self._calculate_operation_stats(
-                        recent_metrics
-                    )
+            strings = self.metrics_store.strings
+            empty_id = strings.id_of("")
+            for op_type, columns in self.metrics_store.items():
+                recent = columns.columns_since(cutoff_time.timestamp())
+                if not recent["timestamp"].size:
+                    continue
 
-                    # Collect top errors
-                    error_counts = defaultdict(int)
-                    for m in recent_metrics:
-                        if not m.success and m.error_type:
-                            error_counts[m.error_type] += 1
+                summary["operations"][op_type] = self._calculate_operation_stats(
+                    recent["success"], recent["duration"]
+                )
+
+                # Collect top errors
+                errors = recent["error_type"]
+                failed_errors = errors[
+                    ~recent["success"] & (errors != -1) & (errors != empty_id)
+                ]
+                if failed_errors.size:
+                    ids, counts = np.unique(failed_errors, return_counts=True)
+                    order = np.argsort(-counts, kind="stable")[:5]
+                    summary["top_errors"][op_type] = [
+                        (strings.lookup(int(ids[k])), int(counts[k])) for k in order
+                    ]
 
-                    if error_counts:
-                        summary["top_errors"][op_type] = sorted(
-                            error_counts.items(), key=lambda x: x[1], reverse=True
-                        )[:5]
+                # Slowest candidates of this operation type (NaN sorts last)
+                for k in np.argsort(-recent["duration"], kind="stable")[:10]:
+                    duration = float(recent["duration"][k])
+                    if math.isnan(duration):
+                        break
+                    slowest.append(
+                        {
+                            "operation": op_type,
+                            "url": strings.lookup(int(recent["url"][k])),
+                            "duration_ms": duration,
+                            "timestamp": datetime.fromtimestamp(
+                                float(recent["timestamp"][k]), timezone.utc
+                            ).isoformat(),
+                        }
+                    )
 
         # Find slowest operations
-        all_metrics.sort(key=lambda m: m.duration_ms, reverse=True)
-        summary["slowest_operations"] = [
-            {
-                "operation": m.operation_type,
-                "url": m.url,
-                "duration_ms": m.duration_ms,
-                "timestamp": m.timestamp.isoformat(),
-            }
-            for m in all_metrics[:10]
-        ]
+        slowest.sort(key=lambda m: m["duration_ms"], reverse=True)
+        summary["slowest_operations"] = slowest[:10]
 
         # Add performance trends
         summary["performance_trends"] = self._calculate_performance_trends()
 
         return summary
 
-    def _calculate_operation_stats(self, metrics: List[URLMetric]) -> Dict[str, Any]:
-        """Calculate statistics for a set of metrics."""
-        import math
-        import statistics
-
-        total = len(metrics)
-        successes = sum(1 for m in metrics if m.success)
+    def _calculate_operation_stats(
+        self, success: np.ndarray, durations: np.ndarray
+    ) -> Dict[str, Any]:
+        """Calculate statistics from success and duration columns."""
+        total = int(success.size)
+        successes = int(np.count_nonzero(success))
         failures = total - successes
 
         stats = {
@@ -458,30 +639,60 @@ class URLMetadataMonitor:
             "success_rate": successes / total if total > 0 else 0.0,
         }
 
-        # Safely get durations, filtering out non-numeric values
-        durations = [m.duration_ms for m in metrics if m.success]
-        # only keep finite numbers
-        valid_durations = [
-            d for d in durations if isinstance(d, (int, float)) and math.isfinite(d)
-        ]
+        # Durations of successful operations, finite numbers only
+        valid = np.sort(durations[success & np.isfinite(durations)])
+
+        if valid.size:
+
+            def _pct(p):
+                return float(valid[int(round(p / 100 * (valid.size - 1)))])
+
+            stats.update(
+                {
+                    "avg_duration_ms": float(valid.mean()),
+                    "min_duration_ms": float(valid[0]),
+                    "max_duration_ms": float(valid[-1]),
+                    "p50_duration_ms": float(np.median(valid)),
+                    "p95_duration_ms": _pct(95),
+                    "p99_duration_ms": _pct(99),
+                }
+            )
+
+        return stats
 
-        if valid_durations:
-            # Safe percentile helper avoids StatisticsError on small samples
-            def _pct(seq, p):
-                if not seq:
-                    return 0.0
-                seq = sorted(seq)
-                idx = int(round(p / 100 * (len(seq) - 1)))
-                return seq[idx]
+    def _calculate_bucketed_operation_stats(
+        self, buckets: List[MetricBucket]
+    ) -> Optional[Dict[str, Any]]:
+        """Like ``_calculate_operation_stats``, from time buckets.
+
+        Counts, mean, min and max are exact; percentiles are read from the
+        latency histogram.
+        """
+        total = sum(b.count for b in buckets)
+        if not total:
+            return None
+        failures = sum(b.failures for b in buckets)
+        successes = total - failures
+
+        stats = {
+            "total": total,
+            "successes": successes,
+            "failures": failures,
+            "success_rate": successes / total,
+        }
 
+        latency = LatencyHistogram()
+        for bucket in buckets:
+            latency.merge(bucket.success_latency)
+        if latency.count:
             stats.update(
                 {
-                    "avg_duration_ms": statistics.mean(valid_durations),
-                    "min_duration_ms": min(valid_durations),
-                    "max_duration_ms": max(valid_durations),
-                    "p50_duration_ms": statistics.median(valid_durations),
-                    "p95_duration_ms": _pct(valid_durations, 95),
-                    "p99_duration_ms": _pct(valid_durations, 99),
+                    "avg_duration_ms": latency.mean(),
+                    "min_duration_ms": latency.min,
+                    "max_duration_ms": latency.max,
+                    "p50_duration_ms": latency.percentile(50),
+                    "p95_duration_ms": latency.percentile(95),
+                    "p99_duration_ms": latency.percentile(99),
                 }
             )
 
@@ -494,24 +705,10 @@ class URLMetadataMonitor:
         distribution = {name: 0 for name in self.performance_buckets}
 
         with self._lock:
-            for metrics in self.metrics_store.values():
-                for m in metrics:
-                    if (
-                        m.timestamp >= cutoff_time
-                        and isinstance(m.duration_ms, (int, float))
-                        and not (
-                            isinstance(m.duration_ms, float)
-                            and (
-                                m.duration_ms != m.duration_ms
-                                or m.duration_ms == float("inf")
-                                or m.duration_ms == float("-inf")
-                            )
-                        )
-                    ):
-                        for name, (min_ms, max_ms) in self.performance_buckets.items():
-                            if min_ms <= m.duration_ms < max_ms:
-                                distribution[name] += 1
-                                break
+            for op_type in self._rings:
+                for bucket in self._window_buckets(op_type, cutoff_time):
+                    for name, count in bucket.distribution.items():
+                        distribution[name] += count
 
         return distribution
 
@@ -520,51 +717,89 @@ class URLMetadataMonitor:
         trends = defaultdict(list)
         now = datetime.now(timezone.utc)
 
-        for hour in range(24):
-            hour_start = now - timedelta(hours=hour + 1)
-            hour_end = now - timedelta(hours=hour)
-
-            with self._lock:
-                for op_type, metrics in self.metrics_store.items():
-                    hour_metrics = [
-                        m for m in metrics if hour_start <= m.timestamp < hour_end
-                    ]
-
-                    if hour_metrics:
-                        durations = [m.duration_ms for m in hour_metrics]
-                        success_count = sum(1 for m in hour_metrics if m.success)
-                        trends[op_type].append(
-                            {
-                                "hour": hour_end.isoformat(),
-                                "avg_duration_ms": statistics.mean(durations),
-                                "success_rate": success_count / len(hour_metrics),
-                            }
-                        )
+        with self._lock:
+            for op_type, ring in self._rings.items():
+                for hour in range(24):
+                    hour_start = now - timedelta(hours=hour + 1)
+                    hour_end = now - timedelta(hours=hour)
+                    # The minute straddling two hours counts towards the newer
+                    buckets = list(
+                        ring.window(self._slot(hour_start) + 1, self._slot(hour_end))
+                    )
+                    count = sum(b.count for b in buckets)
+                    if not count:
+                        continue
+
+                    latency = LatencyHistogram()
+                    for bucket in buckets:
+                        latency.merge(bucket.latency)
+                    failures = sum(b.failures for b in buckets)
+                    trends[op_type].append(
+                        {
+                            "hour": hour_end.isoformat(),
+                            "avg_duration_ms": latency.mean(),
+                            "success_rate": (count - failures) / count,
+                        }
+                    )
 
         return dict(trends)
 
-    def export_metrics(self, filepath: Path, hours: Optional[int] = None) -> None:
-        """Export metrics to a JSON file."""
-        if hours:
-            cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours)
-        else:
-            cutoff_time = datetime.min.replace(tzinfo=timezone.utc)
-
-        export_data = {
-            "export_timestamp": datetime.now(timezone.utc).isoformat(),
-            "metrics": {},
-        }
+    def _export_cutoff(self, hours: Optional[int]) -> float:
+        if not hours:
+            return float("-inf")
+        return (datetime.now(timezone.utc) - timedelta(hours=hours)).timestamp()
 
+    def _export_ends(self) -> Dict[str, int]:
+        """Trim, then fix the end of every operation's rows for one export."""
         with self._lock:
-            for op_type, metrics in self.metrics_store.items():
-                export_data["metrics"][op_type] = [
-                    asdict(m) for m in metrics if m.timestamp >= cutoff_time
-                ]
+            # Trimming is amortized, so expired metrics may still be present
+            self._trim_expired_metrics()
+            return {
+                op_type: columns.next_seq
+                for op_type, columns in self.metrics_store.items()
+            }
+
+    def _export_chunks(
+        self,
+        op_type: str,
+        start_seq: int,
+        end_seq: int,
+        cutoff: float,
+        chunk_rows: int,
+    ):
+        """
+        Yield ``(records, next_seq)`` for rows in ``[start_seq, end_seq)``.
+
+        The lock is held only while one chunk is copied, so recording
+        continues during long exports.
+        """
+        seq = start_seq
+        while seq < end_seq:
+            with self._lock:
+                columns = self.metrics_store[op_type]
+                records, next_seq = columns.records(
+                    seq, min(chunk_rows, end_seq - seq), cutoff
+                )
+            if next_seq <= seq:
+                break
+            seq = next_seq
+            yield records, seq
 
-        # Convert datetime objects to strings
-        for op_type in export_data["metrics"]:
-            for metric in export_data["metrics"][op_type]:
-                metric["timestamp"] = metric["timestamp"].isoformat()
+    def export_metrics(
+        self,
+        filepath: Path,
+        hours: Optional[int] = None,
+        chunk_rows: int = EXPORT_CHUNK_ROWS,
+    ) -> None:
+        """Export metrics to a JSON file.
+
+        The document is streamed to a temporary file chunk by chunk and then
+        renamed into place, so memory stays flat and the monitor lock is
+        held only briefly per chunk.
+        """
+        filepath = Path(filepath)
+        cutoff = self._export_cutoff(hours)
+        ends = self._export_ends()
 
         try:
             # Ensure parent directory exists
@@ -573,12 +808,107 @@ class URLMetadataMonitor:
             # Write to temporary file first, then rename for atomicity
             temp_path = filepath.with_suffix(".tmp")
             with open(temp_path, "w") as f:
-                json.dump(export_data, f, indent=2)
+                export_timestamp = json.dumps(datetime.now(timezone.utc).isoformat())
+                f.write(f'{{"export_timestamp": {export_timestamp}, "metrics": {{')
+                for i, (op_type, end_seq) in enumerate(ends.items()):
+                    f.write(f"{', ' if i else ''}{json.dumps(op_type)}: [")
+                    first = True
+                    for records, _seq in self._export_chunks(
+                        op_type, 0, end_seq, cutoff, chunk_rows
+                    ):
+                        for record in records:
+                            f.write(("\n" if first else ",\n") + json.dumps(record))
+                            first = False
+                    f.write("]")
+                f.write("}}\n")
             temp_path.replace(filepath)
         except (IOError, OSError) as e:
             logger.error(f"Failed to export metrics to {filepath}: {e}")
             raise
 
+    def export_metrics_incremental(
+        self,
+        filepath: Path,
+        cursor: Optional[Dict[str, int]] = None,
+        hours: Optional[int] = None,
+        chunk_rows: int = EXPORT_CHUNK_ROWS,
+    ) -> Dict[str, int]:
+        """Append metrics recorded since the last export as JSON lines.
+
+        Args:
+            filepath: JSONL file to append to (one metric per line)
+            cursor: Per-operation sequence numbers returned by a previous
+                call. Defaults to where the last incremental export to
+                ``filepath`` stopped, or the oldest retained metric.
+            hours: Only export metrics from the last ``hours`` hours
+            chunk_rows: Rows copied per lock acquisition
+
+        Returns:
+            The cursor to pass next time; persist it to resume across
+            restarts.
+
+        The stored cursor advances after each chunk reaches the file. If a
+        write fails, the file is cut back to the last complete chunk, so a
+        retry with ``cursor=None`` neither skips nor repeats metrics.
+        """
+        filepath = Path(filepath)
+        with self._export_lock:
+            if cursor is None:
+                cursor = self._export_cursors.get(str(filepath), {})
+            cursor = dict(cursor)
+            cutoff = self._export_cutoff(hours)
+            ends = self._export_ends()
+            written_to = None
+            try:
+                filepath.parent.mkdir(parents=True, exist_ok=True)
+                with open(filepath, "a") as f:
+                    written_to = f.tell()
+                    for op_type, end_seq in ends.items():
+                        for records, seq in self._export_chunks(
+                            op_type, cursor.get(op_type, 0), end_seq, cutoff, chunk_rows
+                        ):
+                            if records:
+                                f.write("".join(json.dumps(r) + "\n" for r in records))
+                                f.flush()
+                                written_to = f.tell()
+                            cursor[op_type] = seq
+                            self._export_cursors[str(filepath)] = dict(cursor)
+            except (IOError, OSError) as e:
+                logger.error(f"Failed to export metrics to {filepath}: {e}")
+                if written_to is not None:
+                    self._truncate_export(filepath, written_to)
+                raise
+            return dict(cursor)
+
+    @staticmethod
+    def _truncate_export(filepath: Path, size: int) -> None:
+        # Drop a partly written chunk so the file matches the stored cursor
+        try:
+            os.truncate(filepath, size)
+        except OSError as e:
+            logger.error(f"Failed to roll back partial export to {filepath}: {e}")
+
+    def submit_export(
+        self, filepath: Path, incremental: bool = True, **kwargs: Any
+    ) -> Future:
+        """Run ``export_metrics_incremental`` (or ``export_metrics``) on the
+        shared background pool and return its future."""
+        export = self.export_metrics_incremental if incremental else self.export_metrics
+        return get_executor("background").submit(export, filepath, **kwargs)
+
+    def schedule_export(
+        self, filepath: Path, interval_seconds: float = 3600.0
+    ) -> PeriodicTask:
+        """Append new metrics to ``filepath`` every ``interval_seconds``.
+
+        Runs on the background pool; cancel the returned task to stop.
+        """
+        return schedule_periodic(
+            f"url-metrics-export:{filepath}",
+            lambda: self.export_metrics_incremental(filepath),
+            interval_seconds,
+        )
+
 
 # Global monitor instance
 url_metadata_monitor = URLMetadataMonitor()
@@ -153,6 +153,27 @@ except Exception:
     except Exception:
         PerformanceOptimizedLogger = None  # type: ignore[assignment]
 
+try:
+    from ..btc_max_knowledge_agent.utils.latency_histogram import (  # type: ignore
+        LatencyHistogram,
+    )
+except Exception:
+    from ..utils.latency_histogram import LatencyHistogram  # type: ignore
+
+# Absolute import first so the web API and every other subsystem share one
+# registry regardless of the path this module was loaded through
+try:
+    from btc_max_knowledge_agent.utils.metrics_registry import REGISTRY
+except ImportError:  # pragma: no cover
+    from ..utils.metrics_registry import REGISTRY  # type: ignore
+
+_PREPROCESS_TOTAL = REGISTRY.counter(
+    "secure_preprocess_total", "Prompts preprocessed by decided action", ["action"]
+)
+_PREPROCESS_SECONDS = REGISTRY.histogram(
+    "secure_preprocess_seconds", "Prompt security preprocessing time"
+)
+
 # Module-level loggers (always defined)
 from typing import Protocol, runtime_checkable
 
@@ -224,6 +245,8 @@ class SecurePromptPreprocessor:
         self._plog = logger or _perf_logger
         # compose sanitization service (single instance)
         self._sanitizer = SanitizationService(_DEFAULT_POLICY)
+        # preprocessing latency in milliseconds (mergeable across workers)
+        self.latency = LatencyHistogram()
 
     async def secure_preprocess(
         self, text: str, context: Optional[Dict[str, Any]] = None
@@ -276,6 +299,9 @@ class SecurePromptPreprocessor:
         input_len = len(text or "")
         sha8 = self._hash_truncated(text or "")
         dur_ms = max(0.0, (time.time() - start) * 1000.0)
+        self.latency.record(dur_ms)
+        _PREPROCESS_SECONDS.observe(dur_ms / 1000.0)
+        _PREPROCESS_TOTAL.labels(getattr(action, "name", action)).inc()
 
         sid = ctx.get("session_id")
         rid = ctx.get("request_id")
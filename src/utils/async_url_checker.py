@@ -0,0 +1,338 @@
+"""
+Asynchronous URL accessibility checking over a pooled aiohttp session.
+
+``check_urls_accessibility_parallel`` opens a new connection (TCP + TLS
+handshake) per URL from a fresh thread pool. ``AsyncURLChecker`` keeps one
+``aiohttp.ClientSession`` for its lifetime instead, so checking thousands of
+corpus URLs reuses keep-alive connections and cached DNS lookups, while
+``limit_per_host`` keeps the checker polite towards any single site.
+
+Each URL gets a HEAD request; servers that reject HEAD (405/501, or a
+dropped connection) are retried with a one-byte ranged GET. Redirect chains
+are capped at ``max_redirects``. Results stream back as they complete.
+
+Usage::
+
+    async with AsyncURLChecker(limit_per_host=4) as checker:
+        async for result in checker.iter_results(urls):
+            print(result.url, result.accessible)
+
+or, from synchronous code, ``check_urls_accessibility_async(urls)``.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+from .url_utils import (
+    ALLOWED_SCHEMES,
+    HEAD_UNSUPPORTED_STATUSES,
+    find_private_address,
+    log_validation,
+    record_validation,
+    validate_url_format,
+)
+
+try:  # one pool set, tracker and cache per process, whichever path imported this
+    from btc_max_knowledge_agent.utils.executors import get_executor
+    from btc_max_knowledge_agent.utils.host_health import host_health_tracker, host_of
+    from btc_max_knowledge_agent.utils.persistent_url_cache import (
+        get_persistent_url_cache,
+    )
+except ImportError:  # pragma: no cover
+    from .executors import get_executor
+    from .host_health import host_health_tracker, host_of
+    from .persistent_url_cache import get_persistent_url_cache
+
+
+# Body bytes read per response before the connection is released
+MAX_DRAIN_BYTES = 64 * 1024
+
+
+@dataclass
+class AccessibilityResult:
+    """Outcome of checking one URL."""
+
+    url: str
+    accessible: bool
+    status_code: Optional[int] = None
+    final_url: Optional[str] = None
+    method: Optional[str] = None
+    error: Optional[str] = None
+    error_type: Optional[str] = None
+    duration_ms: float = 0.0
+    cached: bool = False
+
+
+def _error_type_for_status(status: int) -> str:
+    """Map a failing status to the error types used by check_url_accessibility."""
+    if status >= 500:
+        return "server_error"
+    if status == 404:
+        return "not_found"
+    if status in (401, 403):
+        return "auth_required"
+    return f"http_{status}"
+
+
+class AsyncURLChecker:
+    """Check URL accessibility concurrently over one shared connection pool."""
+
+    def __init__(
+        self,
+        timeout: float = 5.0,
+        concurrency: int = 50,
+        limit: int = 100,
+        limit_per_host: int = 4,
+        dns_cache_ttl: int = 300,
+        max_redirects: int = 5,
+        use_cache: bool = True,
+        user_agent: str = "BTC-Max-Knowledge-Agent/1.0",
+    ):
+        """
+        Args:
+            timeout: Total timeout per request in seconds
+            concurrency: Maximum number of URLs checked at once
+            limit: Maximum open connections in the pool
+            limit_per_host: Maximum open connections to one host
+            dns_cache_ttl: Seconds to cache DNS lookups
+            max_redirects: Maximum redirects followed per request (1-10)
+            use_cache: Read and write the persistent cross-process cache
+                (when ``URL_PERSISTENT_CACHE_PATH`` is configured)
+            user_agent: User-Agent header sent with every request
+        """
+        self.timeout = timeout
+        self.concurrency = max(1, concurrency)
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.max_redirects = max(1, min(10, int(max_redirects)))
+        self.use_cache = use_cache
+        self.user_agent = user_agent
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "AsyncURLChecker":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        """Open the shared session (called automatically by ``async with``)."""
+        if self._session is not None and not self._session.closed:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            use_dns_cache=True,
+            ttl_dns_cache=self.dns_cache_ttl,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={"User-Agent": self.user_agent, "Accept": "*/*"},
+        )
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+
+    async def close(self) -> None:
+        """Close the session and its pooled connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def check(self, url: str) -> AccessibilityResult:
+        """Check a single URL."""
+        if self._session is None:
+            await self.start()
+
+        if not url or not isinstance(url, str) or not url.strip():
+            return self._finish(
+                AccessibilityResult(str(url or ""), False, error_type="invalid_url")
+            )
+        url = url.strip()
+        if not validate_url_format(url):
+            return self._finish(
+                AccessibilityResult(url, False, error_type="invalid_format")
+            )
+        scheme = urlparse(url).scheme.lower()
+        if scheme not in ALLOWED_SCHEMES:
+            return self._finish(
+                AccessibilityResult(
+                    url,
+                    False,
+                    error=f"unsupported_scheme: {scheme}",
+                    error_type="unsupported_scheme",
+                )
+            )
+
+        shared = get_persistent_url_cache() if self.use_cache else None
+        if shared is not None:
+            cached = shared.get("accessibility", url)
+            if cached is not None:
+                return AccessibilityResult(url, cached[0], error=cached[1], cached=True)
+
+        host = host_of(url)
+        async with self._semaphore:
+            # Resolve off the event loop (cached after the first URL per
+            # host), within ``concurrency`` so a large batch cannot queue a
+            # resolver job per URL on the shared io pool
+            private_address = await asyncio.get_running_loop().run_in_executor(
+                get_executor("io"), find_private_address, host
+            )
+            if private_address:
+                return self._finish(
+                    AccessibilityResult(
+                        url,
+                        False,
+                        error=f"private_ip: {private_address}",
+                        error_type="private_ip",
+                    )
+                )
+            if not host_health_tracker.allow_request(host):
+                return self._finish(
+                    AccessibilityResult(
+                        url,
+                        False,
+                        error="host_circuit_open",
+                        error_type="host_unavailable",
+                    )
+                )
+            result = await self._probe(url)
+        if result.error_type in ("timeout", "request_failed", "server_error"):
+            host_health_tracker.record_failure(host, result.error, result.duration_ms)
+        elif result.error_type != "unexpected_error":
+            host_health_tracker.record_success(host, result.duration_ms)
+        if shared is not None:
+            shared.put("accessibility", url, result.accessible, result.error)
+        return self._finish(result)
+
+    async def iter_results(
+        self, urls: Iterable[str]
+    ) -> AsyncIterator[AccessibilityResult]:
+        """Check ``urls`` concurrently, yielding each result as it completes."""
+        if self._session is None:
+            await self.start()
+        tasks = [asyncio.ensure_future(self.check(url)) for url in dict.fromkeys(urls)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def check_many(self, urls: Iterable[str]) -> List[AccessibilityResult]:
+        """Check ``urls`` concurrently and return all results (completion order)."""
+        return [result async for result in self.iter_results(urls)]
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    async def _probe(self, url: str) -> AccessibilityResult:
+        start = time.time()
+        result = AccessibilityResult(url, False)
+        try:
+            try:
+                status, final_url = await self._request("HEAD", url)
+                result.method = "HEAD"
+            except aiohttp.ServerDisconnectedError:
+                # Some servers drop HEAD requests outright. Refused
+                # connections, DNS and TLS errors would fail the same way
+                # with GET, so they are not retried.
+                status, final_url = await self._request("GET", url)
+                result.method = "GET"
+            if status in HEAD_UNSUPPORTED_STATUSES and result.method == "HEAD":
+                status, final_url = await self._request("GET", url)
+                result.method = "GET"
+
+            result.status_code = status
+            result.final_url = final_url
+            result.accessible = 200 <= status < 400
+            if not result.accessible:
+                result.error = f"HTTP {status}"
+                result.error_type = _error_type_for_status(status)
+        except aiohttp.TooManyRedirects as e:
+            result.error, result.error_type = str(e), "too_many_redirects"
+        except asyncio.TimeoutError:
+            result.error, result.error_type = "Request timed out", "timeout"
+        except aiohttp.ClientError as e:
+            result.error, result.error_type = str(e), "request_failed"
+        except Exception as e:
+            result.error, result.error_type = str(e), "unexpected_error"
+        result.duration_ms = (time.time() - start) * 1000
+        return result
+
+    async def _request(self, method: str, url: str) -> tuple:
+        """Issue one request; returns (status, final_url) and frees the connection."""
+        headers = {"Range": "bytes=0-0"} if method == "GET" else None
+        async with self._session.request(
+            method,
+            url,
+            allow_redirects=True,
+            max_redirects=self.max_redirects,
+            headers=headers,
+        ) as response:
+            # Draining the one-byte range lets the connection return to the
+            # pool; a server that ignores Range gets its connection closed
+            # rather than its whole body downloaded
+            remaining = MAX_DRAIN_BYTES
+            while remaining > 0:
+                chunk = await response.content.read(remaining)
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+            return response.status, str(response.url)
+
+    def _finish(self, result: AccessibilityResult) -> AccessibilityResult:
+        """Log and record a result the same way check_url_accessibility does."""
+        details = {"status_code": result.status_code, "method": result.method}
+        if result.error:
+            details["error"] = result.error
+        if result.final_url:
+            details["final_url"] = result.final_url
+        log_validation(
+            result.url,
+            result.accessible,
+            "accessibility_check",
+            details=details,
+            duration_ms=result.duration_ms,
+        )
+        if result.accessible:
+            record_validation(result.url, True, result.duration_ms)
+        else:
+            record_validation(
+                result.url, False, result.duration_ms, error_type=result.error_type
+            )
+        return result
+
+
+def check_urls_accessibility_async(
+    urls: Iterable[str], **checker_options
+) -> Dict[str, bool]:
+    """
+    Synchronous entry point: check ``urls`` over one pooled session.
+
+    Drop-in alternative to ``check_urls_accessibility_parallel``. Must not be
+    called from a running event loop; use ``AsyncURLChecker`` there.
+
+    Args:
+        urls: URLs to check
+        **checker_options: Forwarded to ``AsyncURLChecker``
+
+    Returns:
+        Dict[str, bool]: URL → accessibility
+    """
+
+    async def run() -> Dict[str, bool]:
+        async with AsyncURLChecker(**checker_options) as checker:
+            return {
+                result.url: result.accessible
+                async for result in checker.iter_results(urls)
+            }
+
+    return asyncio.run(run())
@@ -4,6 +4,8 @@ import base64
 import re
 from typing import Iterator, Union
 
+from .text_normalizer import clean_markdown_for_speech
+
 
 BytesLike = Union[bytes, bytearray]
 
@@ -55,70 +57,7 @@ class ResponseContentExtractor:
     def _clean_markdown(text: str) -> str:
         if text is None:
             raise AudioProcessingError("text is None")
-        # 1) Convert markdown headers into sentences with terminal period.
-        lines_in: list[str] = []
-        for line in text.splitlines():
-            m = re.match(r"^\s*#+\s+(.*)$", line)
-            if m:
-                hdr = m.group(1).strip()
-                hdr = re.sub(r"[#\s]+$", "", hdr)
-                if hdr and not hdr.endswith("."):
-                    hdr = hdr + "."
-                lines_in.append(hdr)
-            else:
-                lines_in.append(line)
-        cleaned = "\n".join(lines_in)
-        # 2) Strip inline markdown symbols and code fences/backticks content markers.
-        cleaned = re.sub(r"[`*_~]+", "", cleaned)
-        # Remove inline code patterns like print("...") by dropping code-y tokens.
-        # This is conservative: strip sequences like identifier( ... ) commonly used in examples.
-        cleaned = re.sub(r"\bprint\s*\([^)]*\)", "", cleaned)
-        # 3) Drop 'Sources' sections and 'Source:' lines.
-        kept: list[str] = []
-        for line in cleaned.splitlines():
-            s = line.strip()
-            # Drop metadata or boilerplate lines frequently present in tool outputs
-            if re.match(r"(?i)^sources?\b", s):
-                continue
-            if re.match(r"(?i)^source:\b", s):
-                continue
-            if re.match(r"(?i)^(query|relevance|result\s*\d+)\s*:\s*", s):
-                continue
-            if re.match(r"(?i)^found\s+\d+\s+relevant\s+results", s):
-                continue
-            if re.match(r"(?i)^\d+\s+results?\s+include\s+source\s+links", s):
-                continue
-            # Drop standalone "Result N." fragments appearing mid-sentence
-            s_no_result_label = re.sub(r"(?i)\bresult\s*\d+\b\.?", "", s)
-            if s_no_result_label != s:
-                # Keep the modified line without the "Result N" token
-                line = re.sub(r"(?i)\bresult\s*\d+\b\.?", "", line)
-            kept.append(line)
-        cleaned = "\n".join(kept)
-        # Also drop inline 'Source: ...' fragments
-        cleaned = re.sub(r"(?i)\bsource:\s*[^\n]+", "", cleaned)
-        # Remove markdown links like [text](url) -> keep just 'text'
-        cleaned = re.sub(r"\[([^\]]+)\]\([^)]+\)", r"\1", cleaned)
-        # Remove bare domains/hostnames like 'Bitcoin.org' or 'example.com'
-        cleaned = re.sub(r"\b(?:[A-Za-z0-9-]+\.)+[A-Za-z]{2,}\b", "", cleaned)
-        # Remove entire blockquoted lines so quoted content does not leak through
-        cleaned = "\n".join(
-            line for line in cleaned.splitlines()
-            if not re.match(r"^\s*>\s*", line)
-        )
-        # Remove list markers often used in example sections
-        cleaned = re.sub(r"(?m)^\s*[-*]\s+", "", cleaned)    # bullet list
-        cleaned = re.sub(r"(?m)^\s*\d+\.\s+", "", cleaned)   # ordered list
-        # 4) Collapse stray leading '#' that may remain
-        cleaned = re.sub(r"^\s*#\s+", "", cleaned, flags=re.MULTILINE)
-        # Remove horizontal rules or separators like '---'
-        cleaned = re.sub(r"(?m)^\s*-{3,}\s*$", "", cleaned)
-        cleaned = re.sub(r"\s+-{3,}\s+", " ", cleaned)
-        # 5) Normalize whitespace
-        cleaned = re.sub(r"[ \t]+", " ", cleaned)
-        cleaned = re.sub(r"\s{2,}", " ", cleaned)
-        cleaned = re.sub(r"\s*\n\s*", " ", cleaned)
-        return cleaned.strip()
+        return clean_markdown_for_speech(text)
 
     @staticmethod
     def extract_from_structured_response(data: dict) -> str:
@@ -0,0 +1,374 @@
+"""
+Process-wide registry of named, bounded thread pools.
+
+Instead of every subsystem creating (and tearing down) its own
+``ThreadPoolExecutor``, work is submitted to one of three shared pools:
+
+- ``io``: blocking network and disk calls (URL checks, DNS lookups)
+- ``cpu``: short pure-Python work such as batch URL validation; sized to
+  the core count so busy subsystems do not oversubscribe the machine
+- ``background``: periodic housekeeping (cache cleanup), driven by
+  ``schedule_periodic`` so no subsystem needs its own sleeping daemon thread
+
+Pool sizes come from ``EXECUTOR_IO_WORKERS``, ``EXECUTOR_CPU_WORKERS`` and
+``EXECUTOR_BACKGROUND_WORKERS``. Every pool reports its queue depth, active
+workers and utilization through ``get_executor_stats``.
+
+Import this module as ``btc_max_knowledge_agent.utils.executors`` so that
+every subsystem shares the same pools; ``src/utils`` is also importable as
+``utils``, and a second copy of this module would bring a second set of
+pools and its own scheduler thread.
+
+Pools are created lazily and recreated in a forked child (e.g. a gunicorn
+worker), since threads do not survive ``fork``; periodic tasks carry over.
+
+Submitted work runs in a copy of the submitter's ``contextvars`` context,
+like ``asyncio.to_thread``, so request-scoped state such as the logging
+correlation ID follows it onto the pool (including ``run_in_executor``).
+"""
+
+import atexit
+import contextvars
+import heapq
+import itertools
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_CPU_COUNT = os.cpu_count() or 1
+
+POOL_SIZES: Dict[str, int] = {
+    "io": int(os.getenv("EXECUTOR_IO_WORKERS", str(min(32, _CPU_COUNT * 4)))),
+    "cpu": int(os.getenv("EXECUTOR_CPU_WORKERS", str(_CPU_COUNT))),
+    "background": int(os.getenv("EXECUTOR_BACKGROUND_WORKERS", "2")),
+}
+
+_worker_pool = threading.local()
+
+# ThreadPoolExecutor.shutdown only takes cancel_futures from Python 3.9
+_HAS_CANCEL_FUTURES = sys.version_info >= (3, 9)
+
+
+class BoundedExecutor(ThreadPoolExecutor):
+    """``ThreadPoolExecutor`` that keeps queue depth and utilization counters."""
+
+    def __init__(self, name: str, max_workers: int):
+        super().__init__(
+            max_workers=max_workers,
+            thread_name_prefix=f"{name}-pool",
+            initializer=_mark_worker,
+            initargs=(name,),
+        )
+        self.name = name
+        self.max_workers = max_workers
+        self._stats_lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._busy_seconds = 0.0
+        self._created_at = time.monotonic()
+
+    def submit(self, fn: Callable, /, *args, **kwargs) -> Future:
+        context = contextvars.copy_context()
+        with self._stats_lock:
+            self._queued += 1
+            self._submitted += 1
+
+        def run():
+            with self._stats_lock:
+                self._queued -= 1
+                self._active += 1
+            start = time.monotonic()
+            failed = False
+            try:
+                return context.run(fn, *args, **kwargs)
+            except BaseException:
+                failed = True
+                raise
+            finally:
+                with self._stats_lock:
+                    self._active -= 1
+                    self._completed += 1
+                    self._failed += failed
+                    self._busy_seconds += time.monotonic() - start
+
+        try:
+            return super().submit(run)
+        except RuntimeError:
+            with self._stats_lock:
+                self._queued -= 1
+                self._submitted -= 1
+            raise
+
+    def map_unordered(
+        self,
+        fn: Callable[[Any], Any],
+        items: Iterable[Any],
+        max_in_flight: Optional[int] = None,
+    ) -> Iterator[Tuple[Any, Future]]:
+        """
+        Run ``fn`` over ``items``, yielding ``(item, future)`` as each finishes.
+
+        At most ``max_in_flight`` items are submitted at a time, so a caller's
+        own concurrency limit still applies on the shared pool. When called
+        from a worker of this same pool the items run inline instead, because
+        waiting on the pool from inside it could deadlock once every worker
+        is waiting.
+        """
+        if getattr(_worker_pool, "name", None) == self.name:
+            for item in items:
+                future: Future = Future()
+                try:
+                    future.set_result(fn(item))
+                except Exception as e:
+                    future.set_exception(e)
+                yield item, future
+            return
+
+        limit = max(1, max_in_flight or self.max_workers)
+        pending: Dict[Future, Any] = {}
+        iterator = iter(items)
+        for item in itertools.islice(iterator, limit):
+            pending[self.submit(fn, item)] = item
+        while pending:
+            done = next(as_completed(pending))
+            yield pending.pop(done), done
+            for item in itertools.islice(iterator, 1):
+                pending[self.submit(fn, item)] = item
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        if not cancel_futures or _HAS_CANCEL_FUTURES:
+            if cancel_futures:
+                super().shutdown(wait=wait, cancel_futures=True)
+            else:
+                super().shutdown(wait=wait)
+            return
+        # Older Pythons: cancel queued work ourselves before the workers are
+        # told to exit, so they do not run it first
+        while True:
+            try:
+                work_item = self._work_queue.get_nowait()
+            except queue.Empty:
+                break
+            if work_item is not None:
+                work_item.future.cancel()
+        super().shutdown(wait=wait)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            uptime = max(time.monotonic() - self._created_at, 1e-9)
+            return {
+                "max_workers": self.max_workers,
+                "threads": len(self._threads),
+                "active": self._active,
+                "queue_depth": self._queued,
+                "utilization": self._active / self.max_workers,
+                "busy_ratio": min(
+                    1.0, self._busy_seconds / (uptime * self.max_workers)
+                ),
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+            }
+
+
+def _mark_worker(name: str) -> None:
+    _worker_pool.name = name
+
+
+@dataclass
+class PeriodicTask:
+    """A job that ``schedule_periodic`` submits to a pool every ``interval``."""
+
+    name: str
+    func: Callable[[], Any]
+    interval: float
+    pool: str = "background"
+    cancelled: bool = False
+    running: bool = False
+    runs: int = 0
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class ExecutorRegistry:
+    """Owns the named pools and the scheduler thread for periodic tasks."""
+
+    def __init__(self, sizes: Optional[Dict[str, int]] = None):
+        self.sizes = dict(POOL_SIZES if sizes is None else sizes)
+        self._lock = threading.Lock()
+        self._pools: Dict[str, BoundedExecutor] = {}
+        self._tasks: list = []
+        self._task_counter = itertools.count()
+        self._wakeup = threading.Condition(self._lock)
+        self._scheduler: Optional[threading.Thread] = None
+
+    def get(self, name: str) -> BoundedExecutor:
+        """Return the pool called ``name``, creating it on first use."""
+        with self._lock:
+            pool = self._pools.get(name)
+            if pool is None:
+                if name not in self.sizes:
+                    raise KeyError(f"Unknown executor pool: {name}")
+                pool = BoundedExecutor(name, max(1, self.sizes[name]))
+                self._pools[name] = pool
+            return pool
+
+    def schedule_periodic(
+        self,
+        name: str,
+        func: Callable[[], Any],
+        interval: float,
+        pool: str = "background",
+    ) -> PeriodicTask:
+        """
+        Run ``func`` on ``pool`` every ``interval`` seconds, first after one
+        interval. A run is skipped while the previous one is still going.
+        """
+        task = PeriodicTask(name=name, func=func, interval=interval, pool=pool)
+        with self._lock:
+            heapq.heappush(
+                self._tasks,
+                (time.monotonic() + interval, next(self._task_counter), task),
+            )
+            self._ensure_scheduler()
+            self._wakeup.notify()
+        return task
+
+    def _ensure_scheduler(self) -> None:
+        # Caller holds self._lock
+        if self._scheduler is None or not self._scheduler.is_alive():
+            self._scheduler = threading.Thread(
+                target=self._run_scheduler, name="executor-scheduler", daemon=True
+            )
+            self._scheduler.start()
+
+    def _run_scheduler(self) -> None:
+        me = threading.current_thread()
+        while True:
+            with self._lock:
+                while self._scheduler is me and not (
+                    self._tasks and self._tasks[0][0] <= time.monotonic()
+                ):
+                    timeout = (
+                        self._tasks[0][0] - time.monotonic() if self._tasks else None
+                    )
+                    self._wakeup.wait(timeout)
+                if self._scheduler is not me:
+                    return
+                _, _, task = heapq.heappop(self._tasks)
+                if task.cancelled:
+                    continue
+                heapq.heappush(
+                    self._tasks,
+                    (
+                        time.monotonic() + task.interval,
+                        next(self._task_counter),
+                        task,
+                    ),
+                )
+            if not task.running:
+                try:
+                    task.running = True
+                    self.get(task.pool).submit(self._run_task, task)
+                except RuntimeError:
+                    task.running = False  # pool shut down
+                    return
+
+    @staticmethod
+    def _run_task(task: PeriodicTask) -> None:
+        try:
+            task.func()
+        except Exception as e:
+            logger.error(f"Periodic task {task.name} failed: {e}")
+        finally:
+            task.runs += 1
+            task.running = False
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            pools = dict(self._pools)
+            periodic = [task.name for _, _, task in self._tasks if not task.cancelled]
+        stats = {name: pool.get_stats() for name, pool in pools.items()}
+        for name, size in self.sizes.items():
+            stats.setdefault(
+                name,
+                {
+                    "max_workers": size,
+                    "threads": 0,
+                    "active": 0,
+                    "queue_depth": 0,
+                    "utilization": 0.0,
+                    "busy_ratio": 0.0,
+                    "submitted": 0,
+                    "completed": 0,
+                    "failed": 0,
+                },
+            )
+        stats["periodic_tasks"] = sorted(periodic)
+        return stats
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the scheduler and shut every pool down."""
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+            self._tasks.clear()
+            self._scheduler = None
+            self._wakeup.notify_all()
+        for pool in pools:
+            pool.shutdown(wait=wait, cancel_futures=not wait)
+
+    def _after_fork_in_child(self) -> None:
+        # Pools and the scheduler inherited from the parent have no live
+        # threads in the child (and the lock may have been held mid-fork),
+        # so start fresh but keep the periodic tasks.
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._pools = {}
+        self._scheduler = None
+        for _, _, task in self._tasks:
+            task.running = False
+        if self._tasks:
+            self._ensure_scheduler()
+
+
+executor_registry = ExecutorRegistry()
+
+
+def get_executor(name: str) -> BoundedExecutor:
+    """Return the shared ``io``, ``cpu`` or ``background`` pool."""
+    return executor_registry.get(name)
+
+
+def schedule_periodic(
+    name: str, func: Callable[[], Any], interval: float, pool: str = "background"
+) -> PeriodicTask:
+    """Run ``func`` every ``interval`` seconds on a shared pool."""
+    return executor_registry.schedule_periodic(name, func, interval, pool)
+
+
+def get_executor_stats() -> Dict[str, Dict[str, Any]]:
+    """Queue depth, active workers and utilization for every pool."""
+    return executor_registry.get_stats()
+
+
+def shutdown_executors(wait: bool = True) -> None:
+    """Shut down the shared pools (registered to run at interpreter exit)."""
+    executor_registry.shutdown(wait=wait)
+
+
+atexit.register(shutdown_executors, wait=False)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=lambda: executor_registry._after_fork_in_child())
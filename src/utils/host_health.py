@@ -0,0 +1,254 @@
+"""
+Per-host health tracking and circuit breaking for URL checks.
+
+When a whole domain is down, every URL on it would otherwise be probed with
+the full timeout and retry budget. ``HostHealthTracker`` records recent
+host-level outcomes (connection errors, timeouts and 5xx responses count as
+failures; 4xx responses prove the host is up) and latency per host. After
+``failure_threshold`` consecutive failures the host's circuit opens and
+further checks are short-circuited for a cool-down period. Once it expires a
+single trial request is let through (half-open); success closes the circuit,
+failure reopens it with a doubled cool-down (up to ``max_cooldown_seconds``).
+
+The module-level ``host_health_tracker`` is shared by ``check_url_accessibility``,
+``AsyncURLChecker``, ``URLMetadataMonitor`` and the link-rot scanner so every
+check in a batch benefits from what the others learned. Import it as
+``btc_max_knowledge_agent.utils.host_health``; a copy of this module loaded
+under another name would hold a separate tracker.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Optional
+from urllib.parse import urlparse
+
+from .tts_error_handler import CircuitState
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HostHealthConfig:
+    """Configuration for per-host circuit breaking."""
+
+    failure_threshold: int = int(os.getenv("URL_HOST_FAILURE_THRESHOLD", "3"))
+    cooldown_seconds: float = float(os.getenv("URL_HOST_COOLDOWN_SECONDS", "60"))
+    max_cooldown_seconds: float = float(
+        os.getenv("URL_HOST_MAX_COOLDOWN_SECONDS", "900")
+    )
+    window_size: int = 20  # Recent outcomes kept per host
+    max_hosts: int = 10000  # Least recently used hosts are forgotten beyond this
+
+
+@dataclass
+class HostHealth:
+    """Health record for one host."""
+
+    host: str
+    state: CircuitState = CircuitState.CLOSED
+    consecutive_failures: int = 0
+    successes: int = 0
+    failures: int = 0
+    short_circuited: int = 0
+    latency_ms: Optional[float] = None  # Exponentially weighted average
+    last_error: Optional[str] = None
+    opened_at: Optional[float] = None
+    cooldown_seconds: float = 0.0
+    trial_started_at: Optional[float] = None
+    recent: Deque[bool] = field(default_factory=deque)
+
+
+def host_of(url: str) -> Optional[str]:
+    """Return the lower-cased host name of ``url`` (None if it has none)."""
+    try:
+        host = urlparse(url).hostname
+    except ValueError:
+        return None
+    return host.lower() if host else None
+
+
+class HostHealthTracker:
+    """Thread-safe table of per-host health with circuit breaking."""
+
+    def __init__(
+        self,
+        config: Optional[HostHealthConfig] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.config = config or HostHealthConfig()
+        self.clock = clock
+        self._hosts: "OrderedDict[str, HostHealth]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, host: str) -> HostHealth:
+        health = self._hosts.get(host)
+        if health is None:
+            health = HostHealth(host=host, recent=deque(maxlen=self.config.window_size))
+            self._hosts[host] = health
+            while len(self._hosts) > self.config.max_hosts:
+                self._hosts.popitem(last=False)
+        else:
+            self._hosts.move_to_end(host)
+        return health
+
+    def allow_request(self, host: Optional[str]) -> bool:
+        """
+        Return False if checks to ``host`` should be short-circuited.
+
+        When an open circuit's cool-down has expired, exactly one caller is
+        allowed through as a trial; concurrent callers keep being refused
+        until that trial is recorded (or, if its outcome is never recorded,
+        for another cool-down period).
+        """
+        if not host:
+            return True
+        with self._lock:
+            health = self._get(host)
+            if health.state == CircuitState.CLOSED:
+                return True
+            now = self.clock()
+            if health.state == CircuitState.OPEN:
+                if now - health.opened_at < health.cooldown_seconds:
+                    health.short_circuited += 1
+                    return False
+                health.state = CircuitState.HALF_OPEN
+                health.trial_started_at = None
+                logger.info(f"Host {host} cool-down expired, sending trial request")
+            if (
+                health.trial_started_at is not None
+                and now - health.trial_started_at < health.cooldown_seconds
+            ):
+                health.short_circuited += 1
+                return False
+            health.trial_started_at = now
+            return True
+
+    def record_success(self, host: Optional[str], latency_ms: Optional[float] = None):
+        """Record that ``host`` answered (any non-5xx response)."""
+        if not host:
+            return
+        with self._lock:
+            health = self._get(host)
+            health.successes += 1
+            health.consecutive_failures = 0
+            health.recent.append(True)
+            self._update_latency(health, latency_ms)
+            if health.state != CircuitState.CLOSED:
+                logger.info(f"Host {host} recovered, closing circuit")
+            health.state = CircuitState.CLOSED
+            health.trial_started_at = None
+            health.opened_at = None
+            health.cooldown_seconds = 0.0
+
+    def record_failure(
+        self,
+        host: Optional[str],
+        error: Optional[str] = None,
+        latency_ms: Optional[float] = None,
+    ):
+        """Record a host-level failure (connection error, timeout or 5xx)."""
+        if not host:
+            return
+        with self._lock:
+            health = self._get(host)
+            health.failures += 1
+            health.consecutive_failures += 1
+            health.last_error = error
+            health.recent.append(False)
+            self._update_latency(health, latency_ms)
+
+            if health.state == CircuitState.HALF_OPEN:
+                cooldown = min(
+                    self.config.max_cooldown_seconds, health.cooldown_seconds * 2
+                )
+                self._open(health, cooldown, "trial request failed")
+            elif (
+                health.state == CircuitState.CLOSED
+                and health.consecutive_failures >= self.config.failure_threshold
+            ):
+                self._open(
+                    health,
+                    self.config.cooldown_seconds,
+                    f"{health.consecutive_failures} consecutive failures",
+                )
+
+    def _open(self, health: HostHealth, cooldown: float, reason: str) -> None:
+        health.state = CircuitState.OPEN
+        health.opened_at = self.clock()
+        health.cooldown_seconds = cooldown
+        health.trial_started_at = None
+        logger.warning(
+            f"Host {health.host} circuit opened for {cooldown:.0f}s: {reason}",
+            extra={
+                "host": health.host,
+                "cooldown_seconds": cooldown,
+                "last_error": health.last_error,
+            },
+        )
+
+    @staticmethod
+    def _update_latency(health: HostHealth, latency_ms: Optional[float]) -> None:
+        if latency_ms is None:
+            return
+        if health.latency_ms is None:
+            health.latency_ms = latency_ms
+        else:
+            health.latency_ms = 0.8 * health.latency_ms + 0.2 * latency_ms
+
+    def get_host(self, host: str) -> Optional[Dict[str, Any]]:
+        """Return the health record of ``host`` as a dict, if tracked."""
+        with self._lock:
+            health = self._hosts.get(host)
+            return self._as_dict(health) if health else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Summarise tracked hosts; lists every host whose circuit is not closed."""
+        with self._lock:
+            unhealthy = {
+                host: self._as_dict(health)
+                for host, health in self._hosts.items()
+                if health.state != CircuitState.CLOSED
+            }
+            return {
+                "tracked_hosts": len(self._hosts),
+                "open_circuits": len(unhealthy),
+                "short_circuited": sum(h.short_circuited for h in self._hosts.values()),
+                "unhealthy_hosts": unhealthy,
+            }
+
+    def reset(self, host: Optional[str] = None) -> None:
+        """Forget one host, or all hosts."""
+        with self._lock:
+            if host is None:
+                self._hosts.clear()
+            else:
+                self._hosts.pop(host, None)
+
+    def _as_dict(self, health: HostHealth) -> Dict[str, Any]:
+        recent = list(health.recent)
+        retry_in = None
+        if health.state == CircuitState.OPEN:
+            retry_in = max(
+                0.0, health.cooldown_seconds - (self.clock() - health.opened_at)
+            )
+        return {
+            "state": health.state.value,
+            "consecutive_failures": health.consecutive_failures,
+            "successes": health.successes,
+            "failures": health.failures,
+            "short_circuited": health.short_circuited,
+            "recent_failure_rate": (
+                recent.count(False) / len(recent) if recent else 0.0
+            ),
+            "latency_ms": health.latency_ms,
+            "last_error": health.last_error,
+            "retry_in_seconds": retry_in,
+        }
+
+
+# Shared by all URL checkers in this process
+host_health_tracker = HostHealthTracker()
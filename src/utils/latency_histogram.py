@@ -0,0 +1,194 @@
+"""
+Mergeable latency histogram shared by the TTS, cache, security and
+monitoring code.
+
+``LatencyHistogram`` uses HDR-style log-linear buckets: every power of two
+is split into ``2 ** precision_bits`` equal sub-buckets, so a value is
+recorded with a bounded *relative* error (~1.6% with the default 5 bits)
+whether it is 0.2ms or 20s. Buckets are kept sparsely, which bounds memory
+by the dynamic range actually seen (about 32 sub-buckets per doubling)
+rather than by the number of samples.
+
+Histograms with the same precision merge exactly by adding bucket counts,
+so per-worker histograms can be combined into fleet-wide percentiles;
+``to_dict``/``from_dict`` give a JSON-safe form for shipping them between
+processes.
+"""
+
+import math
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+DEFAULT_PRECISION_BITS = 5
+
+_ZERO_BUCKET = None  # key for values <= 0
+
+
+class LatencyHistogram:
+    """Thread-safe, mergeable histogram with percentile queries."""
+
+    def __init__(self, precision_bits: int = DEFAULT_PRECISION_BITS):
+        self.precision_bits = precision_bits
+        self._sub_buckets = 1 << precision_bits
+        self._lock = threading.Lock()
+        self._counts: Dict[Optional[int], int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _bucket(self, value: float) -> Optional[int]:
+        if value <= 0:
+            return _ZERO_BUCKET
+        mantissa, exponent = math.frexp(value)  # value = mantissa * 2**exponent
+        sub = int((mantissa - 0.5) * 2 * self._sub_buckets)
+        return exponent * self._sub_buckets + sub
+
+    def _bucket_value(self, bucket: Optional[int]) -> float:
+        """Midpoint of a bucket's range."""
+        if bucket is _ZERO_BUCKET:
+            return 0.0
+        exponent, sub = divmod(bucket, self._sub_buckets)
+        return math.ldexp(0.5 + (sub + 0.5) / (2 * self._sub_buckets), exponent)
+
+    def record(self, value: float) -> None:
+        """Record one sample; NaN and infinite values are ignored."""
+        if not math.isfinite(value):
+            return
+        bucket = self._bucket(value)
+        with self._lock:
+            self._counts[bucket] = self._counts.get(bucket, 0) + 1
+            self.count += 1
+            self.total += value
+            if value < self.min:
+                self.min = value
+            if value > self.max:
+                self.max = value
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """Add ``other``'s samples to this histogram and return it."""
+        if other.precision_bits != self.precision_bits:
+            raise ValueError("Cannot merge histograms with different precision")
+        if other is self:
+            other = self.copy()
+        with other._lock:
+            counts = dict(other._counts)
+            count, total = other.count, other.total
+            low, high = other.min, other.max
+        with self._lock:
+            for bucket, n in counts.items():
+                self._counts[bucket] = self._counts.get(bucket, 0) + n
+            self.count += count
+            self.total += total
+            self.min = min(self.min, low)
+            self.max = max(self.max, high)
+        return self
+
+    def copy(self) -> "LatencyHistogram":
+        clone = LatencyHistogram(self.precision_bits)
+        with self._lock:
+            clone._counts = dict(self._counts)
+            clone.count, clone.total = self.count, self.total
+            clone.min, clone.max = self.min, self.max
+        return clone
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self.count = 0
+            self.total = 0.0
+            self.min = math.inf
+            self.max = -math.inf
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """
+        Nearest-rank percentile (0-100), or None when empty.
+
+        The extremes are exact; other ranks are the midpoint of the bucket
+        holding that rank, clamped to the observed min and max.
+        """
+        with self._lock:
+            return self._percentile(percentile)
+
+    def percentiles(self, *percentiles: float) -> Dict[str, Optional[float]]:
+        """Several percentiles at once, keyed ``"p50"``, ``"p99.9"`` etc."""
+        with self._lock:
+            return {f"p{p:g}": self._percentile(p) for p in percentiles}
+
+    def _percentile(self, percentile: float) -> Optional[float]:
+        # Caller holds self._lock
+        if not self.count:
+            return None
+        rank = int(round((percentile / 100) * (self.count - 1)))
+        if rank <= 0:
+            return self.min
+        if rank >= self.count - 1:
+            return self.max
+        seen = 0
+        for bucket in sorted(self._counts, key=_bucket_sort_key):
+            seen += self._counts[bucket]
+            if seen > rank:
+                estimate = self._bucket_value(bucket)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def summary(self, scale: float = 1.0) -> Dict[str, Any]:
+        """Count, mean, min, max and p50/p90/p99, each multiplied by ``scale``."""
+        if not self.count:
+            return {"count": 0}
+        result = {
+            "count": self.count,
+            "mean": self.mean() * scale,
+            "min": self.min * scale,
+            "max": self.max * scale,
+        }
+        for key, value in self.percentiles(50, 90, 99).items():
+            result[key] = value * scale
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-safe representation that ``from_dict`` restores exactly."""
+        with self._lock:
+            return {
+                "precision_bits": self.precision_bits,
+                "count": self.count,
+                "total": self.total,
+                "min": self.min if self.count else None,
+                "max": self.max if self.count else None,
+                "buckets": [
+                    [bucket, n]
+                    for bucket, n in sorted(self._counts.items(), key=_item_sort_key)
+                ],
+            }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        histogram = cls(data.get("precision_bits", DEFAULT_PRECISION_BITS))
+        histogram._counts = {bucket: int(n) for bucket, n in data["buckets"]}
+        histogram.count = int(data["count"])
+        histogram.total = float(data["total"])
+        if histogram.count:
+            histogram.min = float(data["min"])
+            histogram.max = float(data["max"])
+        return histogram
+
+
+def merge_histograms(histograms: Iterable[LatencyHistogram]) -> LatencyHistogram:
+    """Combine histograms (e.g. one per worker) into a new one."""
+    merged = None
+    for histogram in histograms:
+        if merged is None:
+            merged = LatencyHistogram(histogram.precision_bits)
+        merged.merge(histogram)
+    return merged if merged is not None else LatencyHistogram()
+
+
+def _bucket_sort_key(bucket: Optional[int]) -> float:
+    return -math.inf if bucket is _ZERO_BUCKET else bucket
+
+
+def _item_sort_key(item) -> float:
+    return _bucket_sort_key(item[0])
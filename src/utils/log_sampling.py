@@ -0,0 +1,254 @@
+"""
+Adaptive sampling and rate limiting for high-volume log events.
+
+Batch URL validation and feed collection log one record per URL or article;
+a 100k-URL batch turns into gigabytes of near-identical INFO lines.
+``LogSampler`` decides per call whether a record is written:
+
+* errors (and anything the caller marks as such) are always kept;
+* the first occurrence of each ``(event, key)`` is always kept, e.g. the
+  first success of every validation type or the first article of a feed;
+* other records are sampled at the event's ``sample_rate`` (every Nth,
+  deterministically) and then capped by a token bucket of
+  ``rate_per_second`` with ``burst`` capacity;
+* suppressed records are counted and reported as one
+  "N similar events suppressed" line per event every
+  ``summary_interval`` seconds (and on ``flush_summaries()``).
+
+Rates come from ``DEFAULT_RULES`` and can be overridden with
+``LOG_SAMPLE_RATES="url_validation=0.01,..."`` and
+``LOG_RATE_LIMITS="url_validation=50,..."``; ``LOG_SAMPLING_ENABLED=false``
+turns sampling off.
+
+Import ``log_sampler`` from ``btc_max_knowledge_agent.utils.log_sampling``
+so every caller shares its buckets, counts and summaries.
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Set
+
+try:
+    from btc_max_knowledge_agent.utils.metrics_registry import REGISTRY
+except ImportError:  # pragma: no cover
+    from .metrics_registry import REGISTRY
+
+LOG_SAMPLING_ENABLED = os.getenv("LOG_SAMPLING_ENABLED", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+SUMMARY_INTERVAL_SECONDS = float(os.getenv("LOG_SAMPLING_SUMMARY_SECONDS", "60"))
+
+# Distinct keys remembered per event for first-occurrence detection
+MAX_KEYS_PER_EVENT = 10000
+
+_SUPPRESSED = REGISTRY.counter(
+    "log_events_suppressed_total", "Log records dropped by sampling", ["event"]
+)
+
+
+@dataclass
+class SamplingRule:
+    """How many records of one event type are written."""
+
+    # Fraction of (non-first, non-error) records kept
+    sample_rate: float = 1.0
+    # Token bucket cap on kept records; None means uncapped
+    rate_per_second: Optional[float] = None
+    burst: float = 100.0
+
+
+DEFAULT_RULES: Dict[str, SamplingRule] = {
+    "url_validation": SamplingRule(sample_rate=0.1, rate_per_second=20.0),
+    "url_sanitization": SamplingRule(sample_rate=0.1, rate_per_second=20.0),
+    "rss_article": SamplingRule(sample_rate=0.25, rate_per_second=5.0, burst=50.0),
+}
+
+
+def _parse_overrides(value: str) -> Dict[str, float]:
+    overrides = {}
+    for item in value.split(","):
+        name, sep, number = item.partition("=")
+        if sep and name.strip():
+            try:
+                overrides[name.strip()] = float(number)
+            except ValueError:
+                continue
+    return overrides
+
+
+def rules_from_env(base: Optional[Dict[str, SamplingRule]] = None):
+    """``base`` (default ``DEFAULT_RULES``) with environment overrides."""
+    rules = {
+        name: SamplingRule(rule.sample_rate, rule.rate_per_second, rule.burst)
+        for name, rule in (base or DEFAULT_RULES).items()
+    }
+    for name, rate in _parse_overrides(os.getenv("LOG_SAMPLE_RATES", "")).items():
+        rules.setdefault(name, SamplingRule()).sample_rate = rate
+    for name, limit in _parse_overrides(os.getenv("LOG_RATE_LIMITS", "")).items():
+        rules.setdefault(name, SamplingRule()).rate_per_second = limit
+    return rules
+
+
+class _EventState:
+    __slots__ = (
+        "seen",
+        "count",
+        "tokens",
+        "refilled_at",
+        "suppressed",
+        "kept",
+        "window_start",
+        "logger",
+    )
+
+    def __init__(self, rule: SamplingRule, now: float):
+        self.seen: Set[Optional[str]] = set()
+        self.count = 0
+        self.tokens = rule.burst
+        self.refilled_at = now
+        self.suppressed = 0
+        self.kept = 0
+        self.window_start = now
+        self.logger: Optional[logging.Logger] = None
+
+
+class LogSampler:
+    """Per-event sampling, token-bucket caps and suppression summaries."""
+
+    def __init__(
+        self,
+        rules: Optional[Dict[str, SamplingRule]] = None,
+        default_rule: Optional[SamplingRule] = None,
+        summary_interval: float = SUMMARY_INTERVAL_SECONDS,
+        enabled: bool = LOG_SAMPLING_ENABLED,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rules = rules_from_env() if rules is None else dict(rules)
+        self.default_rule = default_rule or SamplingRule()
+        self.summary_interval = summary_interval
+        self.enabled = enabled
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._events: Dict[str, _EventState] = {}
+
+    def should_log(
+        self,
+        event: str,
+        key: Optional[str] = None,
+        error: bool = False,
+        logger: Optional[logging.Logger] = None,
+    ) -> bool:
+        """
+        Whether to write this record.
+
+        Args:
+            event: Event type the rules are keyed by
+            key: Variant within the event; the first record of each is kept
+            error: Always keep (failures, warnings)
+            logger: Where this event's suppression summaries are written
+        """
+        if not self.enabled:
+            return True
+        now = self._clock()
+        rule = self.rules.get(event, self.default_rule)
+        with self._lock:
+            state = self._events.get(event)
+            if state is None:
+                state = self._events[event] = _EventState(rule, now)
+            if logger is not None:
+                state.logger = logger
+            summary = self._take_summary(state, now)
+            keep = self._decide(rule, state, key, error, now)
+            if keep:
+                state.kept += 1
+            else:
+                state.suppressed += 1
+        if not keep:
+            _SUPPRESSED.labels(event).inc()
+        if summary:
+            self._emit_summary(event, *summary)
+        return keep
+
+    def _decide(self, rule, state, key, error, now) -> bool:
+        # Caller holds self._lock
+        if error:
+            return True
+        if key not in state.seen:
+            if len(state.seen) >= MAX_KEYS_PER_EVENT:
+                state.seen.clear()
+            state.seen.add(key)
+            return True
+
+        state.count += 1
+        if rule.sample_rate < 1.0:
+            rate = max(rule.sample_rate, 0.0)
+            if int(state.count * rate) == int((state.count - 1) * rate):
+                return False
+
+        if rule.rate_per_second is not None:
+            elapsed = now - state.refilled_at
+            state.refilled_at = now
+            state.tokens = min(
+                rule.burst, state.tokens + elapsed * rule.rate_per_second
+            )
+            if state.tokens < 1.0:
+                return False
+            state.tokens -= 1.0
+        return True
+
+    def _take_summary(self, state: _EventState, now: float, force: bool = False):
+        # Caller holds self._lock; resets the window when a summary is due
+        elapsed = now - state.window_start
+        if not state.suppressed or (not force and elapsed < self.summary_interval):
+            return None
+        summary = (state.logger, state.suppressed, state.kept, elapsed)
+        state.suppressed = 0
+        state.kept = 0
+        state.window_start = now
+        return summary
+
+    def _emit_summary(self, event, logger, suppressed, kept, elapsed) -> None:
+        (logger or logging.getLogger("url_metadata.sampling")).info(
+            f"{suppressed} similar {event} events suppressed in the last "
+            f"{elapsed:.0f}s ({kept} logged)",
+            extra={
+                "extra_fields": {
+                    "operation": "log_sampling",
+                    "event": event,
+                    "suppressed": suppressed,
+                    "logged": kept,
+                    "interval_seconds": round(elapsed, 3),
+                }
+            },
+        )
+
+    def flush_summaries(self) -> int:
+        """Write pending suppression summaries now; returns how many."""
+        now = self._clock()
+        with self._lock:
+            summaries = [
+                (event, summary)
+                for event, state in self._events.items()
+                for summary in [self._take_summary(state, now, force=True)]
+                if summary
+            ]
+        for event, summary in summaries:
+            self._emit_summary(event, *summary)
+        return len(summaries)
+
+    def reset(self) -> None:
+        """Forget seen keys, buckets and counts (e.g. between tests)."""
+        with self._lock:
+            self._events.clear()
+
+
+# Shared by the URL utilities, optimized logger and feed collection
+log_sampler = LogSampler()
+
+atexit.register(log_sampler.flush_summaries)
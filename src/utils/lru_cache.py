@@ -0,0 +1,201 @@
+"""
+Bounded LRU caches with per-entry TTL.
+
+``LRUCache`` keeps entries in an ``OrderedDict`` so lookups, inserts,
+recency updates and evictions are all O(1): the least recently used entry
+is always at the front and is popped when the cache is full. Expired entries
+are dropped lazily when they are looked up or reach the front.
+
+``ShardedLRUCache`` spreads keys over several independently locked
+``LRUCache`` shards, so concurrent validators (e.g. ``validate_url_batch``
+worker threads) rarely contend on the same lock.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+@dataclass
+class CacheStats:
+    """Counters for one cache (or the sum over shards)."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class LRUCache:
+    """Thread-safe LRU cache with a size bound and optional TTL."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            max_entries: Maximum number of entries kept
+            ttl_seconds: Default lifetime of an entry; None keeps entries
+                until they are evicted
+            clock: Monotonic time source, injectable for tests
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for ``key`` or ``default`` if missing/expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at is not None and self.clock() >= expires_at:
+                del self._entries[key]
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def put(
+        self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None
+    ) -> None:
+        """
+        Store ``value`` under ``key``, evicting the least recently used entry
+        when full.
+
+        Args:
+            ttl_seconds: Lifetime of this entry; defaults to the cache TTL
+        """
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        expires_at = self.clock() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                _, (_, oldest_expiry) = self._entries.popitem(last=False)
+                if oldest_expiry is not None and self.clock() >= oldest_expiry:
+                    self.stats.expirations += 1
+                else:
+                    self.stats.evictions += 1
+
+    def delete(self, key: Hashable) -> bool:
+        """Remove ``key``; returns True if it was cached."""
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and (entry[1] is None or self.clock() < entry[1])
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss/eviction counters and current size."""
+        with self._lock:
+            stats = self.stats.as_dict()
+            stats.update(size=len(self._entries), max_entries=self.max_entries)
+            return stats
+
+
+class ShardedLRUCache:
+    """LRU+TTL cache split into independently locked shards."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: Optional[float] = None,
+        shards: int = 16,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            max_entries: Total capacity, divided evenly between shards
+            ttl_seconds: Default entry lifetime (None = no expiry)
+            shards: Number of shards (independent locks)
+            clock: Monotonic time source, injectable for tests
+        """
+        if shards < 1:
+            raise ValueError("shards must be >= 1")
+        shards = min(shards, max_entries)
+        per_shard = -(-max_entries // shards)  # ceiling division
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._shards = [LRUCache(per_shard, ttl_seconds, clock) for _ in range(shards)]
+
+    def _shard(self, key: Hashable) -> LRUCache:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        return self._shard(key).get(key, default)
+
+    def put(
+        self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None
+    ) -> None:
+        self._shard(key).put(key, value, ttl_seconds)
+
+    def delete(self, key: Hashable) -> bool:
+        return self._shard(key).delete(key)
+
+    def clear(self) -> None:
+        for shard in self._shards:
+            shard.clear()
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._shard(key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return counters summed over all shards."""
+        total = CacheStats()
+        size = 0
+        for shard in self._shards:
+            stats = shard.get_stats()
+            total.hits += stats["hits"]
+            total.misses += stats["misses"]
+            total.evictions += stats["evictions"]
+            total.expirations += stats["expirations"]
+            size += stats["size"]
+        result = total.as_dict()
+        result.update(
+            size=size,
+            max_entries=self.max_entries,
+            shards=len(self._shards),
+            ttl_seconds=self.ttl_seconds,
+        )
+        return result
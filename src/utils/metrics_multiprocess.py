@@ -0,0 +1,219 @@
+"""
+Multi-process mode for the metrics registry.
+
+Under gunicorn every worker has its own registry, so a scrape or an admin
+stats call only sees the worker that happened to serve it. When
+``METRICS_MULTIPROC_DIR`` points at a directory, every update is also
+written through to a per-process memory-mapped file in that directory
+(``<kind>_<pid>.db``), and reads merge the files of all processes:
+
+* counters and histograms are summed across every file, including those
+  of workers that have exited (recycled by ``max_requests``), so totals
+  never go backwards;
+* gauges are summed across live processes only; ``mark_process_dead``
+  (called from gunicorn's ``child_exit`` hook) removes a dead worker's
+  gauge file.
+
+A file is a small append-only key/value table: an 8-byte header holding the
+number of bytes in use, then entries of ``<uint32 key length><utf-8 key>``
+padded to 8 bytes followed by a float64 value. Only the owning process
+writes, in place and under that file's own lock, so updates cost a dict
+lookup and an 8-byte store; readers take the used length first and never
+see half-appended entries.
+"""
+
+import glob
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+MULTIPROC_DIR_ENV = "METRICS_MULTIPROC_DIR"
+
+KINDS = ("counter", "gauge", "histogram")
+
+_HEADER = struct.Struct("<I4x")
+_LENGTH = struct.Struct("<I")
+_VALUE = struct.Struct("<d")
+_INITIAL_SIZE = 1 << 16
+
+
+def _padded(length: int) -> int:
+    return length + (-length % 8)
+
+
+class MmapValueFile:
+    """One process's values for one metric kind."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._file = open(self.path, "a+b")
+        size = os.fstat(self._file.fileno()).st_size
+        if size < _INITIAL_SIZE:
+            self._file.truncate(_INITIAL_SIZE)
+            size = _INITIAL_SIZE
+        self._capacity = size
+        self._mmap = mmap.mmap(self._file.fileno(), size)
+        self._offsets: Dict[str, int] = {}
+        # Serialises appends and remaps; writers of different kinds never wait
+        self._lock = threading.Lock()
+        self._used = _HEADER.unpack_from(self._mmap, 0)[0] or _HEADER.size
+        if self._used == _HEADER.size:
+            _HEADER.pack_into(self._mmap, 0, self._used)
+        for key, _value, offset in _entries(self._mmap, self._used):
+            self._offsets[key] = offset
+
+    def write(self, key: str, value: float) -> None:
+        with self._lock:
+            offset = self._offsets.get(key)
+            if offset is None:
+                offset = self._append(key)
+            _VALUE.pack_into(self._mmap, offset, value)
+
+    def _append(self, key: str) -> int:
+        encoded = key.encode("utf-8")
+        entry_size = _padded(_LENGTH.size + len(encoded)) + _VALUE.size
+        while self._used + entry_size > self._capacity:
+            self._grow()
+        start = self._used
+        _LENGTH.pack_into(self._mmap, start, len(encoded))
+        self._mmap[start + _LENGTH.size : start + _LENGTH.size + len(encoded)] = encoded
+        offset = start + entry_size - _VALUE.size
+        _VALUE.pack_into(self._mmap, offset, 0.0)
+        # Publish the entry only once it is complete
+        self._used += entry_size
+        _HEADER.pack_into(self._mmap, 0, self._used)
+        self._offsets[key] = offset
+        return offset
+
+    def _grow(self) -> None:
+        self._capacity *= 2
+        self._mmap.close()
+        self._file.truncate(self._capacity)
+        self._mmap = mmap.mmap(self._file.fileno(), self._capacity)
+
+    def close(self) -> None:
+        try:
+            self._mmap.close()
+        finally:
+            self._file.close()
+
+
+def _entries(buffer, used: int) -> Iterator[Tuple[str, float, int]]:
+    position = _HEADER.size
+    while position < used:
+        (length,) = _LENGTH.unpack_from(buffer, position)
+        key_start = position + _LENGTH.size
+        key = bytes(buffer[key_start : key_start + length]).decode("utf-8")
+        offset = position + _padded(_LENGTH.size + length)
+        (value,) = _VALUE.unpack_from(buffer, offset)
+        yield key, value, offset
+        position = offset + _VALUE.size
+
+
+def read_file(path: Union[str, Path]) -> Iterator[Tuple[str, float]]:
+    """(key, value) pairs of a value file written by any process."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < _HEADER.size:
+        return
+    (used,) = _HEADER.unpack_from(data, 0)
+    for key, value, _offset in _entries(data, min(used, len(data))):
+        yield key, value
+
+
+def sample_key(name: str, labelnames, labelvalues, field: str = "") -> str:
+    """Self-describing key so any process can render another's series."""
+    return json.dumps([name, list(labelnames), list(labelvalues), field])
+
+
+def parse_key(key: str):
+    name, labelnames, labelvalues, field = json.loads(key)
+    return name, tuple(labelnames), tuple(labelvalues), field
+
+
+class MultiProcessStore:
+    """Write-through target for this process plus the merged view of all."""
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._files: Dict[str, MmapValueFile] = {}
+
+    def write(self, kind: str, key: str, value: float) -> None:
+        # The store lock only guards opening files; each file has its own
+        value_file = self._files.get(kind)
+        if value_file is None:
+            with self._lock:
+                value_file = self._files.get(kind)
+                if value_file is None:
+                    value_file = self._files[kind] = self._open(kind)
+        value_file.write(key, value)
+
+    def _open(self, kind: str) -> MmapValueFile:
+        path = self.directory / f"{kind}_{self._pid}.db"
+        if path.exists():
+            # Left by an exited process whose PID was reused: keep its
+            # totals (gauges die with their process) instead of writing
+            # this process's values over them
+            if kind == "gauge":
+                path.unlink()
+            else:
+                retired = f"{kind}_{self._pid}_{time.time_ns()}.db"
+                path.rename(path.with_name(retired))
+        return MmapValueFile(path)
+
+    def merged(self) -> Dict[str, Dict[str, float]]:
+        """``kind -> key -> value`` summed over every process's files."""
+        result: Dict[str, Dict[str, float]] = {kind: {} for kind in KINDS}
+        for path in sorted(glob.glob(str(self.directory / "*.db"))):
+            kind = Path(path).name.split("_", 1)[0]
+            if kind not in result:
+                continue
+            totals = result[kind]
+            try:
+                for key, value in read_file(path):
+                    totals[key] = totals.get(key, 0.0) + value
+            except (OSError, ValueError, UnicodeDecodeError):
+                # A worker may be exiting or its file half-removed
+                continue
+        return result
+
+    def after_fork_in_child(self) -> None:
+        # The parent's mappings are inherited; start this process's own files
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._files = {}
+
+
+def multiprocess_directory() -> Optional[str]:
+    return os.getenv(MULTIPROC_DIR_ENV) or None
+
+
+def mark_process_dead(pid: int, directory: Optional[str] = None) -> None:
+    """Drop a dead worker's gauges; its counters and histograms are kept."""
+    directory = directory or multiprocess_directory()
+    if not directory:
+        return
+    try:
+        os.remove(os.path.join(directory, f"gauge_{pid}.db"))
+    except FileNotFoundError:
+        pass
+
+
+def clear_directory(directory: Optional[str] = None) -> None:
+    """Remove every value file; call once in the master before forking."""
+    directory = directory or multiprocess_directory()
+    if not directory:
+        return
+    for path in glob.glob(os.path.join(directory, "*.db")):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,538 @@
+"""
+Process-wide metrics registry with Prometheus / OpenMetrics text exposition.
+
+Counters, gauges and histograms are updated in place on the hot paths
+(TTS synthesis, audio cache tiers, URL monitoring, sessions, rate limiting,
+security preprocessing), so a scrape only formats current values and never
+recomputes statistics. Each update takes one small per-series lock.
+
+    from btc_max_knowledge_agent.utils.metrics_registry import REGISTRY
+
+    requests_total = REGISTRY.counter(
+        "tts_requests_total", "TTS requests by result", ["result"]
+    )
+    requests_total.labels(result="cache_hit").inc()
+
+``render()`` produces the Prometheus text format (0.0.4) or, with
+``openmetrics=True``, OpenMetrics 1.0; the web API serves it at
+``/metrics``. Metric names get the ``METRICS_NAMESPACE`` prefix (default
+``btc_agent``).
+
+Import this module as ``btc_max_knowledge_agent.utils.metrics_registry``
+so that every subsystem shares the same ``REGISTRY``.
+
+With ``METRICS_MULTIPROC_DIR`` set (gunicorn does this), updates are also
+written through to per-process memory-mapped files and ``render()`` /
+``snapshot()`` report the merged, whole-server values; see
+``metrics_multiprocess``.
+"""
+
+import bisect
+import math
+import os
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .metrics_multiprocess import (
+    MultiProcessStore,
+    multiprocess_directory,
+    parse_key,
+    sample_key,
+)
+
+METRICS_NAMESPACE = os.getenv("METRICS_NAMESPACE", "btc_agent")
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Seconds; covers sub-millisecond cache hits up to slow TTS syntheses
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+LabelValues = Tuple[str, ...]
+
+# Write-through target when running in multi-process mode
+_store: Optional[MultiProcessStore] = None
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if value == int(value) and abs(value) < 1e15:
+        return f"{int(value)}.0"
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_string(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _CounterChild:
+    __slots__ = ("_lock", "value", "_key")
+
+    def __init__(self, key: str):
+        self._lock = threading.Lock()
+        self.value = 0.0
+        self._key = key
+
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        with self._lock:
+            self.value += amount
+            if _store is not None:
+                _store.write("counter", self._key, self.value)
+
+    def _reset(self) -> None:
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+
+class _GaugeChild:
+    __slots__ = ("_lock", "value", "_function", "_key")
+
+    def __init__(self, key: str):
+        self._lock = threading.Lock()
+        self.value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+        self._key = key
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self.value = float(value)
+            self._write()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+            self._write()
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+            self._write()
+
+    def _write(self) -> None:
+        if _store is not None:
+            _store.write("gauge", self._key, self.value)
+
+    def _reset(self) -> None:
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Read the value from ``function`` at scrape time (must be O(1))."""
+        self._function = function
+
+    def get(self) -> float:
+        if self._function is not None:
+            try:
+                return float(self._function())
+            except Exception:
+                return math.nan
+        return self.value
+
+
+class _HistogramChild:
+    __slots__ = ("_lock", "_upper_bounds", "counts", "sum", "count", "_keys")
+
+    def __init__(self, upper_bounds: Sequence[float], keys: Sequence[str]):
+        self._lock = threading.Lock()
+        self._upper_bounds = upper_bounds
+        self.counts = [0] * (len(upper_bounds) + 1)  # last is +Inf
+        self.sum = 0.0
+        self.count = 0
+        # One key per bucket, then sum and count
+        self._keys = keys
+
+    def observe(self, value: float) -> None:
+        if not math.isfinite(value):
+            return
+        index = bisect.bisect_left(self._upper_bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+            if _store is not None:
+                keys = self._keys
+                _store.write("histogram", keys[index], self.counts[index])
+                _store.write("histogram", keys[-2], self.sum)
+                _store.write("histogram", keys[-1], self.count)
+
+    def snapshot(self) -> Tuple[List[int], float, int]:
+        with self._lock:
+            return list(self.counts), self.sum, self.count
+
+    def _reset(self) -> None:
+        self._lock = threading.Lock()
+        self.counts = [0] * len(self.counts)
+        self.sum = 0.0
+        self.count = 0
+
+
+class _Metric:
+    """A metric family: one child per combination of label values."""
+
+    metric_type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[LabelValues, object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self._child_for(())
+
+    def _new_child(self, values: LabelValues):
+        raise NotImplementedError
+
+    def _child_for(self, values: LabelValues):
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._children[values] = self._new_child(values)
+        return child
+
+    def labels(self, *values: str, **kwargs: str):
+        """Child series for the given label values (created on first use)."""
+        if kwargs:
+            values = tuple(str(kwargs[name]) for name in self.labelnames)
+        else:
+            values = tuple(str(v) for v in values)
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        return self._child_for(values)
+
+    def children(self) -> List[Tuple[LabelValues, object]]:
+        with self._lock:
+            return list(self._children.items())
+
+    def series(self) -> Iterable[Tuple[LabelValues, Dict[str, float]]]:
+        """(label values, field -> value) for every child."""
+        raise NotImplementedError
+
+    def _key(self, values: LabelValues, field: str = "") -> str:
+        return sample_key(self.name, self.labelnames, values, field)
+
+    def _reset_after_fork(self) -> None:
+        self._lock = threading.Lock()
+        for _values, child in list(self._children.items()):
+            child._reset()
+
+
+class Counter(_Metric):
+    metric_type = "counter"
+
+    def _new_child(self, values):
+        return _CounterChild(self._key(values))
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+    def series(self):
+        for values, child in self.children():
+            yield values, {"": child.value}
+
+
+class Gauge(_Metric):
+    metric_type = "gauge"
+
+    def _new_child(self, values):
+        return _GaugeChild(self._key(values))
+
+    def set(self, value: float) -> None:
+        self._default.set(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default.dec(amount)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self._default.set_function(function)
+
+    def series(self):
+        for values, child in self.children():
+            yield values, {"": child.get()}
+
+
+class Histogram(_Metric):
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.upper_bounds = tuple(sorted(float(b) for b in buckets))
+        self.bound_labels = [_format_value(b) for b in self.upper_bounds] + ["+Inf"]
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self, values):
+        fields = self.bound_labels + ["sum", "count"]
+        return _HistogramChild(
+            self.upper_bounds, [self._key(values, field) for field in fields]
+        )
+
+    def observe(self, value: float) -> None:
+        self._default.observe(value)
+
+    def series(self):
+        for values, child in self.children():
+            counts, total, count = child.snapshot()
+            fields = dict(zip(self.bound_labels, counts))
+            fields["sum"] = total
+            fields["count"] = count
+            yield values, fields
+
+
+class _Family:
+    """
+    One metric's series as plain values, from this process or merged
+    across processes. Histogram fields are per-bucket (non-cumulative)
+    counts keyed by their ``le`` label, plus ``sum`` and ``count``.
+    """
+
+    def __init__(self, name: str, metric_type: str, documentation: str):
+        self.name = name
+        self.metric_type = metric_type
+        self.documentation = documentation
+        self.series: Dict[Tuple[Tuple[str, ...], LabelValues], Dict[str, float]] = {}
+
+    def add(self, labelnames, values, field: str, value: float) -> None:
+        fields = self.series.setdefault((tuple(labelnames), tuple(values)), {})
+        fields[field] = fields.get(field, 0.0) + value
+
+    def _buckets(self, fields: Dict[str, float]) -> List[Tuple[str, float]]:
+        buckets = [item for item in fields.items() if item[0] not in ("sum", "count")]
+        return sorted(buckets, key=lambda item: float(item[0]))
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        """(suffix, label string, value) triples for exposition."""
+        for (labelnames, values), fields in sorted(self.series.items()):
+            labels = _label_string(labelnames, values)
+            if self.metric_type == "counter":
+                yield "_total", labels, fields.get("", 0.0)
+            elif self.metric_type == "gauge":
+                yield "", labels, fields.get("", 0.0)
+            else:
+                cumulative = 0.0
+                for bound, n in self._buckets(fields):
+                    cumulative += n
+                    bucket_labels = _label_string(
+                        labelnames + ("le",), values + (bound,)
+                    )
+                    yield "_bucket", bucket_labels, cumulative
+                yield "_sum", labels, fields.get("sum", 0.0)
+                yield "_count", labels, fields.get("count", 0.0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        series: Dict[str, Any] = {}
+        for (labelnames, values), fields in sorted(self.series.items()):
+            labels = _label_string(labelnames, values)
+            if self.metric_type != "histogram":
+                series[labels] = fields.get("", 0.0)
+                continue
+            cumulative, buckets = 0.0, {}
+            for bound, n in self._buckets(fields):
+                cumulative += n
+                buckets[bound] = cumulative
+            series[labels] = {
+                "count": fields.get("count", 0.0),
+                "sum": fields.get("sum", 0.0),
+                "buckets": buckets,
+            }
+        return {"type": self.metric_type, "series": series}
+
+
+class MetricsRegistry:
+    """Named metric families, created on first use and rendered on scrape."""
+
+    def __init__(self, namespace: str = METRICS_NAMESPACE):
+        self.namespace = namespace
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _full_name(self, name: str) -> str:
+        return f"{self.namespace}_{name}" if self.namespace else name
+
+    def _get_or_create(self, cls, name: str, documentation: str, **kwargs):
+        full_name = self._full_name(name)
+        if cls is Counter and full_name.endswith("_total"):
+            full_name = full_name[: -len("_total")]
+        with self._lock:
+            metric = self._metrics.get(full_name)
+            if metric is None:
+                metric = cls(full_name, documentation, **kwargs)
+                self._metrics[full_name] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"{full_name} is already a {metric.metric_type}")
+            return metric
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Iterable[str] = ()
+    ) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames=labelnames)
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: Iterable[str] = ()
+    ) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames=labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._get_or_create(
+            Histogram, name, documentation, labelnames=labelnames, buckets=buckets
+        )
+
+    def get(self, name: str) -> Optional[_Metric]:
+        """Look up a metric by its name without the namespace prefix."""
+        full_name = self._full_name(name)
+        if full_name.endswith("_total") and full_name not in self._metrics:
+            full_name = full_name[: -len("_total")]
+        return self._metrics.get(full_name)
+
+    def metrics(self) -> List[_Metric]:
+        with self._lock:
+            return list(self._metrics.values())
+
+    def _families(self) -> List[_Family]:
+        """Local values, or the merge across processes in multi-process mode."""
+        local = self.metrics()
+        families: Dict[str, _Family] = {}
+        for metric in local:
+            family = families[metric.name] = _Family(
+                metric.name, metric.metric_type, metric.documentation
+            )
+            for values, fields in metric.series():
+                # Callback gauges are not written through, so this process's
+                # value stands in for the server's. Other series are listed
+                # with zero so idle ones still show up; their values come
+                # from the files.
+                local_value = _store is None or (
+                    metric.metric_type == "gauge"
+                    and metric._child_for(values)._function is not None
+                )
+                for field, value in fields.items():
+                    family.add(
+                        metric.labelnames, values, field, value if local_value else 0.0
+                    )
+        if _store is None:
+            return list(families.values())
+
+        for kind, values in _store.merged().items():
+            for key, value in values.items():
+                name, labelnames, labelvalues, field = parse_key(key)
+                family = families.get(name)
+                if family is None:
+                    family = families[name] = _Family(name, kind, name)
+                family.add(labelnames, labelvalues, field, value)
+        return list(families.values())
+
+    def render(self, openmetrics: bool = False) -> str:
+        """Text exposition of every metric."""
+        lines: List[str] = []
+        for metric in sorted(self._families(), key=lambda m: m.name):
+            family = metric.name
+            if metric.metric_type == "counter" and not openmetrics:
+                family = f"{metric.name}_total"
+            lines.append(f"# HELP {family} {_escape(metric.documentation)}")
+            lines.append(f"# TYPE {family} {metric.metric_type}")
+            for suffix, labels, value in metric.samples():
+                lines.append(f"{metric.name}{suffix}{labels} {_format_value(value)}")
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Current values as ``{name: {"type", "series": {labels: value}}}``.
+
+        Histogram series are ``{"count", "sum", "buckets": {le: cumulative}}``.
+        Whole-server values in multi-process mode, for admin endpoints.
+        """
+        return {
+            family.name: family.to_dict()
+            for family in sorted(self._families(), key=lambda m: m.name)
+        }
+
+    def _after_fork_in_child(self) -> None:
+        # Values inherited from the parent are already in its file
+        self._lock = threading.Lock()
+        for metric in self.metrics():
+            metric._reset_after_fork()
+
+
+REGISTRY = MetricsRegistry()
+
+
+def enable_multiprocess(directory: str) -> None:
+    """Write through to ``directory`` and merge all processes on read."""
+    global _store
+    _store = MultiProcessStore(directory)
+
+
+def disable_multiprocess() -> None:
+    global _store
+    _store = None
+
+
+def multiprocess_enabled() -> bool:
+    return _store is not None
+
+
+def _after_fork_in_child() -> None:
+    if _store is not None:
+        _store.after_fork_in_child()
+        REGISTRY._after_fork_in_child()
+
+
+if multiprocess_directory():
+    enable_multiprocess(multiprocess_directory())
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def render_metrics(accept: Optional[str] = None) -> Tuple[str, str]:
+    """Body and content type for a scrape, negotiated from the Accept header."""
+    openmetrics = bool(accept and "application/openmetrics-text" in accept)
+    if openmetrics:
+        content_type = OPENMETRICS_CONTENT_TYPE
+    else:
+        content_type = PROMETHEUS_CONTENT_TYPE
+    return REGISTRY.render(openmetrics=openmetrics), content_type
@@ -15,6 +15,7 @@ import os
 import sqlite3
 import threading
 import time
+import weakref
 from abc import ABC, abstractmethod
 from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
@@ -37,6 +38,14 @@ except ImportError:
     REDIS_AVAILABLE = False
 
 from .audio_cache import AudioCache, CacheEntry
+from .latency_histogram import LatencyHistogram
+
+try:  # one registry per process, whichever path this module was imported by
+    from btc_max_knowledge_agent.utils.executors import schedule_periodic
+    from btc_max_knowledge_agent.utils.metrics_registry import REGISTRY
+except ImportError:  # pragma: no cover
+    from .executors import schedule_periodic
+    from .metrics_registry import REGISTRY
 
 logger = logging.getLogger(__name__)
 
@@ -586,6 +595,20 @@ class RedisCacheBackend(BaseCacheBackend):
         return 0
 
 
+TIERS = ("memory", "persistent", "distributed")
+
+_CACHE_EVENTS = REGISTRY.counter(
+    "audio_cache_events_total",
+    "Audio cache tier events (hits, misses, puts, errors)",
+    ["tier", "event"],
+)
+_CACHE_SECONDS = REGISTRY.histogram(
+    "audio_cache_operation_seconds",
+    "Audio cache backend get/put latency",
+    ["tier", "op"],
+)
+
+
 class MultiTierAudioCache:
     """
     Multi-tier audio cache that coordinates between memory, persistent, and distributed caches.
@@ -603,6 +626,10 @@ class MultiTierAudioCache:
             "puts": {"memory": 0, "persistent": 0, "distributed": 0},
             "errors": {"memory": 0, "persistent": 0, "distributed": 0},
         }
+        # Per-tier get/put latency in milliseconds
+        self._latency = {
+            op: {tier: LatencyHistogram() for tier in TIERS} for op in ("get", "put")
+        }
 
         self._init_backends()
         self._start_cleanup_thread()
@@ -640,19 +667,25 @@ class MultiTierAudioCache:
                 self.backends["memory"] = MemoryCacheBackend(self.config)
 
     def _start_cleanup_thread(self):
-        """Start background thread for cache cleanup."""
-
-        def cleanup_worker():
-            while True:
-                try:
-                    time.sleep(self.config.cleanup_interval_minutes * 60)
-                    self.cleanup_expired()
-                except Exception as e:
-                    logger.error(f"Cache cleanup error: {e}")
-
-        cleanup_thread = threading.Thread(target=cleanup_worker, daemon=True)
-        cleanup_thread.start()
-        logger.info("Cache cleanup thread started")
+        """Schedule periodic cache cleanup on the shared background pool."""
+        # Hold the cache weakly so the schedule does not keep it alive
+        cleanup = weakref.WeakMethod(self.cleanup_expired)
+        task = None
+
+        def cleanup_job():
+            method = cleanup()
+            if method is None:
+                task.cancel()
+                return
+            method()
+
+        task = schedule_periodic(
+            "audio_cache_cleanup",
+            cleanup_job,
+            self.config.cleanup_interval_minutes * 60,
+        )
+        self._cleanup_task = task
+        logger.info("Cache cleanup scheduled")
 
     def get(self, text: str) -> Optional[bytes]:
         """
@@ -669,22 +702,24 @@ class MultiTierAudioCache:
         # Try memory cache first
         if "memory" in self.backends:
             try:
-                data = self.backends["memory"].get(key)
+                data = self._timed("get", "memory", self.backends["memory"].get, key)
                 if data:
-                    self._stats["hits"]["memory"] += 1
+                    self._count("hits", "memory")
                     return data
                 else:
-                    self._stats["misses"]["memory"] += 1
+                    self._count("misses", "memory")
             except Exception as e:
-                self._stats["errors"]["memory"] += 1
+                self._count("errors", "memory")
                 logger.error(f"Memory cache error: {e}")
 
         # Try persistent cache
         if "persistent" in self.backends:
             try:
-                data = self.backends["persistent"].get(key)
+                data = self._timed(
+                    "get", "persistent", self.backends["persistent"].get, key
+                )
                 if data:
-                    self._stats["hits"]["persistent"] += 1
+                    self._count("hits", "persistent")
                     # Warm memory cache
                     if "memory" in self.backends:
                         self.backends["memory"].put(
@@ -692,17 +727,19 @@ class MultiTierAudioCache:
                         )
                     return data
                 else:
-                    self._stats["misses"]["persistent"] += 1
+                    self._count("misses", "persistent")
             except Exception as e:
-                self._stats["errors"]["persistent"] += 1
+                self._count("errors", "persistent")
                 logger.error(f"Persistent cache error: {e}")
 
         # Try distributed cache
         if "distributed" in self.backends:
             try:
-                data = self.backends["distributed"].get(key)
+                data = self._timed(
+                    "get", "distributed", self.backends["distributed"].get, key
+                )
                 if data:
-                    self._stats["hits"]["distributed"] += 1
+                    self._count("hits", "distributed")
                     # Warm lower-tier caches
                     ttl_seconds = self.config.ttl_hours * 3600
                     if "memory" in self.backends:
@@ -711,9 +748,9 @@ class MultiTierAudioCache:
                         self.backends["persistent"].put(key, data, ttl_seconds)
                     return data
                 else:
-                    self._stats["misses"]["distributed"] += 1
+                    self._count("misses", "distributed")
             except Exception as e:
-                self._stats["errors"]["distributed"] += 1
+                self._count("errors", "distributed")
                 logger.error(f"Distributed cache error: {e}")
 
         return None
@@ -735,17 +772,37 @@ class MultiTierAudioCache:
         # Store in all available backends
         for tier_name, backend in self.backends.items():
             try:
-                success = backend.put(key, audio_data, ttl_seconds)
+                success = self._timed(
+                    "put", tier_name, backend.put, key, audio_data, ttl_seconds
+                )
                 if success:
-                    self._stats["puts"][tier_name] += 1
+                    self._count("puts", tier_name)
                 else:
-                    self._stats["errors"][tier_name] += 1
+                    self._count("errors", tier_name)
             except Exception as e:
-                self._stats["errors"][tier_name] += 1
+                self._count("errors", tier_name)
                 logger.error(f"Failed to store in {tier_name} cache: {e}")
 
         return key
 
+    def _count(self, event: str, tier: str) -> None:
+        self._stats[event][tier] += 1
+        _CACHE_EVENTS.labels(tier, event).inc()
+
+    def _timed(self, op: str, tier: str, func, *args):
+        """Call a backend method, recording its latency for the tier."""
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            self._latency[op][tier].record(elapsed * 1000)
+            _CACHE_SECONDS.labels(tier, op).observe(elapsed)
+
+    def get_latency_histograms(self) -> Dict[str, Dict[str, LatencyHistogram]]:
+        """Per-operation, per-tier latency histograms (milliseconds)."""
+        return self._latency
+
     def has(self, text: str) -> bool:
         """Check if text is cached in any tier."""
         key = self._generate_hash(text)
@@ -821,6 +878,15 @@ class MultiTierAudioCache:
             total = hits + misses
             stats["performance"][f"{tier}_hit_rate"] = hits / max(total, 1)
 
+        stats["latency_ms"] = {
+            op: {
+                tier: histogram.summary()
+                for tier, histogram in tiers.items()
+                if histogram.count
+            }
+            for op, tiers in self._latency.items()
+        }
+
         return stats
 
     def warm_cache(self, entries: List[tuple[str, bytes]]) -> int:
@@ -16,6 +16,11 @@ import time
 from functools import wraps
 from typing import Any, Callable, Dict, Optional
 
+try:  # one sampler per process, whichever path this module was imported by
+    from btc_max_knowledge_agent.utils.log_sampling import log_sampler
+except ImportError:  # pragma: no cover
+    from .log_sampling import log_sampler
+
 
 class LazyLogRecord:
     """Lazy evaluation wrapper for expensive log message construction."""
@@ -149,7 +154,16 @@ class OptimizedURLMetadataLogger:
     ):
         """Optimized validation logging."""
         if is_valid:
-            # Only log successful validations at debug level to reduce noise
+            # Only log successful validations at debug level to reduce noise,
+            # and only a sample of them (the first of each type always)
+            if not self.validation_logger.is_debug_enabled():
+                return
+            if not log_sampler.should_log(
+                "url_validation",
+                validation_type,
+                logger=self.validation_logger.logger,
+            ):
+                return
             self.validation_logger.debug(
                 f"URL validation succeeded: {validation_type} for {self._truncate_url(url)}"
             )
@@ -0,0 +1,272 @@
+"""
+Cross-process persistent cache for URL validation and accessibility results.
+
+Backed by a SQLite database in WAL mode so every gunicorn worker and batch
+ingest job on a host reads and writes the same cache concurrently: readers
+never block the single writer, and a result found by one process is reused
+by all others (and survives restarts and deploys).
+
+Entries are keyed by ``(kind, url)`` where kind is e.g. ``"validation"`` or
+``"accessibility"``. Successful results live for ``ttl_seconds``; failures
+are cached too (negative caching) but for the shorter
+``negative_ttl_seconds`` so transient outages are re-probed sooner.
+
+Enable the shared cache by pointing ``URL_PERSISTENT_CACHE_PATH`` at a
+database file; when unset, ``get_persistent_url_cache()`` returns None and
+callers fall back to their in-process caches.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = int(os.getenv("URL_PERSISTENT_CACHE_TTL", "86400"))
+DEFAULT_NEGATIVE_TTL_SECONDS = int(os.getenv("URL_NEGATIVE_CACHE_TTL", "600"))
+
+# Purge expired rows after this many writes from one process
+PURGE_EVERY_WRITES = 1000
+
+# (ok, error) as stored in the cache
+CachedResult = Tuple[bool, Optional[str]]
+
+
+class PersistentURLCache:
+    """SQLite (WAL) cache of URL check results shared between processes."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        negative_ttl_seconds: float = DEFAULT_NEGATIVE_TTL_SECONDS,
+        busy_timeout_ms: int = 5000,
+    ):
+        """
+        Args:
+            path: SQLite database file (created if missing)
+            ttl_seconds: Lifetime of successful results
+            negative_ttl_seconds: Lifetime of failed results
+            busy_timeout_ms: How long a writer waits for another process's
+                write lock before giving up
+        """
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.busy_timeout_ms = busy_timeout_ms
+
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "writes": 0, "errors": 0}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_db()
+
+    # ------------------------------------------------------------------
+    # Connection handling
+    # ------------------------------------------------------------------
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, reopening it after a fork."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        conn = sqlite3.connect(
+            str(self.path), timeout=self.busy_timeout_ms / 1000, isolation_level=None
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def _init_db(self) -> None:
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS url_cache (
+                kind TEXT NOT NULL,
+                url TEXT NOT NULL,
+                ok INTEGER NOT NULL,
+                error TEXT,
+                checked_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                PRIMARY KEY (kind, url)
+            ) WITHOUT ROWID
+            """)
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_url_cache_expires ON url_cache(expires_at)"
+        )
+
+    def _count(self, key: str, amount: int = 1) -> int:
+        with self._stats_lock:
+            self._stats[key] += amount
+            return self._stats[key]
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def get(self, kind: str, url: str) -> Optional[CachedResult]:
+        """
+        Return the cached ``(ok, error)`` for ``url`` or None if absent/expired.
+
+        Database errors are logged and treated as a miss, so a locked or
+        corrupt cache never breaks URL validation.
+        """
+        try:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT ok, error FROM url_cache "
+                    "WHERE kind = ? AND url = ? AND expires_at > ?",
+                    (kind, url, time.time()),
+                )
+                .fetchone()
+            )
+        except sqlite3.Error as e:
+            self._count("errors")
+            logger.warning(f"Persistent URL cache read failed: {e}")
+            return None
+        if row is None:
+            self._count("misses")
+            return None
+        self._count("hits")
+        return bool(row[0]), row[1]
+
+    def get_many(self, kind: str, urls: Iterable[str]) -> Dict[str, CachedResult]:
+        """Return cached results for all ``urls`` that have one (single query per 500)."""
+        urls = list(dict.fromkeys(urls))
+        found: Dict[str, CachedResult] = {}
+        try:
+            conn = self._connect()
+            now = time.time()
+            for start in range(0, len(urls), 500):
+                batch = urls[start : start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT url, ok, error FROM url_cache WHERE kind = ? "
+                    f"AND expires_at > ? AND url IN ({placeholders})",
+                    (kind, now, *batch),
+                ).fetchall()
+                for url, ok, error in rows:
+                    found[url] = (bool(ok), error)
+        except sqlite3.Error as e:
+            self._count("errors")
+            logger.warning(f"Persistent URL cache read failed: {e}")
+            return found
+        self._count("hits", len(found))
+        self._count("misses", len(urls) - len(found))
+        return found
+
+    def put(
+        self,
+        kind: str,
+        url: str,
+        ok: bool,
+        error: Optional[str] = None,
+        ttl_seconds: Optional[float] = None,
+    ) -> None:
+        """
+        Store a result. Failures default to the negative-cache TTL.
+        """
+        if ttl_seconds is None:
+            ttl_seconds = self.ttl_seconds if ok else self.negative_ttl_seconds
+        now = time.time()
+        try:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO url_cache "
+                "(kind, url, ok, error, checked_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (kind, url, int(bool(ok)), error, now, now + ttl_seconds),
+            )
+        except sqlite3.Error as e:
+            self._count("errors")
+            logger.warning(f"Persistent URL cache write failed: {e}")
+            return
+        if self._count("writes") % PURGE_EVERY_WRITES == 0:
+            self.purge_expired()
+
+    def delete(self, kind: str, url: str) -> None:
+        """Remove a cached result."""
+        try:
+            self._connect().execute(
+                "DELETE FROM url_cache WHERE kind = ? AND url = ?", (kind, url)
+            )
+        except sqlite3.Error as e:
+            self._count("errors")
+            logger.warning(f"Persistent URL cache delete failed: {e}")
+
+    def purge_expired(self) -> int:
+        """Delete expired rows; returns how many were removed."""
+        try:
+            cursor = self._connect().execute(
+                "DELETE FROM url_cache WHERE expires_at <= ?", (time.time(),)
+            )
+            return cursor.rowcount
+        except sqlite3.Error as e:
+            self._count("errors")
+            logger.warning(f"Persistent URL cache purge failed: {e}")
+            return 0
+
+    def clear(self, kind: Optional[str] = None) -> None:
+        """Remove all entries, or only those of ``kind``."""
+        conn = self._connect()
+        if kind is None:
+            conn.execute("DELETE FROM url_cache")
+        else:
+            conn.execute("DELETE FROM url_cache WHERE kind = ?", (kind,))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return this process's hit/miss counters and the shared entry count."""
+        with self._stats_lock:
+            stats: Dict[str, Any] = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["path"] = str(self.path)
+        try:
+            stats["entries"] = (
+                self._connect().execute("SELECT COUNT(*) FROM url_cache").fetchone()[0]
+            )
+        except sqlite3.Error:
+            stats["entries"] = None
+        return stats
+
+    def close(self) -> None:
+        """Close this thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+_persistent_cache: Optional[PersistentURLCache] = None
+_persistent_cache_path: Optional[str] = None
+_persistent_cache_lock = threading.Lock()
+
+
+def get_persistent_url_cache() -> Optional[PersistentURLCache]:
+    """
+    Return the shared cache configured by ``URL_PERSISTENT_CACHE_PATH``.
+
+    Returns None when the variable is unset or the database cannot be opened.
+    """
+    global _persistent_cache, _persistent_cache_path
+    path = os.getenv("URL_PERSISTENT_CACHE_PATH", "")
+    if not path:
+        return None
+    # Lock-free once opened; the path is published after the cache it names
+    if _persistent_cache_path == path:
+        return _persistent_cache
+    with _persistent_cache_lock:
+        if _persistent_cache_path != path:
+            # Remember failures too, so a bad path is not retried every call
+            try:
+                _persistent_cache = PersistentURLCache(path)
+            except (OSError, sqlite3.Error) as e:
+                logger.error(f"Cannot open persistent URL cache at {path}: {e}")
+                _persistent_cache = None
+            _persistent_cache_path = path
+        return _persistent_cache
@@ -0,0 +1,332 @@
+"""
+Staged pipeline with bounded queues and per-stage concurrency.
+
+Each stage runs in its own pool of worker threads and reads from a bounded
+queue fed by the previous stage. When a downstream stage falls behind, its
+input queue fills up and upstream ``put`` calls block, so a slow stage
+(e.g. embedding) throttles the whole pipeline instead of letting
+intermediate results pile up in memory. Stages run concurrently, so the
+pipeline overlaps fetching, parsing, embedding and upserting.
+
+Stage functions receive either a single item or, for batched stages, a list
+of items. They may return:
+
+- a single result, passed to the next stage
+- ``None``, which drops the item
+- an iterable of results when the stage is declared with ``fan_out=True``
+  (e.g. chunking one document into many chunks), or always for batched
+  stages (one result per emitted item)
+"""
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of the input stream on a stage queue
+_END = object()
+
+
+@dataclass
+class PipelineStage:
+    """Configuration for a single pipeline stage."""
+
+    name: str
+    func: Callable[[Any], Any]
+    concurrency: int = 1
+    queue_size: int = 100
+    batch_size: int = 1
+    batch_timeout: float = 0.05
+    fan_out: bool = False
+
+    def __post_init__(self):
+        if self.concurrency < 1:
+            raise ValueError(f"Stage {self.name}: concurrency must be >= 1")
+        if self.queue_size < 1:
+            raise ValueError(f"Stage {self.name}: queue_size must be >= 1")
+        if self.batch_size < 1:
+            raise ValueError(f"Stage {self.name}: batch_size must be >= 1")
+
+
+@dataclass
+class StageMetrics:
+    """Throughput and error counters for one stage."""
+
+    items_in: int = 0
+    items_out: int = 0
+    failures: int = 0
+    busy_seconds: float = 0.0
+    in_flight: int = 0
+    max_queue_depth: int = 0
+
+
+@dataclass
+class PipelineResult:
+    """Outcome of a pipeline run."""
+
+    outputs: List[Any] = field(default_factory=list)
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+    stats: Dict[str, Any] = field(default_factory=dict)
+
+
+class StagedPipeline:
+    """Run items through a sequence of concurrently executing stages."""
+
+    def __init__(
+        self,
+        stages: List[PipelineStage],
+        name: str = "pipeline",
+        collect_outputs: bool = True,
+        max_errors: int = 1000,
+    ):
+        """
+        Args:
+            stages: Ordered list of stages
+            name: Name used for thread names and logging
+            collect_outputs: Keep the final stage's outputs in the result
+            max_errors: Maximum number of item errors kept in the result
+        """
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        names = [stage.name for stage in stages]
+        if len(set(names)) != len(names):
+            raise ValueError("Stage names must be unique")
+
+        self.stages = stages
+        self.name = name
+        self.collect_outputs = collect_outputs
+        self.max_errors = max_errors
+
+        self._lock = threading.Lock()
+        self._queues: List[queue.Queue] = []
+        self._metrics: Dict[str, StageMetrics] = {}
+        self._live_workers: Dict[str, int] = {}
+        self._outputs: List[Any] = []
+        self._errors: List[Dict[str, Any]] = []
+        self._start_time: Optional[float] = None
+        self._end_time: Optional[float] = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def run(self, items: Iterable[Any]) -> PipelineResult:
+        """
+        Feed ``items`` through the pipeline and wait for completion.
+
+        ``items`` is consumed lazily from the calling thread, so a generator
+        that fetches its input (e.g. RSS entries) is itself throttled by the
+        first stage's queue.
+
+        Returns:
+            PipelineResult with final-stage outputs, item errors and stats
+        """
+        with self._lock:
+            if self._start_time is not None and self._end_time is None:
+                raise RuntimeError(f"Pipeline {self.name} is already running")
+            self._reset()
+
+        threads = self._start_workers()
+        try:
+            for item in items:
+                self._put(0, item)
+        finally:
+            # Always signal end-of-input so workers drain and exit
+            for _ in range(self.stages[0].concurrency):
+                self._queues[0].put(_END)
+            for thread in threads:
+                thread.join()
+            self._end_time = time.time()
+
+        stats = self.get_stats()
+        logger.info("Pipeline %s finished", self.name, extra={"pipeline_stats": stats})
+        return PipelineResult(
+            outputs=list(self._outputs),
+            errors=list(self._errors),
+            stats=stats,
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Return per-stage throughput and queue-depth metrics.
+
+        Safe to call from another thread while the pipeline is running.
+        """
+        with self._lock:
+            start = self._start_time
+            end = self._end_time or time.time()
+            elapsed = (end - start) if start else 0.0
+            stages = {}
+            for index, stage in enumerate(self.stages):
+                metrics = self._metrics.get(stage.name, StageMetrics())
+                stage_queue = self._queues[index] if self._queues else None
+                busy_capacity = elapsed * stage.concurrency
+                stages[stage.name] = {
+                    "concurrency": stage.concurrency,
+                    "items_in": metrics.items_in,
+                    "items_out": metrics.items_out,
+                    "failures": metrics.failures,
+                    "in_flight": metrics.in_flight,
+                    "queue_depth": stage_queue.qsize() if stage_queue else 0,
+                    "queue_capacity": stage.queue_size,
+                    "max_queue_depth": metrics.max_queue_depth,
+                    "throughput_per_sec": (
+                        metrics.items_in / elapsed if elapsed > 0 else 0.0
+                    ),
+                    "utilization": (
+                        min(1.0, metrics.busy_seconds / busy_capacity)
+                        if busy_capacity > 0
+                        else 0.0
+                    ),
+                }
+            return {
+                "pipeline": self.name,
+                "elapsed_seconds": elapsed,
+                "running": start is not None and self._end_time is None,
+                "stages": stages,
+            }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _reset(self) -> None:
+        self._queues = [queue.Queue(maxsize=stage.queue_size) for stage in self.stages]
+        self._metrics = {stage.name: StageMetrics() for stage in self.stages}
+        self._live_workers = {stage.name: stage.concurrency for stage in self.stages}
+        self._outputs = []
+        self._errors = []
+        self._start_time = time.time()
+        self._end_time = None
+
+    def _start_workers(self) -> List[threading.Thread]:
+        threads = []
+        for index, stage in enumerate(self.stages):
+            for worker in range(stage.concurrency):
+                thread = threading.Thread(
+                    target=self._worker,
+                    args=(index,),
+                    name=f"{self.name}-{stage.name}-{worker}",
+                    daemon=True,
+                )
+                thread.start()
+                threads.append(thread)
+        return threads
+
+    def _put(self, index: int, item: Any) -> None:
+        """Put an item on stage ``index``'s queue, blocking when it is full."""
+        stage_queue = self._queues[index]
+        stage_queue.put(item)
+        depth = stage_queue.qsize()
+        with self._lock:
+            metrics = self._metrics[self.stages[index].name]
+            if depth > metrics.max_queue_depth:
+                metrics.max_queue_depth = depth
+
+    def _emit(self, index: int, results: Iterable[Any]) -> None:
+        """Forward results of stage ``index`` downstream (or collect them)."""
+        stage = self.stages[index]
+        is_last = index == len(self.stages) - 1
+        for result in results:
+            if result is None:
+                continue
+            with self._lock:
+                self._metrics[stage.name].items_out += 1
+                if is_last and self.collect_outputs:
+                    self._outputs.append(result)
+            if not is_last:
+                self._put(index + 1, result)
+
+    def _next_batch(self, index: int) -> tuple:
+        """Take up to ``batch_size`` items; returns (batch, end_seen)."""
+        stage = self.stages[index]
+        stage_queue = self._queues[index]
+
+        first = stage_queue.get()
+        if first is _END:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + stage.batch_timeout
+        while len(batch) < stage.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = (
+                    stage_queue.get(timeout=remaining)
+                    if remaining > 0
+                    else stage_queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+            if item is _END:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _worker(self, index: int) -> None:
+        stage = self.stages[index]
+        batched = stage.batch_size > 1
+        end_seen = False
+
+        while not end_seen:
+            batch, end_seen = self._next_batch(index)
+            if not batch:
+                continue
+
+            with self._lock:
+                metrics = self._metrics[stage.name]
+                metrics.items_in += len(batch)
+                metrics.in_flight += len(batch)
+
+            started = time.perf_counter()
+            try:
+                result = stage.func(batch if batched else batch[0])
+                if batched or stage.fan_out:
+                    results = list(result or [])
+                else:
+                    results = [result]
+            except Exception as e:
+                results = []
+                self._record_error(stage, batch, e)
+            finally:
+                with self._lock:
+                    metrics.busy_seconds += time.perf_counter() - started
+                    metrics.in_flight -= len(batch)
+
+            try:
+                self._emit(index, results)
+            except Exception as e:
+                self._record_error(stage, batch, e)
+
+        self._worker_finished(index)
+
+    def _record_error(self, stage: PipelineStage, batch: List[Any], error: Exception):
+        logger.warning(
+            "Pipeline %s stage %s failed for %d item(s): %s",
+            self.name,
+            stage.name,
+            len(batch),
+            error,
+        )
+        with self._lock:
+            self._metrics[stage.name].failures += len(batch)
+            if len(self._errors) < self.max_errors:
+                self._errors.append(
+                    {
+                        "stage": stage.name,
+                        "items": len(batch),
+                        "error": str(error),
+                        "error_type": type(error).__name__,
+                    }
+                )
+
+    def _worker_finished(self, index: int) -> None:
+        """Propagate end-of-input once the last worker of a stage exits."""
+        stage = self.stages[index]
+        with self._lock:
+            self._live_workers[stage.name] -= 1
+            last = self._live_workers[stage.name] == 0
+        if last and index + 1 < len(self.stages):
+            for _ in range(self.stages[index + 1].concurrency):
+                self._queues[index + 1].put(_END)
@@ -5,7 +5,8 @@ Result formatting utilities for query responses with URL metadata support
 
 from functools import wraps
 from typing import Any, Callable, Dict, List, Optional
-from urllib.parse import urlparse
+
+from .url_utils import canonicalize_url
 
 
 class ValidationError(Exception):
@@ -337,20 +338,11 @@ class QueryResultFormatter:
         if not url:
             return None
 
-        # Add protocol if missing
-        if not url.startswith(("http://", "https://")):
-            url = "https://" + url
-
-        try:
-            parsed = urlparse(url)
-            # Check if URL has valid scheme and netloc
-            if parsed.scheme in ("http", "https") and parsed.netloc:
-                # Basic domain validation
-                if "." in parsed.netloc and len(parsed.netloc) > 3:
-                    return url
-        except (ValueError, AttributeError):
-            # Log the error if logging is available
-            pass
+        # Same memoized pipeline as storage, so a URL shown in many results
+        # (or already validated at ingest) is only parsed once
+        canonical = canonicalize_url(url)
+        if canonical.is_valid and canonical.scheme in ("http", "https"):
+            return canonical.normalized
 
         return None
 
@@ -0,0 +1,168 @@
+"""
+SSRF building blocks: a precompiled IP range matcher and a DNS resolution cache.
+
+``IPRangeMatcher`` turns a list of networks into merged, sorted integer
+intervals per address family, so membership is one ``bisect`` instead of a
+loop over ``ipaddress.ip_network`` objects. IPv4-mapped IPv6 addresses
+(``::ffff:10.0.0.1``) are matched against the IPv4 ranges.
+
+``HostResolver`` resolves a hostname to *all* of its addresses with
+``getaddrinfo`` and caches the answer for ``ttl_seconds`` (failures for the
+shorter ``negative_ttl_seconds``), so a batch of URLs on one host triggers a
+single lookup. ``find_blocked_address`` then reports the first resolved
+address that falls in a blocked range; a hostname is only as safe as its
+worst address.
+"""
+
+import bisect
+import ipaddress
+import logging
+import os
+import socket
+from typing import Callable, Iterable, List, Optional, Tuple, Union
+
+from .lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+DNS_CACHE_TTL = float(os.getenv("URL_DNS_CACHE_TTL", "300"))
+DNS_NEGATIVE_CACHE_TTL = float(os.getenv("URL_DNS_NEGATIVE_CACHE_TTL", "30"))
+DNS_CACHE_SIZE = int(os.getenv("URL_DNS_CACHE_SIZE", "4096"))
+
+IPAddress = Union[ipaddress.IPv4Address, ipaddress.IPv6Address]
+Network = Union[str, ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+class IPRangeMatcher:
+    """Membership test for a fixed set of networks using bisect over intervals."""
+
+    def __init__(self, networks: Iterable[Network]):
+        intervals = {4: [], 6: []}
+        for network in networks:
+            network = ipaddress.ip_network(network)
+            intervals[network.version].append(
+                (int(network.network_address), int(network.broadcast_address))
+            )
+        self._starts = {}
+        self._ends = {}
+        for version, spans in intervals.items():
+            merged: List[List[int]] = []
+            for start, end in sorted(spans):
+                if merged and start <= merged[-1][1] + 1:
+                    merged[-1][1] = max(merged[-1][1], end)
+                else:
+                    merged.append([start, end])
+            self._starts[version] = [start for start, _ in merged]
+            self._ends[version] = [end for _, end in merged]
+
+    def __contains__(self, address: Union[str, IPAddress]) -> bool:
+        if isinstance(address, str):
+            try:
+                address = ipaddress.ip_address(address)
+            except ValueError:
+                return False
+        if address.version == 6 and address.ipv4_mapped is not None:
+            address = address.ipv4_mapped
+        value = int(address)
+        starts = self._starts[address.version]
+        i = bisect.bisect_right(starts, value) - 1
+        return i >= 0 and value <= self._ends[address.version][i]
+
+
+class HostResolver:
+    """Resolve hostnames to every address, with a TTL-bounded LRU cache."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = DNS_CACHE_TTL,
+        negative_ttl_seconds: float = DNS_NEGATIVE_CACHE_TTL,
+        max_entries: int = DNS_CACHE_SIZE,
+        getaddrinfo: Callable = socket.getaddrinfo,
+    ):
+        """
+        Args:
+            ttl_seconds: How long successful lookups are reused
+            negative_ttl_seconds: How long failed lookups are reused
+            max_entries: Maximum number of cached hostnames
+            getaddrinfo: Resolver function, injectable for tests
+        """
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._getaddrinfo = getaddrinfo
+        self._cache = LRUCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    def resolve(self, host: str) -> Tuple[IPAddress, ...]:
+        """
+        Return all addresses of ``host`` (empty if it does not resolve).
+
+        IP literals are returned as-is without a lookup.
+        """
+        host = host.strip("[]").lower()
+        try:
+            return (ipaddress.ip_address(host),)
+        except ValueError:
+            pass
+
+        cached = self._cache.get(host)
+        if cached is not None:
+            return cached
+
+        try:
+            infos = self._getaddrinfo(host, None, proto=socket.IPPROTO_TCP)
+        except (OSError, UnicodeError) as e:
+            logger.debug(f"DNS lookup failed for {host}: {e}")
+            self._cache.put(host, (), ttl_seconds=self.negative_ttl_seconds)
+            return ()
+
+        addresses = []
+        for info in infos:
+            try:
+                # Strip an IPv6 zone index ("fe80::1%eth0")
+                address = ipaddress.ip_address(info[4][0].split("%", 1)[0])
+            except ValueError:
+                continue
+            if address not in addresses:
+                addresses.append(address)
+        result = tuple(addresses)
+        self._cache.put(host, result)
+        return result
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def get_stats(self):
+        return self._cache.get_stats()
+
+
+def is_blocked_address(
+    address: IPAddress, blocked: IPRangeMatcher, allow_loopback: bool = False
+) -> bool:
+    """Return True if a request to ``address`` must be refused."""
+    if address.version == 6 and address.ipv4_mapped is not None:
+        address = address.ipv4_mapped
+    if address.is_loopback:
+        return not allow_loopback
+    return (
+        address in blocked
+        or address.is_unspecified
+        or address.is_multicast
+        or address.is_reserved
+        or address.is_link_local
+    )
+
+
+def find_blocked_address(
+    host: str,
+    resolver: HostResolver,
+    blocked: IPRangeMatcher,
+    allow_loopback: bool = False,
+) -> Optional[IPAddress]:
+    """
+    Resolve ``host`` and return the first address that must not be contacted.
+
+    Returns None when every address is public, or when the host does not
+    resolve (the request itself will then fail).
+    """
+    for address in resolver.resolve(host):
+        if is_blocked_address(address, blocked, allow_loopback):
+            return address
+    return None
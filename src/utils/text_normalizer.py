@@ -0,0 +1,307 @@
+"""
+Precompiled text normalization for MCP responses, articles and TTS input.
+
+Cleaning rules are compiled once at import time and grouped into as few
+passes as possible: substitutions that cannot interact (e.g. the six
+mojibake fixes and control-character removal, or the three escape-sequence
+fixes) share one alternation pattern and a lookup-table replacement, so a
+large PDF-derived response is scanned ten times instead of twenty-five.
+
+Grouping only happens where the single pass gives exactly the same output as
+running the original substitutions one after another; order-dependent rules
+(such as word/number spacing) stay separate passes.
+
+``TextNormalizer.normalize_stream`` cleans text chunk by chunk. It only cuts
+the input at a single space between two ASCII letters or digits, a position
+no rule can match across, so streamed output equals ``normalize`` on the
+whole text.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, List, Match, Optional, Pattern, Union
+
+Replacement = Union[str, Callable[[Match], str]]
+
+
+@dataclass(frozen=True)
+class NormalizationRule:
+    """One compiled substitution pass."""
+
+    name: str
+    pattern: Pattern[str]
+    replacement: Replacement
+
+    def apply(self, text: str) -> str:
+        return self.pattern.sub(self.replacement, text)
+
+
+def _lookup(table: dict) -> Callable[[Match], str]:
+    """Replacement that maps the matched text through ``table`` (default: delete)."""
+    return lambda match: table.get(match.group(), "")
+
+
+def _by_group(table: dict) -> Callable[[Match], str]:
+    """Replacement chosen by the name of the alternative that matched."""
+    return lambda match: table[match.lastgroup]
+
+
+# Mojibake produced when UTF-8 punctuation is decoded as Latin-1
+_MOJIBAKE = {
+    "â\x80\x99": "'",
+    "â\x80\x9c": '"',
+    "â\x80\x9d": '"',
+    "â\x80\x93": "–",
+    "â\x80\x94": "—",
+    "â\x80\xa6": "...",
+}
+
+# Literal escape sequences left behind by JSON-encoded PDF text
+_ESCAPES = {"\\r\\n": "\n", "\\n": "\n", "\\t": "\t"}
+
+LINE_ENDINGS = NormalizationRule("line_endings", re.compile(r"\r\n?"), "\n")
+
+# Space between lowercase→uppercase/digit and digit→uppercase boundaries.
+# Zero-width, so every boundary of the original text is found in one pass.
+CASE_BOUNDARIES = NormalizationRule(
+    "case_boundaries",
+    re.compile(r"(?<=[a-z])(?=[A-Z\d])|(?<=\d)(?=[A-Z])"),
+    " ",
+)
+
+HYPHENATED_LINE_BREAKS = NormalizationRule(
+    "hyphenated_line_breaks", re.compile(r"([a-z])-\s*\n\s*([a-z])"), r"\1\2"
+)
+
+# Trailing blanks, runs of spaces and runs of blank lines
+WHITESPACE = NormalizationRule(
+    "whitespace",
+    re.compile(r"(?P<trailing>[ \t]+$)|(?P<spaces> {2,})|(?P<newlines>\n{3,})", re.M),
+    _by_group({"trailing": "", "spaces": " ", "newlines": "\n\n"}),
+)
+
+BROKEN_WORDS = NormalizationRule(
+    "broken_words", re.compile(r"([a-z])\s*\n\s*([a-z])"), r"\1\2"
+)
+
+# Drop whitespace before punctuation and add a space after it before letters
+PUNCTUATION_SPACING = NormalizationRule(
+    "punctuation_spacing",
+    re.compile(r"(?P<before>\s+(?=[,.;:!?]))|(?P<after>(?<=[,.;:!?])(?=[A-Za-z]))"),
+    _by_group({"before": "", "after": " "}),
+)
+
+WORD_NUMBER_SPACING = NormalizationRule(
+    "word_number_spacing", re.compile(r"(\w)(\d+)"), r"\1 \2"
+)
+
+NUMBER_WORD_SPACING = NormalizationRule(
+    "number_word_spacing", re.compile(r"(\d+)([A-Za-z])"), r"\1 \2"
+)
+
+# Mojibake fixes and removal of control characters other than \t and \n.
+# Form feeds are removed here, as they always were.
+ENCODING_ARTIFACTS = NormalizationRule(
+    "encoding_artifacts",
+    re.compile(
+        "|".join(map(re.escape, _MOJIBAKE)) + r"|[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]"
+    ),
+    _lookup(_MOJIBAKE),
+)
+
+ESCAPED_WHITESPACE = NormalizationRule(
+    "escaped_whitespace",
+    re.compile("|".join(map(re.escape, _ESCAPES))),
+    _lookup(_ESCAPES),
+)
+
+# Rules for text extracted from PDFs (MCP document responses). Same output as
+# the original clean_mcp_response.clean_text_content; its second camelCase
+# pass could never match after the first and is gone.
+PDF_RULES = (
+    LINE_ENDINGS,
+    CASE_BOUNDARIES,
+    HYPHENATED_LINE_BREAKS,
+    WHITESPACE,
+    BROKEN_WORDS,
+    PUNCTUATION_SPACING,
+    WORD_NUMBER_SPACING,
+    NUMBER_WORD_SPACING,
+    ENCODING_ARTIFACTS,
+    ESCAPED_WHITESPACE,
+)
+
+# Rules for article text that is already well formed: fix encoding and
+# whitespace, but never re-space words and numbers.
+ARTICLE_RULES = (LINE_ENDINGS, ENCODING_ARTIFACTS, WHITESPACE)
+
+
+class TextNormalizer:
+    """Apply a fixed sequence of precompiled rules to whole or streamed text."""
+
+    def __init__(self, rules: Iterable[NormalizationRule], strip: bool = True):
+        """
+        Args:
+            rules: Rules applied in order. Streaming requires that no rule can
+                match across a single space between two ASCII letters/digits.
+            strip: Strip leading and trailing whitespace from the result
+        """
+        self.rules: List[NormalizationRule] = list(rules)
+        self.strip = strip
+
+    def _apply(self, text: str) -> str:
+        for rule in self.rules:
+            text = rule.apply(text)
+        return text
+
+    def normalize(self, text: str) -> str:
+        """Normalize a complete text."""
+        text = self._apply(text)
+        return text.strip() if self.strip else text
+
+    def normalize_stream(
+        self, chunks: Iterable[str], min_chunk_size: int = 4096
+    ) -> Iterator[str]:
+        """
+        Normalize text arriving in chunks, yielding cleaned pieces.
+
+        Input is buffered until at least ``min_chunk_size`` characters are
+        available and a safe cut point exists; the joined output is identical
+        to ``normalize("".join(chunks))``.
+        """
+        buffer = ""
+        started = False
+        pending = ""  # trailing whitespace held back until more text follows
+
+        def emit(piece: str) -> Optional[str]:
+            nonlocal started, pending
+            if self.strip:
+                if not started:
+                    piece = piece.lstrip()
+                body = piece.rstrip()
+                if not body:
+                    pending += piece
+                    return None
+                started = True
+                out = pending + body
+                pending = piece[len(body) :]
+                return out
+            return piece or None
+
+        for chunk in chunks:
+            buffer += chunk
+            if len(buffer) < min_chunk_size:
+                continue
+            cut = _safe_cut(buffer)
+            if cut is None:
+                continue
+            piece = emit(self._apply(buffer[:cut]))
+            buffer = buffer[cut:]
+            if piece:
+                yield piece
+
+        piece = emit(self._apply(buffer))
+        if piece:
+            yield piece
+
+
+def _is_ascii_alnum(char: str) -> bool:
+    return char.isascii() and char.isalnum()
+
+
+def _safe_cut(text: str) -> Optional[int]:
+    """Find the last lone space between two ASCII alphanumerics."""
+    index = text.rfind(" ", 1, len(text) - 1)
+    while index > 0:
+        if _is_ascii_alnum(text[index - 1]) and _is_ascii_alnum(text[index + 1]):
+            return index
+        index = text.rfind(" ", 1, index)
+    return None
+
+
+pdf_text_normalizer = TextNormalizer(PDF_RULES)
+article_text_normalizer = TextNormalizer(ARTICLE_RULES)
+
+
+def normalize_pdf_text(text: str) -> str:
+    """Clean PDF-extracted text (camelCase, hyphenation, mojibake, escapes)."""
+    return pdf_text_normalizer.normalize(text)
+
+
+def normalize_article_text(text: str) -> str:
+    """Clean extracted article text (line endings, mojibake, whitespace)."""
+    return article_text_normalizer.normalize(text)
+
+
+# ---------------------------------------------------------------------------
+# Markdown → speech text (ResponseContentExtractor._clean_markdown)
+# ---------------------------------------------------------------------------
+_MD_HEADER = re.compile(r"^\s*#+\s+(.*)$")
+_MD_HEADER_TAIL = re.compile(r"[#\s]+$")
+_MD_INLINE_MARKUP = re.compile(r"[`*_~]+")
+_MD_PRINT_CALL = re.compile(r"\bprint\s*\([^)]*\)")
+# Boilerplate lines from tool output: source lists, query echoes, result
+# labels and result counts
+_MD_BOILERPLATE_LINE = re.compile(
+    r"(?i)sources?\b"
+    r"|(?:query|relevance|result\s*\d+)\s*:\s*"
+    r"|found\s+\d+\s+relevant\s+results"
+    r"|\d+\s+results?\s+include\s+source\s+links"
+)
+_MD_RESULT_LABEL = re.compile(r"(?i)\bresult\s*\d+\b\.?")
+_MD_INLINE_SOURCE = re.compile(r"(?i)\bsource:\s*[^\n]+")
+_MD_LINK = re.compile(r"\[([^\]]+)\]\([^)]+\)")
+_MD_BARE_DOMAIN = re.compile(r"\b(?:[A-Za-z0-9-]+\.)+[A-Za-z]{2,}\b")
+_MD_BLOCKQUOTE = re.compile(r"^\s*>\s*")
+_MD_BULLET = re.compile(r"(?m)^\s*[-*]\s+")
+_MD_ORDERED = re.compile(r"(?m)^\s*\d+\.\s+")
+_MD_STRAY_HASH = re.compile(r"^\s*#\s+", re.MULTILINE)
+_MD_RULE_LINE = re.compile(r"(?m)^\s*-{3,}\s*$")
+_MD_INLINE_RULE = re.compile(r"\s+-{3,}\s+")
+# Whitespace runs, single newlines and single blanks all become one space
+_MD_WHITESPACE = re.compile(r"\s{2,}|[ \t\n]")
+
+
+def _speech_header(line: str) -> str:
+    match = _MD_HEADER.match(line)
+    if not match:
+        return line
+    header = _MD_HEADER_TAIL.sub("", match.group(1).strip())
+    if header and not header.endswith("."):
+        header += "."
+    return header
+
+
+def clean_markdown_for_speech(text: str) -> str:
+    """
+    Reduce markdown tool output to plain sentences suitable for TTS.
+
+    Headers become sentences, inline markup, links, bare domains, list
+    markers and rules are removed, boilerplate lines (sources, result labels,
+    result counts) and blockquotes are dropped, and all whitespace collapses
+    to single spaces.
+    """
+    cleaned = "\n".join(_speech_header(line) for line in text.splitlines())
+    cleaned = _MD_INLINE_MARKUP.sub("", cleaned)
+    cleaned = _MD_PRINT_CALL.sub("", cleaned)
+
+    kept: List[str] = []
+    for line in cleaned.splitlines():
+        if _MD_BOILERPLATE_LINE.match(line.strip()):
+            continue
+        kept.append(_MD_RESULT_LABEL.sub("", line))
+    cleaned = "\n".join(kept)
+
+    cleaned = _MD_INLINE_SOURCE.sub("", cleaned)
+    cleaned = _MD_LINK.sub(r"\1", cleaned)
+    cleaned = _MD_BARE_DOMAIN.sub("", cleaned)
+    cleaned = "\n".join(
+        line for line in cleaned.splitlines() if not _MD_BLOCKQUOTE.match(line)
+    )
+    cleaned = _MD_BULLET.sub("", cleaned)
+    cleaned = _MD_ORDERED.sub("", cleaned)
+    cleaned = _MD_STRAY_HASH.sub("", cleaned)
+    cleaned = _MD_RULE_LINE.sub("", cleaned)
+    cleaned = _MD_INLINE_RULE.sub(" ", cleaned)
+    cleaned = _MD_WHITESPACE.sub(" ", cleaned)
+    return cleaned.strip()
@@ -22,6 +22,12 @@ try:  # Prefer external util, fall back to local copy when running inside the re
     from btc_max_knowledge_agent.utils.validation import validate_volume_strict
 except ImportError:  # pragma: no cover
     from .validation import validate_volume_strict
+from .latency_histogram import LatencyHistogram
+
+try:  # one registry per process, whichever path this module was imported by
+    from btc_max_knowledge_agent.utils.metrics_registry import REGISTRY
+except ImportError:  # pragma: no cover
+    from .metrics_registry import REGISTRY
 from .multi_tier_audio_cache import CacheConfig, get_audio_cache
 from .tts_error_handler import (
     TTSAPIKeyError,
@@ -36,6 +42,19 @@ from .tts_error_handler import (
 # Configure logging
 logger = logging.getLogger(__name__)
 
+_TTS_REQUESTS = REGISTRY.counter(
+    "tts_requests_total", "TTS synthesis requests by cache result", ["result"]
+)
+_TTS_API_REQUESTS = REGISTRY.counter(
+    "tts_api_requests_total", "Requests sent to the TTS API"
+)
+_TTS_SYNTHESIS_SECONDS = REGISTRY.histogram(
+    "tts_synthesis_seconds", "Time to synthesize uncached audio"
+)
+_TTS_ERRORS = REGISTRY.counter(
+    "tts_synthesis_errors_total", "Failed TTS syntheses by error type", ["error"]
+)
+
 
 @dataclass
 class TTSConfig:
@@ -414,7 +433,7 @@ class TTSService:
             "requests_made": 0,
             "cache_hits": 0,
             "cache_misses": 0,
-            "synthesis_times": [],
+            "synthesis_latency": LatencyHistogram(),
             "memory_cleanups": 0,
             "connection_reuses": 0,
         }
@@ -547,6 +566,7 @@ class TTSService:
             # Track performance metrics
             with self._stats_lock:
                 self._performance_stats["requests_made"] += 1
+            _TTS_API_REQUESTS.inc()
 
             async with session.post(url, json=payload, headers=headers) as response:
                 if response.status == 200:
@@ -642,6 +662,7 @@ class TTSService:
         if cached_audio:
             with self._stats_lock:
                 self._performance_stats["cache_hits"] += 1
+            _TTS_REQUESTS.labels("cache_hit").inc()
             logger.info(
                 f"TTS cache hit: returning {len(cached_audio)} bytes of cached audio"
             )
@@ -650,6 +671,7 @@ class TTSService:
         # Cache miss - track it
         with self._stats_lock:
             self._performance_stats["cache_misses"] += 1
+        _TTS_REQUESTS.labels("cache_miss").inc()
         logger.debug("TTS cache miss, proceeding with API synthesis")
 
         # Use provided voice_id or default
@@ -670,22 +692,20 @@ class TTSService:
             # Track synthesis performance
             synthesis_time = time.time() - synthesis_start
             with self._stats_lock:
-                self._performance_stats["synthesis_times"].append(synthesis_time)
-                # Keep only last 100 synthesis times for memory efficiency
-                if len(self._performance_stats["synthesis_times"]) > 100:
-                    self._performance_stats["synthesis_times"] = (
-                        self._performance_stats["synthesis_times"][-100:]
-                    )
+                self._performance_stats["synthesis_latency"].record(synthesis_time)
+            _TTS_SYNTHESIS_SECONDS.observe(synthesis_time)
 
             logger.info(
                 f"Successfully synthesized {len(audio_data)} bytes of audio in {synthesis_time:.2f}s (cached as {cache_key[:8]}...)"
             )
             return audio_data
 
-        except (TTSAPIKeyError, TTSRetryExhaustedError):
+        except (TTSAPIKeyError, TTSRetryExhaustedError) as e:
             # These are already properly handled by the error handler
+            _TTS_ERRORS.labels(type(e).__name__).inc()
             raise
         except Exception as e:
+            _TTS_ERRORS.labels("unexpected").inc()
             # Wrap unexpected errors
             logger.error(f"Unexpected error during TTS synthesis: {e}")
             raise TTSError(f"Synthesis failed: {e}", original_error=e)
@@ -709,16 +729,20 @@ class TTSService:
     def get_performance_stats(self) -> Dict[str, Any]:
         """Get comprehensive performance statistics."""
         with self._stats_lock:
-            synthesis_times = self._performance_stats["synthesis_times"].copy()
+            synthesis_latency = self._performance_stats["synthesis_latency"]
 
-            # Calculate synthesis time statistics
+            # Calculate synthesis time statistics (seconds)
             synthesis_stats = {}
-            if synthesis_times:
+            if synthesis_latency.count:
+                percentiles = synthesis_latency.percentiles(50, 90, 99)
                 synthesis_stats = {
-                    "avg_synthesis_time": sum(synthesis_times) / len(synthesis_times),
-                    "min_synthesis_time": min(synthesis_times),
-                    "max_synthesis_time": max(synthesis_times),
-                    "total_syntheses": len(synthesis_times),
+                    "avg_synthesis_time": synthesis_latency.mean(),
+                    "min_synthesis_time": synthesis_latency.min,
+                    "max_synthesis_time": synthesis_latency.max,
+                    "p50_synthesis_time": percentiles["p50"],
+                    "p90_synthesis_time": percentiles["p90"],
+                    "p99_synthesis_time": percentiles["p99"],
+                    "total_syntheses": synthesis_latency.count,
                 }
 
             # Get connection pool stats
@@ -805,7 +829,7 @@ class TTSService:
                     "requests_made": 0,
                     "cache_hits": 0,
                     "cache_misses": 0,
-                    "synthesis_times": [],
+                    "synthesis_latency": LatencyHistogram(),
                     "memory_cleanups": 0,
                     "connection_reuses": 0,
                 }
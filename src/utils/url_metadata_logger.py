@@ -1,23 +1,65 @@
 """
 URL Metadata Logger with structured logging, correlation IDs, and specialized loggers.
 Provides comprehensive logging infrastructure for URL-related operations.
+
+With ``async_logging`` (or ``URL_METADATA_LOG_ASYNC=true``) records are put
+on a bounded in-memory queue without blocking and a background thread does
+the file writes in batches, so slow disks do not stall request handlers or
+the event loop. When the queue is full, DEBUG records are dropped first,
+then INFO; WARNING and above are dropped only when nothing less important
+is queued.
 """
 
+import atexit
+import contextvars
 import json
 import logging
 import logging.handlers
+import os
+import socket
+import threading
 import uuid
+import weakref
+from collections import deque
 from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from threading import local
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+try:
+    from btc_max_knowledge_agent.utils.metrics_registry import REGISTRY
+except ImportError:  # pragma: no cover
+    from .metrics_registry import REGISTRY
+
+# Optional faster JSON serializer
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Logging configuration constants
 LOG_ROTATION_MAX_BYTES = 50 * 1024 * 1024  # 50MB
 LOG_ROTATION_BACKUP_COUNT = 5
 
-# Thread-local storage for correlation IDs
+# Non-blocking (queue) mode
+ASYNC_LOGGING_DEFAULT = os.getenv("URL_METADATA_LOG_ASYNC", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+LOG_QUEUE_SIZE = int(os.getenv("URL_METADATA_LOG_QUEUE_SIZE", "10000"))
+LOG_BATCH_SIZE = 256
+
+# Static fields stamped on every structured record
+SERVICE_NAME = os.getenv("SERVICE_NAME", "btc-max-knowledge-agent")
+
+_DROPPED_RECORDS = REGISTRY.counter(
+    "log_records_dropped_total",
+    "URL metadata log records dropped because the log queue was full",
+    ["level"],
+)
 
 __all__ = [
     "URLMetadataLogger",
@@ -37,16 +79,254 @@ __all__ = [
     "generate_correlation_id",
 ]
 
-_thread_locals = local()
+# Correlation ID of the current context. Unlike thread-local storage this
+# follows a request across ``await`` points, stays separate for asyncio tasks
+# sharing one thread, and is copied into work submitted to the shared
+# executors (see ``utils.executors``).
+_correlation_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "url_metadata_correlation_id", default=None
+)
+
+
+def _priority(levelno: int) -> int:
+    """Overflow class of a record: 0 debug, 1 info, 2 warning and above."""
+    if levelno < logging.INFO:
+        return 0
+    if levelno < logging.WARNING:
+        return 1
+    return 2
+
+
+class BoundedLogQueue:
+    """
+    Bounded FIFO of pending log records that never blocks producers.
+
+    Records are kept in one deque per overflow class, tagged with a sequence
+    number so the consumer still sees them in arrival order. When full, an
+    incoming record evicts the oldest record of a less important class, or
+    is itself dropped if there is none.
+    """
+
+    def __init__(self, maxsize: int = LOG_QUEUE_SIZE):
+        self.maxsize = maxsize
+        self._queues: Tuple[Deque[Tuple[int, Any]], ...] = (deque(), deque(), deque())
+        self._size = 0
+        self._seq = 0
+        self._not_empty = threading.Condition(threading.Lock())
+        self.dropped: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def put_nowait(self, item: Any, levelno: int) -> bool:
+        """Queue ``item``; returns False if it (or nothing) had to be dropped."""
+        priority = _priority(levelno)
+        with self._not_empty:
+            if self._size >= self.maxsize:
+                victim = next((p for p in range(priority) if self._queues[p]), None)
+                if victim is None:
+                    self._record_drop(levelno)
+                    return False
+                _seq, evicted = self._queues[victim].popleft()
+                self._size -= 1
+                self._record_drop(_levelno_of(evicted))
+            self._seq += 1
+            self._queues[priority].append((self._seq, item))
+            self._size += 1
+            self._not_empty.notify()
+            return True
+
+    def put_barrier(self, event: threading.Event) -> None:
+        """Queue ``event`` behind every pending record; never dropped."""
+        with self._not_empty:
+            self._seq += 1
+            self._queues[2].append((self._seq, event))
+            self._size += 1
+            self._not_empty.notify()
+
+    def _record_drop(self, levelno: int) -> None:
+        # Caller holds the lock
+        level = logging.getLevelName(levelno)
+        self.dropped[level] = self.dropped.get(level, 0) + 1
+        _DROPPED_RECORDS.labels(level).inc()
+
+    def get_batch(self, max_items: int, timeout: Optional[float] = None) -> List[Any]:
+        """Wait up to ``timeout`` for records, then take up to ``max_items``."""
+        with self._not_empty:
+            if not self._size:
+                self._not_empty.wait(timeout)
+            batch = []
+            while self._size and len(batch) < max_items:
+                queue = min((q for q in self._queues if q), key=lambda q: q[0][0])
+                batch.append(queue.popleft()[1])
+                self._size -= 1
+            return batch
+
+    def reset_after_fork(self) -> None:
+        # Records inherited from the parent are the parent's to write; keeping
+        # them would duplicate them in every forked worker
+        self._not_empty = threading.Condition(threading.Lock())
+        self._queues = (deque(), deque(), deque())
+        self._size = 0
+        self._seq = 0
+
+
+def _levelno_of(item: Any) -> int:
+    record = item[1] if isinstance(item, tuple) else item
+    return getattr(record, "levelno", logging.CRITICAL)
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to a ``BatchingLogListener`` instead of writing them.
+
+    Filters (the correlation ID) run on the calling thread; the message is
+    merged with its arguments there too, so the record no longer refers to
+    caller-owned mutable objects. Formatting and I/O happen on the listener
+    thread.
+    """
+
+    def __init__(self, listener: "BatchingLogListener", target: logging.Handler):
+        super().__init__(listener.queue)
+        self.listener = listener
+        self.target = target
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        self.listener.queue.put_nowait((self.target, record), record.levelno)
+
+    def close(self) -> None:
+        try:
+            self.target.close()
+        finally:
+            super().close()
+
+
+class BatchingLogListener:
+    """Background thread that drains a ``BoundedLogQueue`` in batches."""
+
+    _instances: "weakref.WeakSet[BatchingLogListener]" = weakref.WeakSet()
+
+    def __init__(self, maxsize: int = LOG_QUEUE_SIZE, batch_size: int = LOG_BATCH_SIZE):
+        self.queue = BoundedLogQueue(maxsize)
+        self.batch_size = batch_size
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._reported_drops = 0
+        BatchingLogListener._instances.add(self)
+
+    def start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="url-metadata-log-writer", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Write out everything queued, then stop the thread."""
+        self._stopping.set()
+        with self.queue._not_empty:
+            self.queue._not_empty.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            # Still writing: keep the reference so start() cannot add a second
+            if not self._thread.is_alive():
+                self._thread = None
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Block until the records queued so far have been written.
+
+        Returns False if the writer is not running or ``timeout`` elapsed.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return False
+        written = threading.Event()
+        self.queue.put_barrier(written)
+        return written.wait(timeout)
+
+    def _run(self) -> None:
+        while True:
+            batch = self.queue.get_batch(self.batch_size, timeout=0.5)
+            barriers = [item for item in batch if isinstance(item, threading.Event)]
+            if barriers:
+                batch = [i for i in batch if not isinstance(i, threading.Event)]
+            if batch:
+                try:
+                    self._write(batch)
+                except Exception:  # keep the writer alive
+                    logging.getLogger("url_metadata").exception(
+                        "Failed to write URL metadata log batch"
+                    )
+            for barrier in barriers:
+                barrier.set()
+            if not batch and not barriers and self._stopping.is_set():
+                return
+
+    def _write(self, batch: List[Tuple[logging.Handler, logging.LogRecord]]) -> None:
+        by_target: Dict[logging.Handler, List[logging.LogRecord]] = {}
+        for target, record in batch:
+            by_target.setdefault(target, []).append(record)
+        for target, records in by_target.items():
+            emit_batch = getattr(target, "emit_batch", None)
+            if emit_batch is not None:
+                emit_batch(records)
+            else:
+                for record in records:
+                    target.handle(record)
+
+        dropped = sum(self.queue.dropped.values())
+        if dropped > self._reported_drops:
+            logging.getLogger("url_metadata").warning(
+                "URL metadata log queue full; %d records dropped so far (%s)",
+                dropped,
+                dict(self.queue.dropped),
+            )
+            self._reported_drops = dropped
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "queued": len(self.queue),
+            "maxsize": self.queue.maxsize,
+            "dropped": dict(self.queue.dropped),
+            "running": self._thread is not None and self._thread.is_alive(),
+        }
+
+    def _after_fork_in_child(self) -> None:
+        # Only the forking thread survives; restart the writer if it ran
+        was_running = self._thread is not None
+        self.queue.reset_after_fork()
+        self._thread = None
+        self._stopping = threading.Event()
+        if was_running:
+            self.start()
+
+
+def _restart_listeners_after_fork() -> None:
+    for listener in list(BatchingLogListener._instances):
+        listener._after_fork_in_child()
+
+
+def _stop_listeners() -> None:
+    for listener in list(BatchingLogListener._instances):
+        listener.stop()
+
+
+atexit.register(_stop_listeners)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_listeners_after_fork)
 
 
 class CorrelationIdFilter(logging.Filter):
     """Adds correlation ID to log records."""
 
     def filter(self, record):
-        record.correlation_id = getattr(
-            _thread_locals, "correlation_id", "no-correlation-id"
-        )
+        record.correlation_id = _correlation_id.get() or "no-correlation-id"
         return True
 
 
@@ -76,13 +356,150 @@ class JsonFormatter(logging.Formatter):
         return json.dumps(log_data)
 
 
+if ORJSON_AVAILABLE:
+
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode(
+            "utf-8"
+        )
+
+else:
+
+    def _json_dumps(obj: Any) -> str:
+        return json.dumps(obj, default=str, ensure_ascii=False, separators=(",", ":"))
+
+
+class FastJsonFormatter(logging.Formatter):
+    """
+    ``JsonFormatter`` fields plus static ones, serialized with less work.
+
+    The static fields (service, host and any passed in) are encoded once
+    into a cached prefix, and the level/logger/module/function/line fragment
+    once per call site. Per record only the timestamp (reusing the formatted
+    second), correlation ID, message, exception and extra fields are
+    serialized, with ``orjson`` when installed. Timestamps come from the
+    record's creation time, so records written later by the queue writer
+    keep the time they were logged.
+    """
+
+    _STANDARD_FIELDS = frozenset(
+        (
+            "timestamp",
+            "level",
+            "logger",
+            "module",
+            "function",
+            "line",
+            "correlation_id",
+            "message",
+            "exception",
+        )
+    )
+    _MAX_CACHED_SITES = 4096
+
+    def __init__(self, static_fields: Optional[Dict[str, Any]] = None):
+        super().__init__()
+        fields = {"service": SERVICE_NAME, "host": socket.gethostname()}
+        fields.update(static_fields or {})
+        self.static_fields = fields
+        self._prefix = "{" + "".join(
+            _json_dumps({key: value})[1:-1] + "," for key, value in fields.items()
+        )
+        self._reserved = self._STANDARD_FIELDS | frozenset(fields)
+        self._sites: Dict[Tuple[Any, ...], str] = {}
+        self._second: Tuple[int, str] = (-1, "")
+
+    def _timestamp(self, created: float) -> str:
+        whole = int(created)
+        cached = self._second
+        if cached[0] != whole:
+            text = datetime.fromtimestamp(whole, timezone.utc).strftime(
+                "%Y-%m-%dT%H:%M:%S"
+            )
+            cached = self._second = (whole, text)
+        return f"{cached[1]}.{int((created - whole) * 1e6):06d}+00:00"
+
+    def _site(self, record: logging.LogRecord) -> str:
+        key = (
+            record.levelname,
+            record.name,
+            record.module,
+            record.funcName,
+            record.lineno,
+        )
+        site = self._sites.get(key)
+        if site is None:
+            if len(self._sites) >= self._MAX_CACHED_SITES:
+                self._sites.clear()
+            site = self._sites[key] = _json_dumps(
+                {
+                    "level": record.levelname,
+                    "logger": record.name,
+                    "module": record.module,
+                    "function": record.funcName,
+                    "line": record.lineno,
+                }
+            )[1:-1]
+        return site
+
+    def format(self, record):
+        dynamic = {
+            "correlation_id": getattr(record, "correlation_id", "no-correlation-id"),
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+            dynamic["exception"] = record.exc_text
+        extra_fields = getattr(record, "extra_fields", None)
+        if extra_fields:
+            if not self._reserved.isdisjoint(extra_fields):
+                return self._format_overridden(record, dynamic, extra_fields)
+            dynamic.update(extra_fields)
+
+        return (
+            f'{self._prefix}"timestamp":"{self._timestamp(record.created)}",'
+            f"{self._site(record)},{_json_dumps(dynamic)[1:]}"
+        )
+
+    def _format_overridden(self, record, dynamic, extra_fields) -> str:
+        # Extra fields replace standard ones, as with JsonFormatter
+        log_data = dict(self.static_fields)
+        log_data["timestamp"] = self._timestamp(record.created)
+        log_data.update(json.loads("{" + self._site(record) + "}"))
+        log_data.update(dynamic)
+        log_data.update(extra_fields)
+        return _json_dumps(log_data)
+
+
 class URLMetadataLogger:
     """Central logging configuration for URL metadata operations."""
 
-    def __init__(self, log_dir: str = "logs", query_truncation_length: int = 100):
+    def __init__(
+        self,
+        log_dir: str = "logs",
+        query_truncation_length: int = 100,
+        async_logging: Optional[bool] = None,
+        queue_size: int = LOG_QUEUE_SIZE,
+    ):
+        """
+        Args:
+            log_dir: Directory for the per-operation log files
+            query_truncation_length: Maximum logged query length
+            async_logging: Queue records and write them on a background
+                thread (defaults to ``URL_METADATA_LOG_ASYNC``)
+            queue_size: Maximum records held while the writer catches up
+        """
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(exist_ok=True)
 
+        if async_logging is None:
+            async_logging = ASYNC_LOGGING_DEFAULT
+        self.listener: Optional[BatchingLogListener] = None
+        if async_logging:
+            self.listener = BatchingLogListener(maxsize=queue_size)
+            self.listener.start()
+
         # Validate query_truncation_length to avoid silent misconfiguration
         if not isinstance(query_truncation_length, int):
             raise ValueError(
@@ -130,7 +547,7 @@ class URLMetadataLogger:
             # Console handler for warnings and above
             console_handler = logging.StreamHandler()
             console_handler.setLevel(logging.WARNING)
-            console_handler.setFormatter(JsonFormatter())
+            console_handler.setFormatter(FastJsonFormatter())
             console_handler.addFilter(correlation_filter)
             root_logger.addHandler(console_handler)
 
@@ -146,13 +563,13 @@ class URLMetadataLogger:
         # Create a single handler that will handle all log levels
         log_prefix = name.split(".")[-1]
         handler = self._create_combined_file_handler(log_prefix)
+        handler.setFormatter(FastJsonFormatter())
+        if self.listener is not None:
+            # Formatting and file I/O move to the writer thread
+            handler = NonBlockingQueueHandler(self.listener, handler)
 
-        # Add correlation filter and formatter
-        correlation_filter = CorrelationIdFilter()
-        formatter = JsonFormatter()
-
-        handler.addFilter(correlation_filter)
-        handler.setFormatter(formatter)
+        # The correlation ID is read on the logging thread
+        handler.addFilter(CorrelationIdFilter())
         logger.addHandler(handler)
 
         # Prevent propagation to parent loggers to avoid duplicate logging
@@ -201,22 +618,54 @@ class URLMetadataLogger:
                 handler.setFormatter(logging.Formatter("%(message)s"))
                 return handler
 
+            def setFormatter(self, fmt):
+                """Format records written to every file with ``fmt``."""
+                super().setFormatter(fmt)
+                for handler in self.handlers.values():
+                    handler.setFormatter(fmt)
+
+            def _level_handler(self, record):
+                if record.levelno >= logging.ERROR:
+                    return self.handlers[logging.ERROR]
+                if record.levelno >= logging.INFO:
+                    return self.handlers[logging.INFO]
+                return self.handlers[logging.DEBUG]
+
             def emit(self, record):
                 """Emit a record to the appropriate log file(s)."""
                 try:
                     # Write to the specific level log file
-                    if record.levelno >= logging.ERROR:
-                        self.handlers[logging.ERROR].emit(record)
-                    elif record.levelno >= logging.INFO:
-                        self.handlers[logging.INFO].emit(record)
-                    else:  # DEBUG
-                        self.handlers[logging.DEBUG].emit(record)
+                    self._level_handler(record).emit(record)
 
                     # Always write to the all_operations.log
                     self.handlers["all"].emit(record)
                 except Exception:
                     self.handleError(record)
 
+            def emit_batch(self, records):
+                """Write queued records with one flush per file (queue mode)."""
+                by_file = {}
+                for record in records:
+                    if not self.filter(record):
+                        continue
+                    by_file.setdefault(self._level_handler(record), []).append(record)
+                    by_file.setdefault(self.handlers["all"], []).append(record)
+                for handler, file_records in by_file.items():
+                    handler.acquire()
+                    try:
+                        for record in file_records:
+                            try:
+                                if handler.shouldRollover(record):
+                                    handler.doRollover()
+                                handler.stream.write(
+                                    handler.format(record) + handler.terminator
+                                )
+                            except Exception:
+                                self.handleError(record)
+                        handler.flush()
+                    finally:
+                        handler.release()
+
             def close(self):
                 """Close all file handlers."""
                 for handler in self.handlers.values():
@@ -228,6 +677,20 @@ class URLMetadataLogger:
 
         return LevelBasedFileHandler(self.log_dir, log_prefix)
 
+    def flush(self, timeout: float = 5.0) -> None:
+        """Wait until queued records are on disk (no-op when synchronous)."""
+        if self.listener is not None:
+            self.listener.flush(timeout)
+
+    def close(self) -> None:
+        """Stop the background writer after draining it."""
+        if self.listener is not None:
+            self.listener.stop()
+
+    def get_queue_stats(self) -> Optional[Dict[str, Any]]:
+        """Queue depth and dropped record counts, or None when synchronous."""
+        return self.listener.get_stats() if self.listener is not None else None
+
     @staticmethod
     def generate_correlation_id() -> str:
         """Generate a new correlation ID."""
@@ -236,29 +699,31 @@ class URLMetadataLogger:
     @staticmethod
     @contextmanager
     def correlation_context(correlation_id: Optional[str] = None):
-        """Context manager for setting correlation ID."""
+        """
+        Context manager for setting correlation ID.
+
+        Works the same in synchronous and ``async`` code: inside a coroutine
+        the ID applies to that task only and survives ``await``.
+        """
         if correlation_id is None:
             correlation_id = URLMetadataLogger.generate_correlation_id()
 
-        old_id = getattr(_thread_locals, "correlation_id", None)
-        _thread_locals.correlation_id = correlation_id
+        old_id = _correlation_id.get()
+        token = _correlation_id.set(correlation_id)
 
         try:
             yield correlation_id
         finally:
-            if old_id is not None:
-                _thread_locals.correlation_id = old_id
-            else:
-                delattr(_thread_locals, "correlation_id")
+            try:
+                _correlation_id.reset(token)
+            except ValueError:
+                # Exited in a different context than it was entered in
+                _correlation_id.set(old_id)
 
     @staticmethod
     def set_correlation_id(correlation_id: Optional[str]) -> None:
         """Set correlation ID outside of context manager (compat shim)."""
-        if correlation_id is None:
-            if hasattr(_thread_locals, "correlation_id"):
-                delattr(_thread_locals, "correlation_id")
-        else:
-            _thread_locals.correlation_id = correlation_id
+        _correlation_id.set(correlation_id)
 
     @staticmethod
     def get_logger(logger_type: str) -> logging.Logger:
@@ -506,10 +971,10 @@ generate_correlation_id = URLMetadataLogger.generate_correlation_id
 
 
 def set_correlation_id(correlation_id: Optional[str] = None) -> None:
-    """Set correlation ID globally for the current thread."""
+    """Set correlation ID for the current context (thread or asyncio task)."""
     URLMetadataLogger.set_correlation_id(correlation_id)
 
 
 def get_correlation_id() -> Optional[str]:
-    """Retrieve the current correlation ID for the current thread, if set."""
-    return getattr(_thread_locals, "correlation_id", None)
+    """Retrieve the current context's correlation ID, if set."""
+    return _correlation_id.get()
@@ -8,19 +8,35 @@ Enhanced with RFC 3986 compliance and security-focused validation to prevent
 injection attacks and ensure safe URL storage.
 """
 
+import http.client
 import ipaddress
+import logging
 import os
 import re
 import time
 import unicodedata
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Lock
-from typing import Any, Dict, List, Optional, Tuple
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from urllib.parse import quote, unquote, urlparse, urlunparse
 
 import requests
 
 from .config import Config
+from .lru_cache import ShardedLRUCache
+from .ssrf_guard import HostResolver, IPRangeMatcher, find_blocked_address
+
+try:  # shared per process, whichever path this module was imported by
+    from btc_max_knowledge_agent.utils.executors import get_executor
+    from btc_max_knowledge_agent.utils.host_health import host_health_tracker, host_of
+    from btc_max_knowledge_agent.utils.log_sampling import log_sampler
+    from btc_max_knowledge_agent.utils.persistent_url_cache import (
+        get_persistent_url_cache,
+    )
+except ImportError:  # pragma: no cover
+    from .executors import get_executor
+    from .host_health import host_health_tracker, host_of
+    from .log_sampling import log_sampler
+    from .persistent_url_cache import get_persistent_url_cache
 
 
 # Simple logging placeholders for test compatibility
@@ -60,12 +76,39 @@ DANGEROUS_SCHEMES = {
 }
 ALLOWED_SCHEMES = {"http", "https"}
 
+# Status codes meaning "this server does not do HEAD", retried with GET by
+# the accessibility checkers that fall back
+HEAD_UNSUPPORTED_STATUSES = frozenset({405, 501})
+
+
+def is_server_disconnect(error: BaseException) -> bool:
+    """True if the server closed the connection without sending a response.
+
+    The other case in which a HEAD request is worth retrying with GET;
+    ``requests`` wraps the underlying error in its args.
+    """
+    pending = [error]
+    while pending:
+        current = pending.pop()
+        if isinstance(current, http.client.RemoteDisconnected):
+            return True
+        pending.extend(
+            arg
+            for arg in getattr(current, "args", ())
+            if isinstance(arg, BaseException)
+        )
+    return False
+
+
 # Configurable via environment variables with sensible defaults
 # NOTE: MAX_URL_LENGTH is used as an EXCLUSIVE upper bound - URLs with length
 # greater than or equal to this value are considered invalid. This means the
 # actual maximum allowed URL length is (MAX_URL_LENGTH - 1).
 MAX_URL_LENGTH = int(os.getenv("MAX_URL_LENGTH", "2048"))
 CACHE_TTL = int(os.getenv("URL_CACHE_TTL", "3600"))  # 1 hour in seconds
+VALIDATION_CACHE_SIZE = int(os.getenv("URL_VALIDATION_CACHE_SIZE", "10000"))
+VALIDATION_CACHE_SHARDS = int(os.getenv("URL_VALIDATION_CACHE_SHARDS", "16"))
+CANONICAL_CACHE_SIZE = int(os.getenv("URL_CANONICAL_CACHE_SIZE", "20000"))
 DEFAULT_MAX_WORKERS = int(os.getenv("DEFAULT_MAX_WORKERS", "10"))
 
 # Private IP ranges for security validation
@@ -79,6 +122,11 @@ PRIVATE_IP_RANGES = [
     ipaddress.ip_network("fc00::/7"),
     ipaddress.ip_network("fe80::/10"),
 ]
+# Sorted, merged integer intervals of PRIVATE_IP_RANGES for bisect lookups
+PRIVATE_IP_MATCHER = IPRangeMatcher(PRIVATE_IP_RANGES)
+
+# Shared DNS cache so a batch of URLs on one host is resolved once
+_host_resolver = HostResolver()
 
 # Regular expressions for URL validation and parsing
 # Matches protocol schemes like 'http:', 'https:', 'ftp:', etc.
@@ -105,12 +153,34 @@ HTTP_URL_PATTERN = r"^https?://"
 # ---------------------------------------------------------------------------
 
 
+# Successful validations and sanitizations are sampled (see log_sampling);
+# failures and the first record of each validation type are always logged.
+_validation_summary_logger = logging.getLogger("url_metadata.validation")
+_sanitization_summary_logger = logging.getLogger("url_metadata.sanitization")
+
+
 def log_validation(*args, **kwargs):  # noqa: D401
     """Proxy to ``url_metadata_logger.log_validation`` (test-friendly)."""
+    is_valid = args[1] if len(args) > 1 else kwargs.get("is_valid", False)
+    validation_type = args[2] if len(args) > 2 else kwargs.get("validation_type")
+    if not log_sampler.should_log(
+        "url_validation",
+        validation_type,
+        error=not is_valid,
+        logger=_validation_summary_logger,
+    ):
+        return None
     return _url_logger.log_validation(*args, **kwargs)
 
 
 def log_sanitization(*args, **kwargs):  # noqa: D401
+    changes = args[2] if len(args) > 2 else kwargs.get("changes_made")
+    if not log_sampler.should_log(
+        "url_sanitization",
+        "changed" if changes else "unchanged",
+        logger=_sanitization_summary_logger,
+    ):
+        return None
     return _url_logger.log_sanitization(*args, **kwargs)
 
 
@@ -143,9 +213,12 @@ def is_private_ip(url: str) -> bool:
     return not is_secure_url(url)
 
 
-# Cache for URL validation results
-_validation_cache: Dict[str, Tuple[bool, float]] = {}
-_cache_lock = Lock()
+# Cache for URL validation results (bounded LRU with TTL, sharded locks)
+_validation_cache = ShardedLRUCache(
+    max_entries=VALIDATION_CACHE_SIZE,
+    ttl_seconds=CACHE_TTL,
+    shards=VALIDATION_CACHE_SHARDS,
+)
 
 
 def is_url_valid(url: str) -> bool:
@@ -282,21 +355,18 @@ def is_secure_url(url: str) -> bool:
                     return False
             else:
                 # Check for other private IP ranges
-                for private_range in PRIVATE_IP_RANGES:
-                    if ip in private_range:
-                        validation_details["error"] = f"private_ip: {ip}"
-                        duration_ms = (time.time() - start_time) * 1000
-                        log_validation(
-                            url,
-                            False,
-                            "security_check",
-                            details=validation_details,
-                            duration_ms=duration_ms,
-                        )
-                        record_validation(
-                            url, False, duration_ms, error_type="private_ip"
-                        )
-                        return False
+                if ip in PRIVATE_IP_MATCHER:
+                    validation_details["error"] = f"private_ip: {ip}"
+                    duration_ms = (time.time() - start_time) * 1000
+                    log_validation(
+                        url,
+                        False,
+                        "security_check",
+                        details=validation_details,
+                        duration_ms=duration_ms,
+                    )
+                    record_validation(url, False, duration_ms, error_type="private_ip")
+                    return False
                 # Extra safeguards – block unspecified (0.0.0.0/::), link-local, multicast etc.
                 if ip.is_unspecified or ip.is_multicast or ip.is_reserved:
                     validation_details["error"] = "unspecified_or_reserved_ip"
@@ -596,26 +666,116 @@ def sanitize_url_for_storage(url: str) -> Optional[str]:
     """
     if not url or not isinstance(url, str):
         return None
+    return canonicalize_url(url).normalized
+
+
+@dataclass(frozen=True)
+class CanonicalURL:
+    """
+    Memoized result of running a URL through the storage pipeline.
+
+    ``verdict`` is ``"valid"`` or the first pipeline step that rejected the
+    URL: ``"empty"``, ``"unsanitizable"``, ``"normalization_failed"``,
+    ``"insecure"`` or ``"invalid_format"``. ``scheme`` and ``host`` come from
+    the sanitized URL and are set whenever sanitization succeeded.
+    """
 
-    # First, apply basic sanitization
+    url: str
+    verdict: str
+    normalized: Optional[str] = None
+    scheme: Optional[str] = None
+    host: Optional[str] = None
+
+    @property
+    def is_valid(self) -> bool:
+        return self.verdict == "valid"
+
+
+# Canonicalization results keyed by (raw url, localhost policy); URL parsing
+# is pure, so entries never expire and are only evicted when the cache is full
+_canonical_cache = ShardedLRUCache(
+    max_entries=CANONICAL_CACHE_SIZE, shards=VALIDATION_CACHE_SHARDS
+)
+
+
+def canonicalize_url(url: str) -> CanonicalURL:
+    """
+    Sanitize, normalize and security-check a URL once and memoize the result.
+
+    This is the pipeline behind ``sanitize_url_for_storage``: ``sanitize_url``
+    → ``normalize_url_rfc3986`` → ``is_secure_url`` → ``validate_url_format``.
+    Repeated calls with the same string (across ingest, storage and query
+    formatting) are served from a bounded LRU cache instead of re-parsing
+    and re-running the regexes; validation is only logged on the first call.
+
+    Args:
+        url: The raw URL string
+
+    Returns:
+        CanonicalURL: Structured result with the normalized URL and verdict
+    """
+    if not url or not isinstance(url, str):
+        return CanonicalURL(url=str(url or ""), verdict="empty")
+
+    key = (url, bool(Config.ALLOW_LOCALHOST_URLS))
+    cached = _canonical_cache.get(key)
+    if cached is not None:
+        return cached
+
+    result = _canonicalize_uncached(url)
+    _canonical_cache.put(key, result)
+    return result
+
+
+def _canonicalize_uncached(url: str) -> CanonicalURL:
     sanitized = sanitize_url(url)
     if not sanitized:
-        return None
+        return CanonicalURL(url=url, verdict="unsanitizable")
+
+    try:
+        parsed = urlparse(sanitized)
+        scheme = parsed.scheme.lower() or None
+        host = parsed.hostname
+    except ValueError:
+        scheme = host = None
+
+    def reject(verdict: str) -> CanonicalURL:
+        return CanonicalURL(url=url, verdict=verdict, scheme=scheme, host=host)
 
     # Normalize according to RFC 3986
     normalized = normalize_url_rfc3986(sanitized)
     if not normalized:
-        return None
+        return reject("normalization_failed")
 
     # Security validation
     if not is_secure_url(normalized):
-        return None
+        return reject("insecure")
 
     # Final format validation
     if not validate_url_format(normalized):
-        return None
+        return reject("invalid_format")
+
+    return CanonicalURL(
+        url=url, verdict="valid", normalized=normalized, scheme=scheme, host=host
+    )
+
+
+def canonicalize_urls(urls: Iterable[str]) -> Dict[str, CanonicalURL]:
+    """
+    Canonicalize many URLs, processing each distinct string only once.
+
+    Args:
+        urls: URL strings, possibly with duplicates (e.g. one per chunk)
+
+    Returns:
+        Dict[str, CanonicalURL]: Result per distinct input URL, in first-seen order
+    """
+    return {url: canonicalize_url(url) for url in dict.fromkeys(urls)}
 
-    return normalized
+
+def get_canonical_cache_stats() -> Dict[str, Any]:
+    """Return hit/miss/eviction counters of the canonicalization cache."""
+    return _canonical_cache.get_stats()
 
 
 def validate_url_batch(
@@ -630,7 +790,8 @@ def validate_url_batch(
     Args:
         urls: List of URL strings to validate
         check_accessibility: Whether to check if URLs are accessible
-        max_workers: Maximum number of threads for parallel processing
+        max_workers: Maximum number of URLs processed concurrently on the
+            shared executor pool
 
     Returns:
         Dict[str, Dict[str, any]]: Dictionary mapping URLs to their
@@ -698,13 +859,23 @@ def validate_url_batch(
 
         return url, result
 
-    # Process URLs in parallel
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {executor.submit(validate_single_url, url): url for url in urls}
+    # Warm the in-process cache from the shared cache with one query per
+    # batch instead of one per URL
+    shared = get_persistent_url_cache()
+    if shared is not None and not check_accessibility:
+        for url, (is_valid, _) in shared.get_many("validation", urls).items():
+            _cache_shared_validation(shared, url, is_valid)
+
+    # Process URLs in parallel on the shared pool; max_workers caps how many
+    # of this batch's URLs are in flight at once
+    executor = get_executor("io" if check_accessibility else "cpu")
+    for _, future in executor.map_unordered(validate_single_url, urls, max_workers):
+        url, result = future.result()
+        results[url] = result
 
-        for future in as_completed(futures):
-            url, result = future.result()
-            results[url] = result
+    # Report what sampling held back for this batch right away rather than
+    # at the next summary interval
+    log_sampler.flush_summaries()
 
     return results
 
@@ -719,34 +890,55 @@ def _get_cached_validation(url: str) -> Optional[bool]:
     Returns:
         Optional[bool]: Cached validation result or None if not cached/expired
     """
-    with _cache_lock:
-        if url in _validation_cache:
-            is_valid, timestamp = _validation_cache[url]
-            if time.time() - timestamp < CACHE_TTL:
-                return is_valid
-            else:
-                # Remove expired entry
-                del _validation_cache[url]
-    return None
+    cached = _validation_cache.get(url)
+    if cached is None:
+        # Fall back to the cache shared with other workers and batch jobs
+        shared = get_persistent_url_cache()
+        if shared is not None:
+            hit = shared.get("validation", url)
+            if hit is not None:
+                cached = hit[0]
+                _cache_shared_validation(shared, url, cached)
+    return cached
+
+
+def _cache_shared_validation(shared, url: str, is_valid: bool) -> None:
+    # Failures keep the shared cache's shorter negative TTL locally
+    ttl = None if is_valid else shared.negative_ttl_seconds
+    _validation_cache.put(url, is_valid, ttl_seconds=ttl)
 
 
 def _cache_validation(url: str, is_valid: bool) -> None:
     """
-    Cache validation result with timestamp.
+    Cache validation result; the least recently used entry is evicted when full.
+
+    The result is also written to the persistent cross-process cache when
+    ``URL_PERSISTENT_CACHE_PATH`` is configured.
 
     Args:
         url: The URL that was validated
         is_valid: Validation result to cache
     """
-    with _cache_lock:
-        _validation_cache[url] = (is_valid, time.time())
+    _validation_cache.put(url, is_valid)
+    shared = get_persistent_url_cache()
+    if shared is not None:
+        shared.put("validation", url, is_valid)
+
+
+def get_validation_cache_stats() -> Dict[str, Any]:
+    """
+    Get URL validation cache statistics.
+
+    Returns:
+        Dict with hits, misses, evictions, expirations, hit_rate and size
+    """
+    return _validation_cache.get_stats()
 
-        # Limit cache size (simple FIFO eviction)
-        if len(_validation_cache) > 10000:
-            # Remove oldest 1000 entries
-            sorted_items = sorted(_validation_cache.items(), key=lambda x: x[1][1])
-            for key, _ in sorted_items[:1000]:
-                del _validation_cache[key]
+
+def clear_validation_cache() -> None:
+    """Remove all cached URL validation and canonicalization results."""
+    _validation_cache.clear()
+    _canonical_cache.clear()
 
 
 def validate_url_format(url: str) -> bool:
@@ -967,6 +1159,53 @@ def sanitize_url(url: str) -> Optional[str]:
         return None
 
 
+def find_private_address(host: Optional[str]) -> Optional[str]:
+    """
+    Resolve ``host`` (cached) and return the first private or reserved address.
+
+    Every address the name resolves to is checked, so a hostname with one
+    internal A/AAAA record is refused. Loopback follows
+    ``Config.ALLOW_LOCALHOST_URLS``. Set ``URL_RESOLVE_HOSTNAMES=false`` to
+    skip the lookup (IP literals are still checked).
+
+    Args:
+        host: Hostname or IP literal
+
+    Returns:
+        Optional[str]: The offending address, or None if the host is safe to
+            contact (or does not resolve)
+    """
+    if not host:
+        return None
+    if os.getenv("URL_RESOLVE_HOSTNAMES", "true").lower() != "true":
+        try:
+            ipaddress.ip_address(host.strip("[]"))
+        except ValueError:
+            return None
+    blocked = find_blocked_address(
+        host,
+        _host_resolver,
+        PRIVATE_IP_MATCHER,
+        allow_loopback=bool(Config.ALLOW_LOCALHOST_URLS),
+    )
+    return str(blocked) if blocked is not None else None
+
+
+def get_dns_cache_stats() -> Dict[str, Any]:
+    """Return hit/miss/expiration counters of the shared DNS cache."""
+    return _host_resolver.get_stats()
+
+
+def _record_host_response(url: str, status_code: int, duration_ms: float) -> None:
+    """Feed an HTTP response into the per-host health tracker (5xx = host failure)."""
+    if status_code >= 500:
+        host_health_tracker.record_failure(
+            host_of(url), f"HTTP {status_code}", duration_ms
+        )
+    else:
+        host_health_tracker.record_success(host_of(url), duration_ms)
+
+
 def _handle_accessibility_error(
     url: str, exception: Exception, start_time: float
 ) -> bool:
@@ -987,6 +1226,8 @@ def _handle_accessibility_error(
     if isinstance(exception, requests.exceptions.TooManyRedirects):
         error_type = "too_many_redirects"
         details = {"error": str(exception), "error_type": error_type}
+        # The host answered, it just redirects too much
+        host_health_tracker.record_success(host_of(url), duration_ms)
     elif isinstance(
         exception,
         (
@@ -998,6 +1239,13 @@ def _handle_accessibility_error(
     ):
         error_type = "request_failed"
         details = {"error": str(exception), "error_type": type(exception).__name__}
+        if isinstance(
+            exception,
+            (requests.exceptions.ConnectionError, requests.exceptions.Timeout),
+        ):
+            host_health_tracker.record_failure(
+                host_of(url), type(exception).__name__, duration_ms
+            )
     else:
         error_type = "unexpected_error"
         details = {"error": str(exception), "error_type": "unexpected_error"}
@@ -1083,6 +1331,54 @@ def check_url_accessibility(
         record_validation(url, False, 0, error_type="unsupported_scheme")
         return False
 
+    shared = get_persistent_url_cache()
+    if shared is not None:
+        cached = shared.get("accessibility", url)
+        if cached is not None:
+            return cached[0]
+
+    # Refuse hostnames whose DNS points at internal addresses (SSRF)
+    private_address = find_private_address(parsed.hostname)
+    if private_address:
+        log_validation(
+            url,
+            False,
+            "accessibility_check",
+            details={"error": f"private_ip: {private_address}"},
+            duration_ms=0,
+        )
+        record_validation(url, False, 0, error_type="private_ip")
+        return False
+
+    # Skip hosts that keep failing instead of paying the full timeout per URL
+    host = host_of(url)
+    if not host_health_tracker.allow_request(host):
+        log_validation(
+            url,
+            False,
+            "accessibility_check",
+            details={"error": "host_circuit_open", "host": host},
+            duration_ms=0,
+        )
+        record_validation(url, False, 0, error_type="host_unavailable")
+        return False
+
+    is_accessible = _probe_url_accessibility(
+        url, timeout, max_retries, max_redirects, _use_session
+    )
+    if shared is not None:
+        shared.put("accessibility", url, is_accessible)
+    return is_accessible
+
+
+def _probe_url_accessibility(
+    url: str,
+    timeout: float,
+    max_retries: int,
+    max_redirects: int,
+    _use_session: bool,
+) -> bool:
+    """Make the HEAD request for ``check_url_accessibility`` and record the result."""
     start_time = time.time()
 
     # For testing purposes, allow falling back to direct requests
@@ -1093,6 +1389,7 @@ def check_url_accessibility(
             )
             is_accessible = response.status_code < 400
             duration_ms = (time.time() - start_time) * 1000
+            _record_host_response(url, response.status_code, duration_ms)
 
             # Log the result
             details = {"status_code": response.status_code}
@@ -1146,6 +1443,7 @@ def check_url_accessibility(
 
         is_accessible = 200 <= response.status_code < 400
         duration_ms = (time.time() - start_time) * 1000
+        _record_host_response(url, response.status_code, duration_ms)
 
         # Log the result with detailed response info
         details = {
@@ -1308,12 +1606,15 @@ def check_urls_accessibility_parallel(
     Check accessibility of multiple URLs in parallel.
 
     This function uses threading to check multiple URLs concurrently,
-    significantly improving performance for batch operations.
+    significantly improving performance for batch operations. Each check
+    opens its own connection; for large batches prefer
+    ``async_url_checker.check_urls_accessibility_async``, which reuses
+    pooled connections.
 
     Args:
         urls: List of URLs to check
         timeout: Request timeout in seconds for each URL
-        max_workers: Maximum number of concurrent threads
+        max_workers: Maximum number of URLs checked concurrently
 
     Returns:
         Dict[str, bool]: Dictionary mapping URLs to their accessibility status
@@ -1336,13 +1637,11 @@ def check_urls_accessibility_parallel(
             )
             return url, False
 
-    # Process URLs in parallel
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {executor.submit(check_single_url, url): url for url in urls}
-
-        for future in as_completed(futures):
-            url, is_accessible = future.result()
-            results[url] = is_accessible
+    # Process URLs in parallel on the shared io pool
+    executor = get_executor("io")
+    for _, future in executor.map_unordered(check_single_url, urls, max_workers):
+        url, is_accessible = future.result()
+        results[url] = is_accessible
 
     return results
 
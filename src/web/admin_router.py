@@ -14,6 +14,11 @@ from pydantic import BaseModel
 from .admin_auth import get_admin_authenticator, verify_admin_access
 from .rate_limiter import get_session_rate_limiter
 
+try:
+    from btc_max_knowledge_agent.utils import metrics_registry
+except ImportError:  # pragma: no cover
+    from ..utils import metrics_registry
+
 logger = logging.getLogger(__name__)
 
 # Create admin router
@@ -29,6 +34,34 @@ admin_router = APIRouter(
 )
 
 
+def _server_metrics(prefix: str = ""):
+    """Registry values whose name starts with ``prefix`` (namespace omitted).
+
+    Merged across gunicorn workers in multi-process mode, unlike the
+    per-worker service objects.
+    """
+    registry = metrics_registry.REGISTRY
+    full_prefix = registry._full_name(prefix)
+    return {
+        name: values
+        for name, values in registry.snapshot().items()
+        if name.startswith(full_prefix)
+    }
+
+
+def _server_totals(prefix: str):
+    """``_server_metrics(prefix)`` as ``{name: value}`` without the namespace.
+
+    Labelled families map each label string to its value.
+    """
+    strip = len(metrics_registry.REGISTRY._full_name(""))
+    totals = {}
+    for name, family in _server_metrics(prefix).items():
+        series = family["series"]
+        totals[name[strip:]] = series[""] if list(series) == [""] else series
+    return totals
+
+
 class AdminLoginRequest(BaseModel):
     username: str
     password: str
@@ -112,7 +145,9 @@ async def get_session_stats():
         logger.info("Admin accessed session statistics")
 
         return {
-            "session_statistics": stats,
+            "session_statistics": _server_totals("sessions_"),
+            # Session ages are only known to the worker holding the sessions
+            "worker_session_statistics": stats,
             "timestamp": time.time(),
             "admin_access": True,
         }
@@ -168,7 +203,8 @@ async def get_rate_limit_stats():
 
         actual_limits = rate_limiter.get_configured_limits()
         return {
-            "rate_limit_stats": stats,
+            "rate_limit_stats": _server_totals("rate_limit_"),
+            "worker_rate_limit_stats": stats,
             "timestamp": time.time(),
             "limits": actual_limits,
             "admin_access": True,
@@ -248,6 +284,23 @@ async def force_delete_session(session_id: str):
         )
 
 
+@admin_router.get("/metrics")
+async def get_server_metrics():
+    """All registry metrics as JSON, whole-server when multi-process (admin only)"""
+    try:
+        return {
+            "metrics": _server_metrics(),
+            "multiprocess": metrics_registry.multiprocess_enabled(),
+            "timestamp": time.time(),
+            "admin_access": True,
+        }
+    except Exception as e:
+        logger.error(f"Failed to get server metrics for admin: {str(e)}")
+        raise HTTPException(
+            status_code=500, detail=f"Failed to get server metrics: {str(e)}"
+        )
+
+
 @admin_router.get("/auth/stats")
 async def get_admin_auth_stats():
     """Get admin authentication statistics"""
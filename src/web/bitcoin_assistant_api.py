@@ -1,7 +1,7 @@
 try:
     from fastapi import FastAPI
     from fastapi import Request, Body, APIRouter
-    from fastapi.responses import JSONResponse
+    from fastapi.responses import JSONResponse, Response
 except Exception:
     # Minimal stubs if FastAPI not installed
     class FastAPI:  # type: ignore
@@ -30,6 +30,12 @@ except Exception:
             super().__init__(content)
             self.status_code = status_code
 
+    class Response:  # type: ignore
+        def __init__(self, content="", status_code=200, media_type=None):
+            self.body = content
+            self.status_code = status_code
+            self.media_type = media_type
+
     class APIRouter:  # type: ignore
         def __init__(self):
             self.routes = []
@@ -41,6 +47,9 @@ except Exception:
 
             return decorator
 
+        def get(self, path: str):
+            return self.post(path)
+
 
 from typing import Any, Dict, Optional
 
@@ -54,6 +63,18 @@ from src.security.prompt_processor import (
     secure_preprocess as secure_preprocess_prompt,  # type: ignore
 )
 
+try:
+    from btc_max_knowledge_agent.utils.metrics_registry import render_metrics
+except ImportError:  # pragma: no cover
+    from src.utils.metrics_registry import render_metrics  # type: ignore
+
+try:
+    from btc_max_knowledge_agent.utils.url_metadata_logger import (
+        correlation_context,
+    )
+except ImportError:  # pragma: no cover
+    from src.utils.url_metadata_logger import correlation_context  # type: ignore
+
 
 app = FastAPI()
 router = APIRouter()  # type: ignore
@@ -84,6 +105,28 @@ def _get_request_id(req: Request) -> Optional[str]:  # type: ignore
     return None
 
 
+REQUEST_ID_HEADER = "X-Request-ID"
+
+
+async def correlation_middleware(request: Request, call_next):  # type: ignore
+    """
+    Run each request in its own correlation context.
+
+    The ID comes from the ``X-Request-ID`` header (or is generated), becomes
+    ``request.state.request_id`` and is echoed on the response. Because it
+    is held in a context variable, every log record written while handling
+    the request carries it, across ``await`` and into executor work, without
+    being passed down by hand.
+    """
+    header_id = request.headers.get(REQUEST_ID_HEADER)
+    request_id = header_id if header_id and len(header_id) <= 128 else None
+    with correlation_context(request_id) as correlation_id:
+        request.state.request_id = correlation_id
+        response = await call_next(request)
+    response.headers[REQUEST_ID_HEADER] = correlation_id
+    return response
+
+
 # Define a minimal payload shape without pydantic to keep import-light
 # Clients send: {"text": "..."} and optionally {"top_k": 5}
 # Router is always defined when APIRouter is importable or stubbed.
@@ -161,8 +204,18 @@ async def chat_endpoint(  # type: ignore[no-redef]
     # Do not include system policy wrapper contents in response
     return {"result": results, "request_id": request_id}
 
+
+@router.get("/metrics")  # type: ignore[misc]
+async def metrics_endpoint(request: Request):  # type: ignore[name-defined]
+    """Prometheus scrape endpoint; OpenMetrics when the Accept header asks."""
+    headers = getattr(request, "headers", {})
+    accept = headers.get("accept") if hasattr(headers, "get") else None
+    body, content_type = render_metrics(accept)
+    return Response(content=body, media_type=content_type)
+
 # Mount router if FastAPI real
 try:
+    app.middleware("http")(correlation_middleware)  # type: ignore[attr-defined]
     app.include_router(router)  # type: ignore[attr-defined]
 except Exception as e:
     # Do not fail silently; log the exception to aid debugging in non-FastAPI environments
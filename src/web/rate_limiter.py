@@ -1,5 +1,18 @@
 from typing import Dict
 
+try:
+    from btc_max_knowledge_agent.utils.metrics_registry import REGISTRY
+except ImportError:  # pragma: no cover
+    from ..utils.metrics_registry import REGISTRY
+
+_DECISIONS = REGISTRY.counter(
+    "rate_limit_decisions_total", "Rate limiter decisions", ["result"]
+)
+_ALLOWED = _DECISIONS.labels("allowed")
+_REJECTED = _DECISIONS.labels("rejected")
+_TRACKED_KEYS = REGISTRY.gauge("rate_limit_tracked_keys", "Keys held by rate limiters")
+
+
 class RateLimiter:
     def __init__(self, limit: int = 10) -> None:
         self.limit = limit
@@ -7,8 +20,12 @@ class RateLimiter:
     def allow(self, key: str) -> bool:
         c = self._count.get(key, 0)
         if c >= self.limit:
+            _REJECTED.inc()
             return False
+        if not c:
+            _TRACKED_KEYS.inc()
         self._count[key] = c + 1
+        _ALLOWED.inc()
         return True
     def stats(self) -> Dict[str, int]:
         return dict(self._count)
@@ -14,6 +14,17 @@ import time
 from dataclasses import dataclass, field
 from typing import Any, Dict, Optional, Tuple, List, Callable
 
+try:
+    from btc_max_knowledge_agent.utils.metrics_registry import REGISTRY
+except ImportError:  # pragma: no cover
+    from ..utils.metrics_registry import REGISTRY
+
+_SESSIONS_ACTIVE = REGISTRY.gauge("sessions_active", "Sessions currently held")
+_SESSIONS_CREATED = REGISTRY.counter("sessions_created_total", "Sessions created")
+_SESSIONS_EXPIRED = REGISTRY.counter(
+    "sessions_expired_total", "Sessions removed because their TTL elapsed"
+)
+
 
 @dataclass
 class SessionData:
@@ -86,7 +97,11 @@ class SessionManager:
                 ),
                 data=dict(data) if data else {},
             )
+            replaced = self._sessions.get(session_id) is not None
             self._sessions[session_id] = sess
+            _SESSIONS_CREATED.inc()
+            if not replaced:
+                _SESSIONS_ACTIVE.inc()
             return sess
 
     def get_session(self, session_id: str) -> Optional[Session]:
@@ -96,7 +111,7 @@ class SessionManager:
                 return None
             if sess.is_expired():
                 # Lazy cleanup on access
-                del self._sessions[session_id]
+                self._expire(session_id)
                 return None
             sess.touch()
             return sess
@@ -109,7 +124,7 @@ class SessionManager:
             if not sess:
                 return False
             if sess.is_expired():
-                del self._sessions[session_id]
+                self._expire(session_id)
                 return False
             if data:
                 sess.data.update(data)
@@ -118,7 +133,10 @@ class SessionManager:
 
     def remove_session(self, session_id: str) -> bool:
         with self._lock:
-            return self._sessions.pop(session_id, None) is not None
+            removed = self._sessions.pop(session_id, None) is not None
+            if removed:
+                _SESSIONS_ACTIVE.dec()
+            return removed
 
     # Semantic alias used by some code/tests
     def end_session(self, session_id: str) -> bool:
@@ -141,7 +159,7 @@ class SessionManager:
             alive: List[Tuple[str, Session]] = []
             for sid, sess in session_items:
                 if sess.is_expired(now):
-                    del self._sessions[sid]
+                    self._expire(sid)
                     continue
                 alive.append((sid, sess))
 
@@ -199,9 +217,15 @@ class SessionManager:
                 if sess.is_expired(now)
             ]
             for sid in to_delete:
-                del self._sessions[sid]
+                self._expire(sid)
             return len(to_delete)
 
+    def _expire(self, session_id: str) -> None:
+        # Caller holds self._lock
+        del self._sessions[session_id]
+        _SESSIONS_ACTIVE.dec()
+        _SESSIONS_EXPIRED.inc()
+
 
 # Simple module-level singleton accessor expected by tests
 _default_session_manager: Optional[SessionManager] = None
@@ -171,12 +171,27 @@ def _stable_env(monkeypatch: pytest.MonkeyPatch) -> None:
         "TEST_ADMIN_HASH_SALT": "tests-default-salt",
         # Placeholders for network-sensitive tests which should be mocked
         "BTC_MAX_KNOWLEDGE_AGENT_ENV": "test",
+        # Keep SSRF hostname checks from doing real DNS lookups
+        "URL_RESOLVE_HOSTNAMES": "false",
     }
     for key, val in defaults.items():
         if os.environ.get(key) is None:
             monkeypatch.setenv(key, val)
 
 
+@pytest.fixture(autouse=True)
+def _reset_host_health() -> Generator[None, None, None]:
+    """
+    Per-host circuit state is process-global; reset it after each test so
+    mocked connection failures in one test cannot short-circuit URL checks
+    in the next. Every URL checker imports the tracker from this one module.
+    """
+    yield
+    module = sys.modules.get("btc_max_knowledge_agent.utils.host_health")
+    if module is not None:
+        module.host_health_tracker.reset()
+
+
 # --------------------------------------------------------------------------------------
 # Asyncio/AnyIO alignment
 # --------------------------------------------------------------------------------------
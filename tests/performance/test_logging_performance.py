@@ -17,6 +17,9 @@ from btc_max_knowledge_agent.utils.optimized_logging import (
     log_validation_optimized,
 )
 from btc_max_knowledge_agent.utils.url_metadata_logger import (
+    ORJSON_AVAILABLE,
+    FastJsonFormatter,
+    JsonFormatter,
     URLMetadataLogger,
     log_validation,
 )
@@ -303,6 +306,64 @@ class TestLoggingPerformance:
         assert url_time < 1.0, "URL truncation taking too long"
         assert query_time < 1.0, "Query truncation taking too long"
 
+    @pytest.mark.performance
+    def test_fast_json_formatter_performance(self):
+        """Compare the cached-prefix JSON formatter with JsonFormatter."""
+        import json
+
+        records = []
+        for i in range(2000):
+            record = logging.LogRecord(
+                "url_metadata.validation",
+                logging.INFO,
+                __file__,
+                10 + i % 5,
+                "URL validation succeeded: %s",
+                ("url_format",),
+                None,
+                func="log_validation",
+            )
+            record.correlation_id = f"req-{i}"
+            record.extra_fields = {
+                "operation": "validation",
+                "url": f"https://example.com/articles/{i}",
+                "is_valid": True,
+                "validation_type": "url_format",
+                "duration_ms": i * 0.25,
+                "details": {"attempt": i % 3, "checks": ["scheme", "host"]},
+            }
+            records.append(record)
+
+        old_formatter = JsonFormatter()
+        new_formatter = FastJsonFormatter()
+
+        # Same content apart from the added static fields and clock source
+        old = json.loads(old_formatter.format(records[0]))
+        new = json.loads(new_formatter.format(records[0]))
+        assert new["service"] and new["host"]
+        for key in ("timestamp", "service", "host"):
+            old.pop(key, None)
+            new.pop(key)
+        assert new == old
+
+        def best_of(formatter, rounds=5):
+            timings = []
+            for _ in range(rounds):
+                start_time = time.perf_counter()
+                for record in records:
+                    formatter.format(record)
+                timings.append(time.perf_counter() - start_time)
+            return min(timings)
+
+        old_time = best_of(old_formatter)
+        new_time = best_of(new_formatter)
+
+        print(f"\nJsonFormatter: {old_time * 1e6 / len(records):.2f}us/record")
+        print(f"FastJsonFormatter: {new_time * 1e6 / len(records):.2f}us/record")
+        print(f"orjson available: {ORJSON_AVAILABLE}")
+
+        assert new_time < old_time, "Expected the fast formatter to be faster"
+
 
 @pytest.mark.performance
 class TestLoggingMemoryLeaks:
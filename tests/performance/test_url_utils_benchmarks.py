@@ -0,0 +1,316 @@
+"""
+Micro-benchmarks for the URL utilities on the ingest and query paths.
+
+Each benchmark reports throughput (ops/sec; for the batch and list helpers
+one op is one whole batch) and the peak memory allocated per call (traced
+by ``tracemalloc``) over realistic URL corpora: plain article links, long
+tracking query strings, IDN hosts and percent-encoded paths. Results are
+compared with the stored baselines in ``baselines/url_utils_benchmarks.json``:
+
+- throughput is stored relative to a fixed pure-Python calibration loop
+  run on the same machine, so baselines carry over between machines; it
+  may not fall below ``BENCHMARK_TOLERANCE`` (default 0.25) of the
+  baseline, which catches order-of-magnitude regressions;
+- allocation per call may not exceed twice the baseline (plus 1 KiB).
+
+Refresh the baselines after an intentional change with::
+
+    UPDATE_BENCHMARK_BASELINES=1 pytest tests/performance/test_url_utils_benchmarks.py
+
+or print a report without asserting anything with::
+
+    python tests/performance/test_url_utils_benchmarks.py
+"""
+
+import json
+import os
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import pytest
+
+from btc_max_knowledge_agent.utils import url_utils
+from btc_max_knowledge_agent.utils.result_formatter import QueryResultFormatter
+from btc_max_knowledge_agent.utils.url_utils import (
+    canonicalize_url,
+    normalize_url_rfc3986,
+    sanitize_url_for_storage,
+    validate_url_batch,
+    validate_url_format,
+)
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "url_utils_benchmarks.json"
+MIN_TIME_SECONDS = float(os.getenv("BENCHMARK_MIN_TIME", "0.2"))
+
+# ---------------------------------------------------------------------------
+# Corpora
+# ---------------------------------------------------------------------------
+PLAIN_URLS = [
+    "https://bitcoin.org/bitcoin.pdf",
+    "https://bitcoin.org/en/developer-guide",
+    "https://github.com/bitcoin/bips/blob/master/bip-0032.mediawiki",
+    "https://lightning.network/lightning-network-paper.pdf",
+    "https://www.coindesk.com/markets/2024/01/10/sec-approves-spot-bitcoin-etfs/",
+    "https://bitcoinmagazine.com/technical/taproot-explained",
+    "http://nakamotoinstitute.org/bitcoin/",
+    "bitcoin.org/en/how-it-works",
+    "//developer.bitcoin.org/reference/rpc/",
+    "https://Mempool.Space/api/v1/fees/recommended",
+]
+
+LONG_QUERY_URLS = [
+    "https://www.coindesk.com/policy/2024/03/01/article/?"
+    + "&".join(f"utm_param{i}=value{i}_{'x' * 20}" for i in range(40)),
+    "https://news.google.com/rss/articles/CBMi"
+    + "A" * 600
+    + "?oc=5&hl=en-US&gl=US&ceid=US:en",
+    "https://example.com/search?q="
+    + "+".join(["bitcoin", "halving", "supply", "schedule"] * 50)
+    + "&page=2&sort=desc",
+]
+
+IDN_URLS = [
+    "https://bücher.example/straße/bitcoin",
+    "https://例え.テスト/ビットコイン",
+    "https://xn--bcher-kva.example/stra%C3%9Fe",
+    "https://münchen.de/kryptowährung?sprache=de",
+    "https://пример.рф/биткоин",
+]
+
+PERCENT_ENCODED_URLS = [
+    "https://example.com/a%20path/with%20spaces/file%2Ename.pdf",
+    "https://example.com/%7Euser/%E2%82%BF/price?currency=%E2%82%AC",
+    "https://example.com/docs/%2e%2e/%2E%2E/etc?redirect=https%3A%2F%2Fevil.test",
+    "https://EXAMPLE.com:443/./a/../b/%41%42%43?x=%3d%3D",
+]
+
+REJECTED_URLS = [
+    "javascript:alert(document.cookie)",
+    "http://192.168.1.1/admin",
+    "ftp://files.example.com/wallet.dat",
+    "not a url at all",
+    "https://" + "a" * 2100 + ".com",
+]
+
+CORPUS = PLAIN_URLS + LONG_QUERY_URLS + IDN_URLS + PERCENT_ENCODED_URLS + REJECTED_URLS
+
+SEARCH_RESULTS = [
+    {
+        "title": f"Result {i}",
+        "content": "Bitcoin is a peer-to-peer electronic cash system.",
+        "source": f"source{i % 4}",
+        "url": CORPUS[i % len(CORPUS)],
+        "published": "2024-01-01",
+    }
+    for i in range(20)
+]
+
+
+# ---------------------------------------------------------------------------
+# Harness
+# ---------------------------------------------------------------------------
+@dataclass
+class BenchmarkResult:
+    """Throughput and allocation figures for one benchmark."""
+
+    name: str
+    calls: int
+    ops_per_sec: float
+    peak_alloc_bytes_per_call: float
+
+
+def run_benchmark(
+    name: str,
+    func: Callable[[Any], Any],
+    inputs: Sequence[Any],
+    setup: Optional[Callable[[], None]] = None,
+    min_time: float = MIN_TIME_SECONDS,
+) -> BenchmarkResult:
+    """
+    Call ``func`` on every input repeatedly for at least ``min_time`` seconds.
+
+    ``setup`` runs (untimed) before each pass over ``inputs``, e.g. to clear
+    caches for a cold-path benchmark.
+    """
+    for item in inputs:  # warm-up pass (imports, regex compilation)
+        func(item)
+
+    calls = 0
+    elapsed = 0.0
+    while elapsed < min_time:
+        if setup:
+            setup()
+        start = time.perf_counter()
+        for item in inputs:
+            func(item)
+        elapsed += time.perf_counter() - start
+        calls += len(inputs)
+
+    if setup:
+        setup()
+    total_peak = 0
+    for item in inputs:
+        # Restarting clears the peak (tracemalloc.reset_peak needs 3.9)
+        tracemalloc.start()
+        try:
+            func(item)
+            total_peak += tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return BenchmarkResult(
+        name=name,
+        calls=calls,
+        ops_per_sec=calls / elapsed,
+        peak_alloc_bytes_per_call=total_peak / len(inputs),
+    )
+
+
+def _clear_caches() -> None:
+    url_utils.clear_validation_cache()
+
+
+def _calibration(url: str) -> int:
+    # Fixed string and dict work the URL helpers are made of; its speed
+    # stands in for the speed of the machine
+    counts: Dict[str, int] = {}
+    for part in url.lower().replace("?", "/").split("/"):
+        counts[part] = counts.get(part, 0) + len(part)
+    return sum(counts.values())
+
+
+CALIBRATION = "_calibration"
+
+
+BENCHMARKS: Dict[str, Dict[str, Any]] = {
+    "validate_url_format": {"func": validate_url_format, "inputs": CORPUS},
+    "normalize_url_rfc3986": {"func": normalize_url_rfc3986, "inputs": CORPUS},
+    "sanitize_url_for_storage_cached": {
+        "func": sanitize_url_for_storage,
+        "inputs": CORPUS,
+    },
+    "canonicalize_url_cold": {
+        "func": canonicalize_url,
+        "inputs": CORPUS,
+        "setup": _clear_caches,
+    },
+    "validate_url_batch_cold": {
+        "func": lambda urls: validate_url_batch(urls, max_workers=4),
+        "inputs": [CORPUS],
+        "setup": _clear_caches,
+    },
+    "formatter_validate_url": {
+        "func": QueryResultFormatter._validate_url,
+        "inputs": CORPUS,
+    },
+    "formatter_source_attribution": {
+        "func": lambda url: QueryResultFormatter._format_source_attribution(
+            "bitcoin.org", url, "2024-01-01"
+        ),
+        "inputs": CORPUS,
+    },
+    "formatter_extract_unique_sources": {
+        "func": QueryResultFormatter._extract_unique_sources,
+        "inputs": [SEARCH_RESULTS],
+    },
+}
+
+
+def run_all() -> List[BenchmarkResult]:
+    # Calibrate before and after, so drift during the run averages out
+    results = [run_benchmark(CALIBRATION, _calibration, CORPUS)]
+    results.extend(run_benchmark(name, **spec) for name, spec in BENCHMARKS.items())
+    results.append(run_benchmark(CALIBRATION, _calibration, CORPUS))
+    return results
+
+
+def relative_throughput(results: List[BenchmarkResult]) -> Dict[str, float]:
+    """Each benchmark's ops/sec divided by the calibration loop's."""
+    calibration = [r.ops_per_sec for r in results if r.name == CALIBRATION]
+    reference = sum(calibration) / len(calibration)
+    return {r.name: r.ops_per_sec / reference for r in results if r.name != CALIBRATION}
+
+
+def load_baselines() -> Dict[str, Dict[str, float]]:
+    if not BASELINE_PATH.exists():
+        return {}
+    with open(BASELINE_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baselines(results: List[BenchmarkResult]) -> None:
+    BASELINE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    relative = relative_throughput(results)
+    data = {
+        r.name: {
+            "relative_throughput": round(relative[r.name], 4),
+            "peak_alloc_bytes_per_call": round(r.peak_alloc_bytes_per_call, 1),
+        }
+        for r in results
+        if r.name != CALIBRATION
+    }
+    with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def format_report(results: List[BenchmarkResult]) -> str:
+    baselines = load_baselines()
+    relative = relative_throughput(results)
+    lines = [f"{'benchmark':36} {'ops/sec':>12} {'vs base':>8} {'alloc B/call':>13}"]
+    for r in results:
+        base = baselines.get(r.name, {}).get("relative_throughput")
+        ratio = f"{relative[r.name] / base:7.2f}x" if base else "      - "
+        lines.append(
+            f"{r.name:36} {r.ops_per_sec:12.0f} {ratio:>8} "
+            f"{r.peak_alloc_bytes_per_call:13.0f}"
+        )
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+@pytest.fixture(scope="module")
+def benchmark_results():
+    results = run_all()
+    print("\n" + format_report(results))
+    if os.getenv("UPDATE_BENCHMARK_BASELINES"):
+        save_baselines(results)
+    return results
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("name", list(BENCHMARKS))
+def test_url_benchmark_against_baseline(benchmark_results, name):
+    result = next(r for r in benchmark_results if r.name == name)
+    baseline = load_baselines().get(name)
+    if baseline is None or "relative_throughput" not in baseline:
+        pytest.skip(f"No stored baseline for {name}")
+
+    tolerance = float(os.getenv("BENCHMARK_TOLERANCE", "0.25"))
+    relative = relative_throughput(benchmark_results)[name]
+    assert relative >= baseline["relative_throughput"] * tolerance, (
+        f"{name}: {relative:.4f}x the calibration loop's throughput is below "
+        f"{tolerance:.0%} of the baseline {baseline['relative_throughput']:.4f}x"
+    )
+    max_alloc = baseline["peak_alloc_bytes_per_call"] * 2 + 1024
+    assert result.peak_alloc_bytes_per_call <= max_alloc, (
+        f"{name}: {result.peak_alloc_bytes_per_call:.0f} bytes/call allocated, "
+        f"baseline {baseline['peak_alloc_bytes_per_call']:.0f}"
+    )
+
+
+@pytest.mark.performance
+def test_memoized_path_is_faster_than_cold_path(benchmark_results):
+    relative = relative_throughput(benchmark_results)
+    warm = relative["sanitize_url_for_storage_cached"]
+    cold = relative["canonicalize_url_cold"]
+    assert warm > cold * 2
+
+
+if __name__ == "__main__":
+    print(format_report(run_all()))
@@ -0,0 +1,232 @@
+"""
+Unit tests for resumable, checkpointed collection runs.
+"""
+
+import json
+from contextlib import contextmanager
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from knowledge.collection_checkpoint import CollectionCheckpoint
+from knowledge.data_collector import BitcoinDataCollector
+
+
+@pytest.fixture
+def checkpoint_path(tmp_path):
+    return tmp_path / "checkpoint.jsonl"
+
+
+class TestCollectionCheckpoint:
+    def test_documents_and_progress_survive_reopen(self, checkpoint_path):
+        checkpoint = CollectionCheckpoint(checkpoint_path, fsync=False)
+        checkpoint.record_document("rss", {"id": "rss_0"}, item="https://a.com/1")
+        checkpoint.mark_item_done("rss", "https://a.com/feed")
+        checkpoint.record_document("dapp", {"id": "dapp_basics"})
+        checkpoint.mark_source_complete("dapp")
+
+        reopened = CollectionCheckpoint(checkpoint_path, fsync=False)
+        assert reopened.run_id == checkpoint.run_id
+        assert reopened.is_source_complete("dapp")
+        assert not reopened.is_source_complete("rss")
+        assert reopened.is_item_done("rss", "https://a.com/1")
+        assert reopened.is_item_done("rss", "https://a.com/feed")
+        assert reopened.source_documents("rss") == [{"id": "rss_0"}]
+
+    def test_torn_trailing_record_is_ignored(self, checkpoint_path):
+        checkpoint = CollectionCheckpoint(checkpoint_path, fsync=False)
+        checkpoint.record_document("rss", {"id": "rss_0"})
+        with open(checkpoint_path, "a", encoding="utf-8") as f:
+            f.write('{"event": "document", "source": "rss", "docu')
+
+        reopened = CollectionCheckpoint(checkpoint_path, fsync=False)
+        assert reopened.source_documents("rss") == [{"id": "rss_0"}]
+
+    def test_progress_after_a_torn_record_survives_later_crashes(self, checkpoint_path):
+        def crash_mid_write():
+            with open(checkpoint_path, "a", encoding="utf-8") as f:
+                f.write('{"event": "document", "source": "rss", "docu')
+
+        checkpoint = CollectionCheckpoint(checkpoint_path, fsync=False)
+        checkpoint.record_document("rss", {"id": "rss_0"})
+        crash_mid_write()
+
+        resumed = CollectionCheckpoint(checkpoint_path, fsync=False)
+        resumed.record_document("rss", {"id": "rss_1"})
+        crash_mid_write()
+
+        resumed = CollectionCheckpoint(checkpoint_path, fsync=False)
+        resumed.record_document("rss", {"id": "rss_2"})
+
+        reopened = CollectionCheckpoint(checkpoint_path, fsync=False)
+        assert reopened.run_id == checkpoint.run_id
+        assert reopened.source_documents("rss") == [
+            {"id": "rss_0"},
+            {"id": "rss_1"},
+            {"id": "rss_2"},
+        ]
+
+    def test_reset_discards_progress(self, checkpoint_path):
+        checkpoint = CollectionCheckpoint(checkpoint_path, fsync=False)
+        checkpoint.mark_source_complete("dapp")
+        old_run = checkpoint.run_id
+
+        checkpoint.reset()
+
+        assert not checkpoint.is_source_complete("dapp")
+        assert checkpoint.run_id != old_run
+        lines = checkpoint_path.read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line)["event"] for line in lines] == ["run_start"]
+
+
+@contextmanager
+def _fake_correlation_context(correlation_id=None):
+    yield correlation_id or "test-correlation-id"
+
+
+class TestResumableCollection:
+    @pytest.fixture
+    def collector(self):
+        # Build without __init__ so no loggers, monitors or sessions are created
+        collector = BitcoinDataCollector.__new__(BitcoinDataCollector)
+        collector.check_url_accessibility = False
+        collector.validation_logger = MagicMock()
+        collector.metrics_logger = MagicMock()
+        collector.monitor = MagicMock()
+        collector.session = MagicMock()
+        collector.rss_feeds = []
+        collector.validate_document_urls = lambda docs: docs
+        with patch(
+            "knowledge.data_collector.correlation_context", _fake_correlation_context
+        ):
+            yield collector
+
+    def test_completed_sources_are_not_recollected(self, collector, checkpoint_path):
+        checkpoint = CollectionCheckpoint(checkpoint_path, fsync=False)
+        checkpoint.record_document("bitcoin_basics", {"id": "basics"})
+        checkpoint.mark_source_complete("bitcoin_basics")
+
+        with patch.object(
+            collector, "collect_bitcoin_basics", side_effect=AssertionError
+        ), patch.object(
+            collector, "collect_genius_act_info", return_value=[{"id": "genius"}]
+        ), patch.object(
+            collector, "collect_dapp_information", return_value=[{"id": "dapp"}]
+        ), patch.object(
+            collector, "collect_from_rss", return_value=[]
+        ):
+            documents = collector.collect_all_documents(
+                checkpoint_path=str(checkpoint_path)
+            )
+
+        assert [d["id"] for d in documents] == ["basics", "genius", "dapp"]
+
+    def test_failed_source_is_retried_on_resume(self, collector, checkpoint_path):
+        with patch.object(
+            collector, "collect_bitcoin_basics", return_value=[{"id": "basics"}]
+        ), patch.object(
+            collector, "collect_genius_act_info", return_value=None
+        ), patch.object(
+            collector, "collect_dapp_information", return_value=[]
+        ), patch.object(
+            collector, "collect_from_rss", return_value=[]
+        ):
+            collector.collect_all_documents(checkpoint_path=str(checkpoint_path))
+
+        checkpoint = CollectionCheckpoint(checkpoint_path, fsync=False)
+        assert checkpoint.is_source_complete("bitcoin_basics")
+        assert not checkpoint.is_source_complete("genius_act")
+        assert not checkpoint.run_complete
+
+        basics = MagicMock(return_value=[{"id": "other"}])
+        with patch.object(collector, "collect_bitcoin_basics", basics), patch.object(
+            collector, "collect_genius_act_info", return_value=[{"id": "genius"}]
+        ):
+            documents = collector.collect_all_documents(
+                checkpoint_path=str(checkpoint_path)
+            )
+
+        basics.assert_not_called()
+        assert {d["id"] for d in documents} == {"basics", "genius"}
+
+    def test_rss_resume_skips_finished_feeds_and_articles(
+        self, collector, checkpoint_path
+    ):
+        collector.rss_feeds = ["https://feed.one/rss", "https://feed.two/rss"]
+        checkpoint = CollectionCheckpoint(checkpoint_path, fsync=False)
+        checkpoint.record_document(
+            "rss",
+            {"id": "rss_0", "url": "https://feed.one/a"},
+            item="https://feed.one/a",
+        )
+        checkpoint.mark_item_done("rss", "https://feed.one/rss")
+
+        entry = MagicMock(link="https://feed.two/b", title="B")
+        entry.get.return_value = ""
+        article = MagicMock(text="x" * 600)
+
+        with patch(
+            "knowledge.data_collector.feedparser.parse",
+            return_value=MagicMock(entries=[entry]),
+        ), patch("knowledge.data_collector.Article", return_value=article), patch(
+            "knowledge.data_collector.time.sleep"
+        ):
+            articles = collector.collect_from_rss(checkpoint=checkpoint)
+
+        collector.session.get.assert_called_once_with(
+            "https://feed.two/rss", timeout=10
+        )
+        assert [a["id"] for a in articles] == ["rss_0", "rss_1"]
+        assert checkpoint.is_source_complete("rss")
+
+    def test_feed_with_failed_articles_is_retried_on_resume(
+        self, collector, checkpoint_path
+    ):
+        collector.rss_feeds = ["https://feed.one/rss"]
+        checkpoint = CollectionCheckpoint(checkpoint_path, fsync=False)
+        entries = [
+            MagicMock(link=f"https://feed.one/{name}", title=name) for name in "ab"
+        ]
+        for entry in entries:
+            entry.get.return_value = ""
+        extracted = MagicMock(text="x" * 600)
+        broken = MagicMock(text="x" * 600)
+        broken.download.side_effect = IOError("connection reset")
+
+        def collect(articles):
+            with patch(
+                "knowledge.data_collector.feedparser.parse",
+                return_value=MagicMock(entries=entries),
+            ), patch("knowledge.data_collector.Article", side_effect=articles), patch(
+                "knowledge.data_collector.time.sleep"
+            ):
+                return collector.collect_from_rss(checkpoint=checkpoint)
+
+        collect([extracted, broken])
+        assert not checkpoint.is_item_done("rss", "https://feed.one/rss")
+        assert not checkpoint.is_source_complete("rss")
+
+        # Only the failed article is downloaded again
+        articles = collect([extracted])
+        assert [a["url"] for a in articles] == [e.link for e in entries]
+        assert checkpoint.is_source_complete("rss")
+
+    def test_finished_run_starts_fresh(self, collector, checkpoint_path):
+        def fake_rss(max_articles, checkpoint=None):
+            checkpoint.mark_source_complete("rss")
+            return []
+
+        basics = MagicMock(return_value=[{"id": "basics"}])
+        with patch.object(collector, "collect_bitcoin_basics", basics), patch.object(
+            collector, "collect_genius_act_info", return_value=[]
+        ), patch.object(
+            collector, "collect_dapp_information", return_value=[]
+        ), patch.object(
+            collector, "collect_from_rss", side_effect=fake_rss
+        ):
+            collector.collect_all_documents(checkpoint_path=str(checkpoint_path))
+            assert CollectionCheckpoint(checkpoint_path, fsync=False).run_complete
+
+            collector.collect_all_documents(checkpoint_path=str(checkpoint_path))
+
+        assert basics.call_count == 2
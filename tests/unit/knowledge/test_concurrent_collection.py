@@ -0,0 +1,135 @@
+"""
+Unit tests for concurrent source collection in collect_all_documents.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from knowledge.data_collector import BitcoinDataCollector
+
+
+@contextmanager
+def _fake_correlation_context(correlation_id=None):
+    yield correlation_id or "test-correlation-id"
+
+
+@pytest.fixture
+def collector():
+    collector = BitcoinDataCollector.__new__(BitcoinDataCollector)
+    collector.check_url_accessibility = False
+    collector.validation_logger = MagicMock()
+    collector.metrics_logger = MagicMock()
+    collector.monitor = MagicMock()
+    collector.session = MagicMock()
+    collector.rss_feeds = []
+    with patch(
+        "knowledge.data_collector.correlation_context", _fake_correlation_context
+    ):
+        yield collector
+
+
+def _slow(result, delay=0.2):
+    def collect(*args, **kwargs):
+        time.sleep(delay)
+        return result
+
+    return collect
+
+
+def test_sources_run_concurrently(collector):
+    collector.validate_document_urls = lambda docs: docs
+    with patch.object(
+        collector, "collect_bitcoin_basics", _slow([{"id": "basics"}])
+    ), patch.object(
+        collector, "collect_genius_act_info", _slow([{"id": "genius"}])
+    ), patch.object(
+        collector, "collect_dapp_information", _slow([{"id": "dapp"}])
+    ), patch.object(
+        collector, "collect_from_rss", _slow([{"id": "rss_0"}])
+    ):
+        start = time.monotonic()
+        documents = collector.collect_all_documents()
+        elapsed = time.monotonic() - start
+
+    # Four 0.2s sources should finish in about the time of one
+    assert elapsed < 0.6
+    assert [d["id"] for d in documents] == ["basics", "genius", "dapp", "rss_0"]
+
+
+def test_failing_source_does_not_affect_others(collector):
+    collector.validate_document_urls = lambda docs: docs
+    with patch.object(
+        collector, "collect_bitcoin_basics", side_effect=RuntimeError("boom")
+    ), patch.object(
+        collector, "collect_genius_act_info", return_value=[{"id": "genius"}]
+    ), patch.object(
+        collector, "collect_dapp_information", return_value=None
+    ), patch.object(
+        collector, "collect_from_rss", return_value=[{"id": "rss_0"}]
+    ):
+        documents = collector.collect_all_documents()
+
+    assert [d["id"] for d in documents] == ["genius", "rss_0"]
+    logged = [c.args[0] for c in collector.validation_logger.error.call_args_list]
+    assert "Failed to collect Bitcoin basics" in logged
+    assert "Failed to collect dApp information" in logged
+
+
+def test_validation_starts_before_slowest_source_finishes(collector):
+    rss_done = threading.Event()
+    validated_before_rss = []
+
+    def validate(docs):
+        validated_before_rss.append(
+            (docs[0]["id"] if docs else None, rss_done.is_set())
+        )
+        return docs
+
+    def slow_rss(*args, **kwargs):
+        time.sleep(0.2)
+        rss_done.set()
+        return [{"id": "rss_0"}]
+
+    collector.validate_document_urls = validate
+    with patch.object(
+        collector, "collect_bitcoin_basics", return_value=[{"id": "basics"}]
+    ), patch.object(
+        collector, "collect_genius_act_info", return_value=[]
+    ), patch.object(
+        collector, "collect_dapp_information", return_value=[]
+    ), patch.object(
+        collector, "collect_from_rss", slow_rss
+    ):
+        collector.collect_all_documents()
+
+    assert ("basics", False) in validated_before_rss
+    assert ("rss_0", True) in validated_before_rss
+
+
+def test_sources_run_on_the_shared_io_pool(collector):
+    collected_on, validated_on = [], []
+
+    def collect(*args, **kwargs):
+        collected_on.append(threading.current_thread().name)
+        return [{"id": "doc"}]
+
+    def validate(docs):
+        validated_on.append(threading.current_thread().name)
+        return docs
+
+    collector.validate_document_urls = validate
+    with patch.object(collector, "collect_bitcoin_basics", collect), patch.object(
+        collector, "collect_genius_act_info", collect
+    ), patch.object(collector, "collect_dapp_information", collect), patch.object(
+        collector, "collect_from_rss", collect
+    ):
+        collector.collect_all_documents()
+
+    assert len(collected_on) == 4
+    assert all(name.startswith("io-pool") for name in collected_on)
+    # Validation fans out over the pool itself, so it runs from the caller
+    assert validated_on == [threading.current_thread().name] * 4
@@ -0,0 +1,229 @@
+"""
+Unit tests for the adaptive per-feed polling scheduler.
+"""
+
+import random
+import time
+from email.utils import formatdate
+from unittest.mock import MagicMock
+
+import pytest
+
+from knowledge.feed_scheduler import (
+    AdaptiveFeedScheduler,
+    estimate_publish_interval,
+    stable_document_id,
+)
+
+NOW = 1_700_000_000.0
+
+
+def _rss(links_and_times):
+    items = "".join(
+        f"<item><title>{link}</title><link>{link}</link>"
+        f"<pubDate>{formatdate(ts, usegmt=True)}</pubDate></item>"
+        for link, ts in links_and_times
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel>{items}</channel></rss>'.encode()
+
+
+def _response(content=b"", status=200, headers=None):
+    response = MagicMock()
+    response.status_code = status
+    response.content = content
+    response.headers = headers or {}
+    return response
+
+
+class FakeClock:
+    def __init__(self, now=NOW):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _collect(feed_url, entries, articles=None, checkpoint=None, **kwargs):
+    """Like collect_feed_entries: records handled entries in the checkpoint."""
+    documents = []
+    for entry in entries:
+        if "fail" in entry.link:
+            continue
+        document = {"id": "rss_0", "url": entry.link, "title": entry.title}
+        documents.append(document)
+        if checkpoint:
+            checkpoint.record_document("rss", document, item=entry.link)
+    return documents
+
+
+@pytest.fixture
+def collector():
+    collector = MagicMock()
+    collector.rss_feeds = ["https://feed.example.com/rss"]
+    collector.collect_feed_entries.side_effect = _collect
+    return collector
+
+
+def _scheduler(collector, clock, **kwargs):
+    kwargs.setdefault("jitter", 0.0)
+    return AdaptiveFeedScheduler(
+        collector,
+        min_interval=60,
+        max_interval=86400,
+        initial_interval=3600,
+        smoothing=1.0,
+        clock=clock,
+        rng=random.Random(0),
+        **kwargs,
+    )
+
+
+def test_estimate_publish_interval_uses_median_gap():
+    timestamps = [NOW - 600, NOW - 1200, NOW - 1800, NOW - 7200]
+    # Gaps: 600 (since newest), 600, 600, 5400 -> median 600
+    assert estimate_publish_interval(timestamps, now=NOW) == 600
+    assert estimate_publish_interval([], now=NOW) is None
+
+
+def test_frequent_feed_is_polled_more_often_than_slow_feed(collector):
+    clock = FakeClock()
+    fast = [(f"https://a.example.com/{i}", NOW - 600 * (i + 1)) for i in range(5)]
+    slow = [(f"https://b.example.com/{i}", NOW - 86400 * (i + 1)) for i in range(5)]
+    collector.rss_feeds = [
+        "https://fast.example.com/rss",
+        "https://slow.example.com/rss",
+    ]
+    collector.session.get.side_effect = lambda url, **kw: _response(
+        _rss(fast if "fast" in url else slow)
+    )
+    scheduler = _scheduler(collector, clock)
+
+    scheduler.run_once()
+    schedule = scheduler.get_schedule()
+
+    assert schedule["https://fast.example.com/rss"]["interval_seconds"] == 300
+    assert schedule["https://slow.example.com/rss"]["interval_seconds"] == 43200
+    clock.now += 301
+    assert scheduler.due_feeds() == ["https://fast.example.com/rss"]
+
+
+def test_only_new_entries_are_collected(collector):
+    clock = FakeClock()
+    first = [("https://x.example.com/1", NOW - 600)]
+    second = first + [("https://x.example.com/2", NOW + 3000)]
+    collector.session.get.side_effect = [
+        _response(_rss(first)),
+        _response(_rss(second)),
+    ]
+    on_documents = MagicMock()
+    scheduler = _scheduler(collector, clock, on_documents=on_documents)
+
+    assert [d["url"] for d in scheduler.run_once()] == ["https://x.example.com/1"]
+    clock.now += 3600 * 24
+    documents = scheduler.run_once()
+
+    assert [d["url"] for d in documents] == ["https://x.example.com/2"]
+    assert documents[0]["id"] == stable_document_id("https://x.example.com/2")
+    assert on_documents.call_count == 2
+
+
+def test_not_modified_backs_off_and_sends_validators(collector):
+    clock = FakeClock()
+    collector.session.get.side_effect = [
+        _response(
+            _rss([("https://x.example.com/1", NOW - 600)]), headers={"ETag": '"v1"'}
+        ),
+        _response(status=304),
+    ]
+    scheduler = _scheduler(collector, clock)
+    scheduler.run_once()
+    interval = scheduler.get_schedule()[collector.rss_feeds[0]]["interval_seconds"]
+
+    clock.now += interval
+    scheduler.run_once()
+
+    _, kwargs = collector.session.get.call_args
+    assert kwargs["headers"]["If-None-Match"] == '"v1"'
+    state = scheduler.get_schedule()[collector.rss_feeds[0]]
+    assert state["interval_seconds"] == pytest.approx(interval * 1.5)
+    assert collector.collect_feed_entries.call_count == 1
+
+
+def test_interval_respects_bounds_and_jitter(collector):
+    clock = FakeClock()
+    burst = [(f"https://x.example.com/{i}", NOW - i) for i in range(1, 6)]
+    collector.session.get.return_value = _response(_rss(burst))
+    scheduler = _scheduler(collector, clock, jitter=0.2)
+
+    scheduler.run_once()
+    state = scheduler.get_schedule()[collector.rss_feeds[0]]
+
+    assert state["interval_seconds"] == 60
+    assert 48 <= state["next_poll_in_seconds"] <= 72
+
+
+def test_state_persists_across_restarts(collector, tmp_path):
+    clock = FakeClock()
+    collector.session.get.return_value = _response(
+        _rss([("https://x.example.com/1", NOW - 600)])
+    )
+    state_path = tmp_path / "feed_schedule.json"
+    _scheduler(collector, clock, state_path=state_path).run_once()
+
+    restarted = _scheduler(collector, clock, state_path=state_path)
+    clock.now += 86400
+    assert restarted.run_once() == []
+    assert restarted.get_schedule()[collector.rss_feeds[0]]["polls"] == 2
+
+
+def test_overflow_and_failed_entries_are_retried(collector):
+    clock = FakeClock()
+    links = [(f"https://x.example.com/{i}", NOW - 600 * i) for i in range(3)]
+    links.append(("https://x.example.com/fail", NOW - 3000))
+    collector.session.get.return_value = _response(
+        _rss(links), headers={"ETag": '"v1"'}
+    )
+    scheduler = _scheduler(collector, clock, max_articles=2)
+
+    assert len(scheduler.run_once()) == 2
+    clock.now += 86400
+    assert [d["url"] for d in scheduler.run_once()] == ["https://x.example.com/2"]
+
+    clock.now += 86400
+    assert scheduler.run_once() == []
+
+    # The failed entry is still pending, so polls stay unconditional
+    _, kwargs = collector.session.get.call_args
+    assert "If-None-Match" not in kwargs["headers"]
+    (_, entries), _ = collector.collect_feed_entries.call_args
+    assert [e.link for e in entries] == ["https://x.example.com/fail"]
+
+
+def test_failed_callback_keeps_entries_pending(collector, tmp_path):
+    clock = FakeClock()
+    collector.session.get.return_value = _response(
+        _rss([("https://x.example.com/1", NOW - 600)])
+    )
+    on_documents = MagicMock(side_effect=[RuntimeError("index down"), None])
+    state_path = tmp_path / "feed_schedule.json"
+    scheduler = _scheduler(
+        collector, clock, on_documents=on_documents, state_path=state_path
+    )
+
+    assert len(scheduler.run_once()) == 1
+    assert not state_path.exists()
+    assert scheduler.get_schedule()[collector.rss_feeds[0]]["next_poll_in_seconds"]
+
+    clock.now += 86400
+    assert len(scheduler.run_once()) == 1
+    assert on_documents.call_count == 2
+    assert state_path.exists()
+
+
+def test_background_thread_stops(collector):
+    collector.session.get.return_value = _response(_rss([]))
+    scheduler = AdaptiveFeedScheduler(collector, min_interval=60)
+    scheduler.start()
+    time.sleep(0.05)
+    scheduler.stop(timeout=1)
+    assert collector.session.get.called
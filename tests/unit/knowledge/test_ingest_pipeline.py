@@ -0,0 +1,77 @@
+"""
+Unit tests for the fetch → parse → validate → chunk → embed → upsert pipeline.
+"""
+
+from unittest.mock import MagicMock, patch
+
+from knowledge.ingest_pipeline import (
+    build_ingest_pipeline,
+    make_chunk_stage,
+    parse_stage,
+)
+
+
+def _fake_embedder(texts):
+    return [[float(len(text))] for text in texts]
+
+
+def test_chunking_covers_whole_document_with_overlap():
+    chunk = make_chunk_stage(chunk_size=10, chunk_overlap=4)
+    content = "abcdefghijklmnopqrstuvwxyz"
+
+    chunks = chunk({"id": "doc", "content": content})
+
+    assert [c["id"] for c in chunks][:2] == ["doc_chunk_0", "doc_chunk_1"]
+    assert chunks[0]["content"] == content[:10]
+    assert chunks[1]["content"].startswith(content[6:10])
+    assert chunks[-1]["content"].endswith("z")
+    assert all(c["parent_id"] == "doc" for c in chunks)
+
+
+def test_short_articles_are_dropped():
+    article = MagicMock(text="too short", title="T")
+    assert parse_stage({"url": "https://a.com/x", "_article": article}) is None
+
+
+def test_pipeline_upserts_embedded_chunks():
+    client = MagicMock()
+    pipeline = build_ingest_pipeline(
+        client,
+        _fake_embedder,
+        chunk_size=100,
+        chunk_overlap=10,
+        embed_batch_size=4,
+        upsert_batch_size=8,
+    )
+    documents = [
+        {
+            "id": f"doc{i}",
+            "title": "Doc",
+            "content": "x" * 250,
+            "url": "https://bitcoin.org/en/",
+            "category": "fundamentals",
+            "source": "bitcoin.org",
+        }
+        for i in range(3)
+    ]
+
+    with patch(
+        "knowledge.ingest_pipeline.sanitize_url_for_storage", side_effect=lambda u: u
+    ):
+        result = pipeline.run(documents)
+
+    assert result.errors == []
+    assert len(result.outputs) == 9  # 3 chunks per document
+    upserted = [
+        c for call in client.upsert_documents.call_args_list for c in call.args[0]
+    ]
+    assert {c["id"] for c in upserted} == set(result.outputs)
+    assert all(c["embedding"] == [float(len(c["content"]))] for c in upserted)
+    assert set(result.stats["stages"]) == {
+        "fetch",
+        "parse",
+        "validate",
+        "chunk",
+        "embed",
+        "upsert",
+    }
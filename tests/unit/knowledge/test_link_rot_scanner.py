@@ -0,0 +1,180 @@
+"""
+Unit tests for the background link-rot scanner.
+"""
+
+import json
+from http.client import RemoteDisconnected
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import requests
+from urllib3.exceptions import ProtocolError
+
+from knowledge.link_rot_scanner import LinkRotScanner, iter_index_urls
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _session(statuses):
+    """Session whose HEAD returns the status configured per URL (or raises)."""
+
+    def head(url, **kwargs):
+        status = statuses[url]
+        if isinstance(status, Exception):
+            raise status
+        return MagicMock(status_code=status)
+
+    session = MagicMock()
+    session.head.side_effect = head
+    session.get.side_effect = head
+    return session
+
+
+def _scanner(urls, statuses, tmp_path, clock, monitor=None):
+    return LinkRotScanner(
+        url_source=lambda: urls,
+        monitor=monitor or MagicMock(),
+        rate_per_second=1000,
+        state_path=tmp_path / "state.json",
+        report_path=tmp_path / "report.json",
+        session=_session(statuses),
+        clock=clock,
+    )
+
+
+def test_scan_records_broken_links_and_writes_report(tmp_path):
+    urls = ["https://a.example.com/1", "https://b.example.com/2"]
+    statuses = {urls[0]: 200, urls[1]: 404}
+    monitor = MagicMock()
+    scanner = _scanner(urls, statuses, tmp_path, FakeClock(), monitor)
+
+    report = scanner.run_once()
+
+    assert report.checked == 2 and report.total_broken == 1
+    assert report.newly_broken == [{"url": urls[1], "error": "HTTP 404"}]
+    calls = {
+        c.args[0]: c.kwargs["error_type"]
+        for c in monitor.record_validation.call_args_list
+    }
+    assert calls == {urls[0]: None, urls[1]: "broken_link"}
+    saved = json.loads((tmp_path / "report.json").read_text())
+    assert saved["newly_broken"][0]["url"] == urls[1]
+
+
+def test_oldest_checked_first_and_diff_between_passes(tmp_path):
+    clock = FakeClock()
+    urls = [f"https://site{i}.example.com/" for i in range(3)]
+    statuses = {url: 200 for url in urls}
+    scanner = _scanner(urls, statuses, tmp_path, clock)
+    scanner.recheck_interval = 10
+    scanner.batch_size = 2
+
+    scanner.run_once()
+    (unchecked,) = [u for u in urls if scanner._links[u].last_checked_at is None]
+    clock.now += 5
+    assert scanner.due_urls() == [unchecked]
+    assert scanner.run_once().checked == 1
+
+    clock.now += 20
+    due = scanner.due_urls(limit=3)
+    assert due[-1] == unchecked  # checked most recently, so last
+
+    for url in urls:
+        statuses[url] = 503
+    report = scanner.run_once()
+    assert {item["url"] for item in report.newly_broken} == set(due[:2])
+    assert report.recovered == [] and report.still_broken == 0
+
+
+def test_state_is_checkpointed_and_resumed(tmp_path):
+    clock = FakeClock()
+    urls = ["https://a.example.com/", "https://b.example.com/"]
+    scanner = _scanner(urls, {urls[0]: 200, urls[1]: 410}, tmp_path, clock)
+    scanner.run_once()
+
+    statuses = {urls[0]: 200, urls[1]: 200}
+    resumed = _scanner(urls, statuses, tmp_path, clock)
+    assert resumed.due_urls() == []
+    assert resumed.get_status()["broken_urls"] == {urls[1]: "HTTP 410"}
+
+    clock.now += resumed.broken_recheck_interval
+    report = resumed.run_once()
+    assert report.recovered == [urls[1]] and report.checked == 1
+
+
+def test_connection_errors_defer_down_hosts(tmp_path):
+    urls = [f"https://down.example.com/{i}" for i in range(6)]
+    error = requests.exceptions.ConnectionError("refused")
+    scanner = _scanner(urls, {url: error for url in urls}, tmp_path, FakeClock())
+
+    report = scanner.run_once()
+
+    assert report.checked == 3  # circuit opens after three failures
+    assert report.deferred == 3
+    assert scanner.session.head.call_count == 3
+
+
+def test_iter_index_urls_deduplicates_chunks():
+    vectors = {
+        "doc1_0": SimpleNamespace(metadata={"url": "https://a.example.com"}),
+        "doc1_1": SimpleNamespace(metadata={"url": "https://a.example.com"}),
+        "doc2_0": SimpleNamespace(metadata={"url": ""}),
+        "doc3_0": SimpleNamespace(metadata={"url": "https://b.example.com"}),
+    }
+    index = MagicMock()
+    index.list.return_value = iter([["doc1_0", "doc1_1"], ["doc2_0", "doc3_0"]])
+    index.fetch.side_effect = lambda ids: SimpleNamespace(
+        vectors={i: vectors[i] for i in ids}
+    )
+
+    assert list(iter_index_urls(index)) == [
+        "https://a.example.com",
+        "https://b.example.com",
+    ]
+
+
+def test_private_hosts_are_never_requested(tmp_path, monkeypatch):
+    monkeypatch.setenv("URL_RESOLVE_HOSTNAMES", "true")
+    urls = ["http://10.0.0.5/admin", "http://169.254.169.254/latest/meta-data"]
+    monitor = MagicMock()
+    scanner = _scanner(urls, {}, tmp_path, FakeClock(), monitor)
+
+    report = scanner.run_once()
+
+    assert report.checked == 2 and report.total_broken == 2
+    assert not scanner.session.head.called and not scanner.session.get.called
+    assert scanner.get_status()["broken_urls"] == {
+        urls[0]: "private_ip: 10.0.0.5",
+        urls[1]: "private_ip: 169.254.169.254",
+    }
+    error_types = {
+        c.kwargs["error_type"] for c in monitor.record_validation.call_args_list
+    }
+    assert error_types == {"private_ip"}
+
+
+def test_get_fallback_only_when_head_is_unsupported(tmp_path):
+    urls = [
+        "https://no-head.example.com/",
+        "https://dropped.example.com/",
+        "https://refused.example.com/",
+    ]
+    dropped = requests.exceptions.ConnectionError(
+        ProtocolError("Connection aborted.", RemoteDisconnected("closed"))
+    )
+    refused = requests.exceptions.ConnectionError("connection refused")
+    scanner = _scanner(
+        urls, {urls[0]: 405, urls[1]: dropped, urls[2]: refused}, tmp_path, FakeClock()
+    )
+    scanner.session.get.side_effect = lambda url, **kwargs: MagicMock(status_code=200)
+
+    scanner.run_once()
+
+    assert {c.args[0] for c in scanner.session.get.call_args_list} == set(urls[:2])
+    assert scanner.get_status()["broken_urls"] == {urls[2]: "connection refused"}
@@ -0,0 +1,138 @@
+"""
+Tests for the non-blocking (queue) mode of URLMetadataLogger.
+"""
+
+import json
+import logging
+import threading
+
+from btc_max_knowledge_agent.utils.url_metadata_logger import (
+    BatchingLogListener,
+    BoundedLogQueue,
+    NonBlockingQueueHandler,
+    URLMetadataLogger,
+)
+
+
+def _record(level, msg="m"):
+    return logging.LogRecord("t", level, __file__, 1, msg, None, None)
+
+
+class _BlockedTarget(logging.Handler):
+    """Collects messages, but only once ``release`` is set."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.messages = []
+
+    def emit_batch(self, records):
+        self.release.wait(10)
+        self.messages.extend(r.getMessage() for r in records)
+
+
+def test_overflow_drops_debug_then_info_first():
+    queue = BoundedLogQueue(maxsize=3)
+    for level in (logging.DEBUG, logging.INFO, logging.DEBUG):
+        assert queue.put_nowait(_record(level), level)
+
+    # Full: a warning evicts the oldest debug record, then the next debug
+    assert queue.put_nowait(_record(logging.WARNING), logging.WARNING)
+    assert queue.put_nowait(_record(logging.ERROR), logging.ERROR)
+    # A full queue rejects debug records; an INFO record is rejected once
+    # only warnings and errors are queued
+    assert not queue.put_nowait(_record(logging.DEBUG), logging.DEBUG)
+    assert queue.put_nowait(_record(logging.ERROR), logging.ERROR)
+    assert not queue.put_nowait(_record(logging.INFO), logging.INFO)
+
+    levels = [r.levelno for r in queue.get_batch(10, timeout=0)]
+    assert levels == [logging.WARNING, logging.ERROR, logging.ERROR]
+    assert queue.dropped == {"DEBUG": 3, "INFO": 2}
+
+
+def test_slow_writes_do_not_block_callers():
+    listener = BatchingLogListener(maxsize=100, batch_size=10)
+    target = _BlockedTarget()
+    logger = logging.getLogger("url_metadata.test_non_blocking")
+    logger.propagate = False
+    logger.handlers = [NonBlockingQueueHandler(listener, target)]
+    listener.start()
+    try:
+        for i in range(50):
+            logger.info("record %d", i)
+        assert target.messages == []
+
+        target.release.set()
+        listener.flush()
+        assert target.messages == [f"record {i}" for i in range(50)]
+    finally:
+        target.release.set()
+        listener.stop()
+        logger.handlers = []
+
+
+def test_flush_timeout_never_starts_a_second_writer():
+    listener = BatchingLogListener(maxsize=100, batch_size=10)
+    target = _BlockedTarget()
+    logger = logging.getLogger("url_metadata.test_flush_barrier")
+    logger.propagate = False
+    logger.handlers = [NonBlockingQueueHandler(listener, target)]
+    listener.start()
+    try:
+        logger.info("first")
+        assert not listener.flush(timeout=0.1)
+        logger.info("second")
+        writers = [
+            t for t in threading.enumerate() if t.name == "url-metadata-log-writer"
+        ]
+        assert writers == [listener._thread]
+
+        target.release.set()
+        assert listener.flush()
+        assert target.messages == ["first", "second"]
+    finally:
+        target.release.set()
+        listener.stop()
+        logger.handlers = []
+
+
+def test_fork_child_does_not_rewrite_the_parents_queued_records():
+    listener = BatchingLogListener(maxsize=100, batch_size=10)
+    target = _BlockedTarget()
+    target.release.set()
+    handler = NonBlockingQueueHandler(listener, target)
+    handler.handle(_record(logging.INFO, "from parent"))
+
+    listener._after_fork_in_child()
+    assert listener.get_stats()["queued"] == 0
+
+    listener.start()
+    try:
+        handler.handle(_record(logging.INFO, "from child"))
+        assert listener.flush()
+    finally:
+        listener.stop()
+    assert target.messages == ["from child"]
+
+
+def test_async_logger_writes_level_and_combined_files(tmp_path):
+    url_logger = URLMetadataLogger(log_dir=str(tmp_path), async_logging=True)
+    try:
+        url_logger.log_upload("https://example.com/a?key=1", True, 10)
+        url_logger.log_upload("https://example.com/b", False, 20, error="boom")
+        url_logger.flush()
+
+        def read(name):
+            lines = (tmp_path / name).read_text().splitlines()
+            return [json.loads(line) for line in lines]
+
+        info, errors = read("upload_info.log"), read("upload_error.log")
+        assert [r["message"] for r in info] == ["Metadata upload succeeded for URL"]
+        assert info[0]["url"] == "https://example.com/a?[params_removed]"
+        assert [r["error"] for r in errors] == ["boom"]
+        assert read("all_operations.log")[-2:] == info + errors
+        assert url_logger.get_queue_stats()["dropped"] == {}
+    finally:
+        url_logger.close()
+        # Point the shared loggers back at the default synchronous files
+        URLMetadataLogger(async_logging=False)
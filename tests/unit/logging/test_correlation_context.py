@@ -0,0 +1,78 @@
+"""
+Tests for context-variable correlation IDs across asyncio tasks and executors.
+"""
+
+import asyncio
+import logging
+import threading
+
+import pytest
+
+from btc_max_knowledge_agent.utils.executors import get_executor
+from btc_max_knowledge_agent.utils.url_metadata_logger import (
+    CorrelationIdFilter,
+    correlation_context,
+    get_correlation_id,
+    set_correlation_id,
+)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_tasks_keep_their_own_ids():
+    async def handle(request_id, delay):
+        with correlation_context(request_id):
+            await asyncio.sleep(delay)
+            seen = get_correlation_id()
+            await asyncio.sleep(0)
+            return seen, get_correlation_id()
+
+    results = await asyncio.gather(
+        handle("req-a", 0.02), handle("req-b", 0.01), handle("req-c", 0)
+    )
+
+    assert results == [("req-a", "req-a"), ("req-b", "req-b"), ("req-c", "req-c")]
+    assert get_correlation_id() is None
+
+
+@pytest.mark.asyncio
+async def test_id_follows_work_onto_executors():
+    loop = asyncio.get_running_loop()
+    with correlation_context("req-exec"):
+        in_pool = get_executor("io").submit(get_correlation_id).result(5)
+        in_loop_executor = await loop.run_in_executor(
+            get_executor("cpu"), get_correlation_id
+        )
+
+    assert in_pool == in_loop_executor == "req-exec"
+    # Changes made on the pool do not leak back to the submitter
+    with correlation_context("outer"):
+        get_executor("io").submit(set_correlation_id, "inner").result(5)
+        assert get_correlation_id() == "outer"
+
+
+def test_threads_and_log_records_see_only_their_own_id():
+    seen = []
+    with correlation_context("main-thread") as correlation_id:
+        thread = threading.Thread(target=lambda: seen.append(get_correlation_id()))
+        thread.start()
+        thread.join()
+
+        log_record = logging.LogRecord("t", logging.INFO, __file__, 1, "m", None, None)
+        CorrelationIdFilter().filter(log_record)
+
+    assert seen == [None]
+    assert log_record.correlation_id == correlation_id
+    assert get_correlation_id() is None
+
+
+def test_api_requests_get_a_correlation_id():
+    from fastapi.testclient import TestClient
+
+    from src.web.bitcoin_assistant_api import app
+
+    client = TestClient(app)
+    response = client.get("/metrics", headers={"X-Request-ID": "client-id-1"})
+    assert response.headers["x-request-id"] == "client-id-1"
+
+    generated = client.get("/metrics").headers["x-request-id"]
+    assert generated and generated != "client-id-1"
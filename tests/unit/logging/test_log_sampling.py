@@ -0,0 +1,105 @@
+"""
+Unit tests for adaptive log sampling.
+"""
+
+import importlib
+import logging
+
+from btc_max_knowledge_agent.utils.log_sampling import (
+    LogSampler,
+    SamplingRule,
+    log_sampler,
+    rules_from_env,
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _sampler(clock, **rule):
+    return LogSampler(
+        rules={"event": SamplingRule(**rule)},
+        summary_interval=60,
+        enabled=True,
+        clock=clock,
+    )
+
+
+def test_errors_and_first_occurrences_are_kept():
+    sampler = _sampler(_Clock(), sample_rate=0.0)
+
+    assert sampler.should_log("event", "a")
+    assert sampler.should_log("event", "b")
+    assert not sampler.should_log("event", "a")
+    assert all(sampler.should_log("event", "a", error=True) for _ in range(100))
+
+
+def test_sample_rate_keeps_every_nth():
+    sampler = _sampler(_Clock(), sample_rate=0.1)
+
+    kept = [sampler.should_log("event", "k") for _ in range(101)]
+
+    # The first record plus one in ten of the remaining hundred
+    assert kept[0]
+    assert sum(kept) == 11
+
+
+def test_token_bucket_caps_sustained_rate():
+    clock = _Clock()
+    sampler = _sampler(clock, rate_per_second=2.0, burst=5)
+    sampler.should_log("event", "k")
+
+    assert sum(sampler.should_log("event", "k") for _ in range(50)) == 5
+    clock.now += 1.0
+    assert sum(sampler.should_log("event", "k") for _ in range(50)) == 2
+
+
+def test_suppressed_records_are_summarised(caplog):
+    clock = _Clock()
+    sampler = _sampler(clock, sample_rate=0.0)
+    logger = logging.getLogger("test.log_sampling")
+
+    with caplog.at_level(logging.INFO, logger="test.log_sampling"):
+        for _ in range(11):
+            sampler.should_log("event", "k", logger=logger)
+        assert caplog.records == []
+
+        clock.now += 61
+        sampler.should_log("event", "k", logger=logger)
+
+    (record,) = caplog.records
+    assert record.getMessage().startswith("10 similar event events suppressed")
+    assert record.extra_fields["suppressed"] == 10
+    assert record.extra_fields["logged"] == 1
+
+    caplog.clear()
+    with caplog.at_level(logging.INFO, logger="test.log_sampling"):
+        assert sampler.flush_summaries() == 1
+    assert caplog.records[0].extra_fields["suppressed"] == 1
+
+
+def test_environment_overrides(monkeypatch):
+    monkeypatch.setenv("LOG_SAMPLE_RATES", "url_validation=0.5,custom=0.2,bad=x")
+    monkeypatch.setenv("LOG_RATE_LIMITS", "custom=3")
+
+    rules = rules_from_env()
+
+    assert rules["url_validation"].sample_rate == 0.5
+    assert rules["custom"].sample_rate == 0.2
+    assert rules["custom"].rate_per_second == 3.0
+    assert "bad" not in rules
+
+
+def test_every_import_path_shares_one_sampler():
+    from btc_max_knowledge_agent.utils import optimized_logging, url_utils
+
+    legacy_url_utils = importlib.import_module("src.utils.url_utils")
+    collector = importlib.import_module("knowledge.data_collector")
+
+    for module in (url_utils, legacy_url_utils, optimized_logging, collector):
+        assert module.log_sampler is log_sampler
@@ -0,0 +1,181 @@
+"""
+Unit tests for the columnar metric store behind URLMetadataMonitor.
+"""
+
+import builtins
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from btc_max_knowledge_agent.monitoring.url_metadata_monitor import (
+    URLMetadataMonitor,
+)
+from monitoring.metric_store import ColumnarMetricStore
+from monitoring.url_metadata_monitor import URLMetric
+
+NOW = datetime.now(timezone.utc)
+
+
+def _metric(i, **overrides):
+    fields = dict(
+        timestamp=NOW - timedelta(seconds=100 - i),
+        operation_type="validation",
+        success=i % 3 != 0,
+        duration_ms=float(i),
+        url=f"https://site{i % 4}.example.com/",
+        error_type=None if i % 3 else "timeout",
+        correlation_id=f"req-{i}",
+    )
+    fields.update(overrides)
+    return URLMetric(**fields)
+
+
+def test_rows_round_trip_and_strings_are_interned():
+    store = ColumnarMetricStore(URLMetric)
+    metrics = [_metric(i) for i in range(12)]
+    metrics.append(_metric(12, operation_type="upload", metadata_size=2048, url=None))
+    for metric in metrics:
+        store[metric.operation_type].append(metric)
+
+    assert list(store["validation"]) + list(store["upload"]) == metrics
+    # 4 URLs + 1 error type + 13 correlation IDs
+    assert len(store.strings) == 18
+
+
+def test_trim_drops_leading_rows_and_compacts_strings():
+    store = ColumnarMetricStore(URLMetric)
+    for i in range(3000):
+        store["validation"].append(_metric(i, url=f"https://u{i}.example.com/"))
+
+    cutoff = (NOW - timedelta(seconds=100 - 2990)).timestamp()
+    assert store.drop_before(cutoff) == 2990
+
+    kept = list(store["validation"])
+    expected = [f"https://u{i}.example.com/" for i in range(2990, 3000)]
+    assert [m.url for m in kept] == expected
+    assert len(store.strings) < 100
+    assert kept[-1].correlation_id == "req-2999"
+
+
+def test_columns_are_much_smaller_than_objects():
+    store = ColumnarMetricStore(URLMetric)
+    metrics = [_metric(i) for i in range(1000)]
+    for metric in metrics:
+        store["validation"].append(metric)
+
+    object_bytes = sum(
+        sys.getsizeof(m) + sys.getsizeof(m.__dict__) + sys.getsizeof(m.timestamp)
+        for m in metrics
+    )
+    assert store.nbytes() * 3 < object_bytes
+
+
+def test_daily_summary_from_columns(tmp_path):
+    monitor = URLMetadataMonitor()
+    for i in range(1, 31):
+        monitor._add_metric(_metric(i))
+    monitor._add_metric(_metric(40, error_type="", success=False))
+    monitor._add_metric(_metric(50, timestamp=NOW - timedelta(days=2)))
+
+    summary = monitor.generate_daily_summary()
+
+    validation = summary["operations"]["validation"]
+    assert (validation["total"], validation["failures"]) == (31, 11)
+    successful = [float(i) for i in range(1, 31) if i % 3]
+    assert validation["avg_duration_ms"] == sum(successful) / len(successful)
+    assert validation["max_duration_ms"] == 29.0
+    assert summary["top_errors"]["validation"] == [("timeout", 10)]
+    assert [op["duration_ms"] for op in summary["slowest_operations"][:3]] == [
+        40.0,
+        30.0,
+        29.0,
+    ]
+
+    monitor.export_metrics(tmp_path / "metrics.json", chunk_rows=7)
+    exported = json.loads((tmp_path / "metrics.json").read_text())
+    assert exported["metrics"]["validation"][0]["correlation_id"] == "req-1"
+    assert len(exported["metrics"]["validation"]) == 32
+
+
+def test_incremental_export_resumes_from_cursor(tmp_path):
+    monitor = URLMetadataMonitor()
+    target = tmp_path / "metrics.jsonl"
+    for i in range(1, 8):
+        monitor._add_metric(_metric(i))
+    monitor._add_metric(_metric(8, operation_type="upload", metadata_size=10))
+
+    cursor = monitor.export_metrics_incremental(target, chunk_rows=3)
+    assert cursor == {"validation": 7, "upload": 1}
+
+    for i in range(9, 12):
+        monitor._add_metric(_metric(i))
+    # Defaults to continuing where the last export to this file stopped
+    future = monitor.submit_export(target, chunk_rows=2)
+    assert future.result(timeout=10) == {"validation": 10, "upload": 1}
+
+    lines = [json.loads(line) for line in target.read_text().splitlines()]
+    assert [line["correlation_id"] for line in lines] == [
+        f"req-{i}" for i in (1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11)
+    ]
+    assert lines[7]["metadata_size"] == 10
+    assert monitor.export_metrics_incremental(target) == {"validation": 10, "upload": 1}
+
+
+class _FailingFile:
+    """Writes half of the second chunk and then fails, like a full disk."""
+
+    def __init__(self, f):
+        self._f = f
+        self.writes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._f.close()
+
+    def write(self, data):
+        self.writes += 1
+        if self.writes == 2:
+            self._f.write(data[: len(data) // 2])
+            self._f.flush()
+            raise OSError("No space left on device")
+        return self._f.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self._f, name)
+
+
+def test_failed_incremental_export_is_retried_without_duplicates(tmp_path):
+    monitor = URLMetadataMonitor()
+    target = tmp_path / "metrics.jsonl"
+    for i in range(1, 8):
+        monitor._add_metric(_metric(i))
+
+    module = sys.modules[URLMetadataMonitor.__module__]
+    failing_open = lambda *a, **k: _FailingFile(builtins.open(*a, **k))  # noqa: E731
+    with patch.object(module, "open", failing_open, create=True):
+        with pytest.raises(OSError):
+            monitor.export_metrics_incremental(target, chunk_rows=3)
+    # The complete first chunk stays, the torn second one is removed
+    assert len(target.read_text().splitlines()) == 3
+
+    assert monitor.export_metrics_incremental(target, chunk_rows=3) == {"validation": 7}
+    lines = [json.loads(line) for line in target.read_text().splitlines()]
+    assert [line["correlation_id"] for line in lines] == [
+        f"req-{i}" for i in range(1, 8)
+    ]
+
+
+def test_incremental_export_skips_trimmed_rows():
+    store = ColumnarMetricStore(URLMetric)
+    for i in range(10):
+        store["validation"].append(_metric(i))
+    store.drop_before((NOW - timedelta(seconds=100 - 6)).timestamp())
+
+    records, next_seq = store["validation"].records(2, 100)
+    assert next_seq == store["validation"].next_seq == 10
+    assert [r["correlation_id"] for r in records] == [f"req-{i}" for i in range(6, 10)]
@@ -0,0 +1,99 @@
+"""
+Unit tests for the time-bucketed aggregates in URLMetadataMonitor.
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from btc_max_knowledge_agent.monitoring.url_metadata_monitor import (
+    URLMetadataMonitor,
+)
+from monitoring.url_metadata_monitor import MetricRing, URLMetric
+
+
+def _metric(op, success, duration, minutes_ago=0.0, url=None, error_type=None):
+    return URLMetric(
+        timestamp=datetime.now(timezone.utc) - timedelta(minutes=minutes_ago),
+        operation_type=op,
+        success=success,
+        duration_ms=duration,
+        url=url,
+        error_type=error_type,
+    )
+
+
+def test_ring_recycles_stale_slots():
+    ring = MetricRing(size=3)
+    ring.bucket_for(1).count = 5
+    ring.bucket_for(4).count = 1  # same index as slot 1
+
+    assert [b.slot for b in ring.window(0)] == [4]
+    assert ring.bucket_for(4).count == 1
+
+
+def test_windowed_rates_match_raw_metrics():
+    monitor = URLMetadataMonitor()
+    rng = random.Random(11)
+    for i in range(500):
+        broken = rng.random() < 0.2
+        monitor._add_metric(
+            _metric(
+                "validation",
+                success=not broken and rng.random() > 0.1,
+                duration=rng.uniform(10, 8000),
+                minutes_ago=rng.uniform(0, 180),
+                url=f"https://site{i}.example.com/",
+                error_type="broken_link" if broken else None,
+            )
+        )
+
+    cutoff = datetime.now(timezone.utc) - timedelta(minutes=60)
+    # Buckets cover whole minutes, so compare against the minute boundary
+    boundary = datetime.fromtimestamp(
+        monitor._slot(cutoff) * monitor.bucket_seconds, timezone.utc
+    )
+    window = [m for m in monitor.metrics_store["validation"] if m.timestamp >= boundary]
+
+    failure_rate = sum(not m.success for m in window) / len(window)
+    broken_rate = sum(m.error_type == "broken_link" for m in window) / len(window)
+    assert monitor._calculate_failure_rate("validation", cutoff) == pytest.approx(
+        failure_rate
+    )
+    assert monitor._calculate_broken_links_rate(cutoff) == pytest.approx(broken_rate)
+
+    durations = sorted(m.duration_ms for m in window)
+    p95 = durations[int(round(0.95 * (len(durations) - 1)))]
+    assert monitor._calculate_response_time_percentile(95, cutoff) == pytest.approx(
+        p95, rel=0.05
+    )
+
+
+def test_hourly_summary_from_buckets_ignores_old_and_non_finite():
+    monitor = URLMetadataMonitor()
+    monitor._add_metric(_metric("upload", True, 100.0))
+    monitor._add_metric(_metric("upload", True, 300.0))
+    monitor._add_metric(_metric("upload", False, float("nan")))
+    monitor._add_metric(_metric("upload", True, 50.0, minutes_ago=120))
+
+    summary = monitor.generate_hourly_summary()
+    upload = summary["operations"]["upload"]
+
+    assert (upload["total"], upload["successes"], upload["failures"]) == (3, 2, 1)
+    assert upload["avg_duration_ms"] == 200.0
+    assert (upload["min_duration_ms"], upload["max_duration_ms"]) == (100.0, 300.0)
+    assert summary["performance_distribution"]["fast"] == 2
+
+
+def test_retention_trim_is_amortized():
+    monitor = URLMetadataMonitor(metrics_retention_hours=1, cleanup_every=10)
+    for _ in range(5):
+        monitor._add_metric(_metric("validation", True, 10.0, minutes_ago=90))
+    monitor._add_metric(_metric("validation", True, 10.0))
+    assert len(monitor.metrics_store["validation"]) == 6  # not trimmed yet
+
+    for _ in range(4):
+        monitor._add_metric(_metric("validation", True, 10.0))
+    assert len(monitor.metrics_store["validation"]) == 5
+    assert monitor._records_since_cleanup == 0
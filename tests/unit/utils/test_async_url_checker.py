@@ -0,0 +1,174 @@
+"""
+Unit tests for the pooled asynchronous URL accessibility checker.
+"""
+
+import asyncio
+import socket
+import threading
+import time
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from btc_max_knowledge_agent.utils import async_url_checker
+from btc_max_knowledge_agent.utils.async_url_checker import (
+    AsyncURLChecker,
+    check_urls_accessibility_async,
+)
+
+
+def _app():
+    peers = set()
+
+    async def ok(request):
+        peers.add(request.transport.get_extra_info("peername"))
+        return web.Response(text="ok")
+
+    async def missing(request):
+        return web.Response(status=404)
+
+    async def no_head(request):
+        if request.method == "HEAD":
+            return web.Response(status=405)
+        return web.Response(text="body")
+
+    async def drops_head(request):
+        if request.method == "HEAD":
+            request.transport.close()
+        return web.Response(text="body")
+
+    async def loop(request):
+        raise web.HTTPFound("/loop")
+
+    app = web.Application()
+    app.router.add_route("*", "/ok/{n}", ok)
+    app.router.add_route("*", "/missing", missing)
+    app.router.add_route("*", "/no-head", no_head)
+    app.router.add_route("*", "/drops-head", drops_head)
+    app.router.add_route("*", "/loop", loop)
+    return app, peers
+
+
+@pytest.mark.asyncio
+async def test_results_statuses_and_connection_reuse():
+    app, peers = _app()
+    async with TestServer(app) as server:
+        base = str(server.make_url(""))
+        urls = [f"{base}/ok/{n}" for n in range(20)] + [
+            f"{base}/missing",
+            f"{base}/no-head",
+            f"{base}/loop",
+            "ftp://example.com/file",
+        ]
+
+        async with AsyncURLChecker(
+            limit_per_host=2, max_redirects=3, use_cache=False
+        ) as checker:
+            results = {r.url: r async for r in checker.iter_results(urls)}
+
+    assert all(results[f"{base}/ok/{n}"].accessible for n in range(20))
+    assert results[f"{base}/missing"].error_type == "not_found"
+    assert results[f"{base}/no-head"].accessible
+    assert results[f"{base}/no-head"].method == "GET"
+    assert results[f"{base}/loop"].error_type == "too_many_redirects"
+    assert results["ftp://example.com/file"].error_type == "invalid_format"
+    # 20 requests over at most 2 pooled connections
+    assert len(peers) <= 2
+
+
+def test_sync_wrapper():
+    async def serve_and_check():
+        async with TestServer(_app()[0]) as server:
+            base = str(server.make_url(""))
+            loop = asyncio.get_running_loop()
+            return base, await loop.run_in_executor(
+                None,
+                lambda: check_urls_accessibility_async(
+                    [f"{base}/ok/1", f"{base}/missing"], use_cache=False
+                ),
+            )
+
+    base, results = asyncio.run(serve_and_check())
+    assert results == {f"{base}/ok/1": True, f"{base}/missing": False}
+
+
+def _closed_port_url():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}/gone"
+
+
+@pytest.mark.asyncio
+async def test_get_fallback_only_for_dropped_head():
+    refused = _closed_port_url()
+    async with TestServer(_app()[0]) as server:
+        dropped = str(server.make_url("/drops-head"))
+        async with AsyncURLChecker(use_cache=False) as checker:
+            methods = []
+            request = checker._request
+
+            async def counting_request(method, url):
+                methods.append((method, url))
+                return await request(method, url)
+
+            checker._request = counting_request
+            results = {r.url: r for r in await checker.check_many([dropped, refused])}
+
+    assert results[dropped].accessible and results[dropped].method == "GET"
+    assert results[refused].error_type == "request_failed"
+    assert [m for m, url in methods if url == refused] == ["HEAD"]
+
+
+@pytest.mark.asyncio
+async def test_body_is_not_downloaded_when_range_is_ignored():
+    streamed = []
+
+    async def ignores_range(request):
+        # Answers HEAD with 405 and streams a large body despite Range
+        if request.method == "HEAD":
+            return web.Response(status=405)
+        response = web.StreamResponse()
+        await response.prepare(request)
+        try:
+            for _ in range(500):
+                await response.write(b"x" * 65536)
+                streamed.append(1)
+                await asyncio.sleep(0.01)
+        except ConnectionError:
+            pass
+        return response
+
+    app = web.Application()
+    app.router.add_route("*", "/ignores-range", ignores_range)
+    async with TestServer(app) as server:
+        async with AsyncURLChecker(use_cache=False) as checker:
+            result = await checker.check(str(server.make_url("/ignores-range")))
+        await asyncio.sleep(0.05)
+
+    assert result.accessible and result.method == "GET"
+    assert len(streamed) < 50
+
+
+@pytest.mark.asyncio
+async def test_private_address_lookups_respect_concurrency(monkeypatch):
+    lock = threading.Lock()
+    in_flight, peak = [0], [0]
+
+    def slow_lookup(host):
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        time.sleep(0.02)
+        with lock:
+            in_flight[0] -= 1
+        return None
+
+    monkeypatch.setattr(async_url_checker, "find_private_address", slow_lookup)
+    async with TestServer(_app()[0]) as server:
+        urls = [str(server.make_url(f"/ok/{n}")) for n in range(12)]
+        async with AsyncURLChecker(concurrency=2, use_cache=False) as checker:
+            results = await checker.check_many(urls)
+
+    assert all(r.accessible for r in results)
+    assert peak[0] <= 2
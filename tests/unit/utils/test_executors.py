@@ -0,0 +1,141 @@
+"""
+Unit tests for the shared executor registry.
+"""
+
+import importlib
+import threading
+import time
+
+import pytest
+
+from btc_max_knowledge_agent.utils import executors, url_utils
+from btc_max_knowledge_agent.utils.executors import ExecutorRegistry, get_executor
+
+
+@pytest.fixture
+def registry():
+    registry = ExecutorRegistry({"io": 4, "cpu": 2, "background": 1})
+    yield registry
+    registry.shutdown()
+
+
+def test_pools_are_shared_and_sized(registry):
+    assert registry.get("io") is registry.get("io")
+    assert registry.get("cpu").max_workers == 2
+    with pytest.raises(KeyError):
+        registry.get("gpu")
+
+
+def test_stats_report_queue_depth_and_utilization(registry):
+    pool = registry.get("background")
+    release = threading.Event()
+    futures = [pool.submit(release.wait) for _ in range(3)]
+    time.sleep(0.05)
+
+    stats = registry.get_stats()["background"]
+    assert stats["active"] == 1
+    assert stats["queue_depth"] == 2
+    assert stats["utilization"] == 1.0
+
+    release.set()
+    for future in futures:
+        future.result(timeout=1)
+    stats = registry.get_stats()["background"]
+    assert (stats["active"], stats["queue_depth"], stats["completed"]) == (0, 0, 3)
+
+
+@pytest.mark.parametrize("has_cancel_futures", [True, False])
+def test_shutdown_without_wait_cancels_queued_work(monkeypatch, has_cancel_futures):
+    monkeypatch.setattr(executors, "_HAS_CANCEL_FUTURES", has_cancel_futures)
+    registry = ExecutorRegistry({"background": 1})
+    pool = registry.get("background")
+    release = threading.Event()
+    running = pool.submit(release.wait)
+    queued = [pool.submit(time.sleep, 0) for _ in range(3)]
+    time.sleep(0.05)
+
+    registry.shutdown(wait=False)
+    release.set()
+
+    assert running.result(5) is True
+    assert all(future.cancelled() for future in queued)
+
+
+def test_map_unordered_limits_in_flight_items(registry):
+    pool = registry.get("io")
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def work(item):
+        with lock:
+            running.append(item)
+            peak.append(len(running))
+        time.sleep(0.01)
+        with lock:
+            running.remove(item)
+        return item * 2
+
+    results = dict(
+        (item, future.result())
+        for item, future in pool.map_unordered(work, range(10), max_in_flight=2)
+    )
+
+    assert results == {i: i * 2 for i in range(10)}
+    assert max(peak) <= 2
+
+
+def test_nested_map_on_same_pool_runs_inline(registry):
+    pool = registry.get("background")
+
+    def outer(item):
+        inner = pool.map_unordered(lambda x: x + 1, [item, item])
+        return sum(future.result() for _, future in inner)
+
+    [(_, future)] = list(pool.map_unordered(outer, [1]))
+    assert future.result(timeout=1) == 4
+
+
+def test_periodic_task_runs_on_background_pool(registry):
+    ran = threading.Event()
+    thread_names = []
+
+    def job():
+        thread_names.append(threading.current_thread().name)
+        ran.set()
+
+    task = registry.schedule_periodic("probe", job, interval=0.01)
+    assert registry.get_stats()["periodic_tasks"] == ["probe"]
+    assert ran.wait(timeout=1)
+    task.cancel()
+
+    assert thread_names[0].startswith("background-pool")
+
+
+def test_batch_validation_uses_shared_pool():
+    submitted = get_executor("cpu").get_stats()["submitted"]
+    urls = [f"https://site{i}.example.com/" for i in range(5)]
+
+    results = url_utils.validate_url_batch(urls, max_workers=2)
+
+    assert all(results[url]["valid"] for url in urls)
+    assert get_executor("cpu").get_stats()["submitted"] - submitted == 5
+
+
+def test_every_import_path_shares_one_set_of_pools():
+    # The collector and web app reach src/utils under a second package name
+    legacy_url_utils = importlib.import_module("src.utils.url_utils")
+    legacy_checker = importlib.import_module("src.utils.async_url_checker")
+    monitor = importlib.import_module("monitoring.url_metadata_monitor")
+    from btc_max_knowledge_agent.utils import async_url_checker
+
+    assert legacy_url_utils is not url_utils
+    for module in (
+        url_utils,
+        legacy_url_utils,
+        async_url_checker,
+        legacy_checker,
+        monitor,
+    ):
+        assert module.get_executor("cpu") is get_executor("cpu")
+        assert module.get_executor("io") is get_executor("io")
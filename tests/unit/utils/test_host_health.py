@@ -0,0 +1,159 @@
+"""
+Unit tests for per-host health tracking and circuit breaking.
+"""
+
+import importlib
+from http.client import RemoteDisconnected
+from unittest.mock import MagicMock, patch
+
+import requests
+from urllib3.exceptions import ProtocolError
+
+from btc_max_knowledge_agent.utils import url_utils
+from btc_max_knowledge_agent.utils.host_health import (
+    HostHealthConfig,
+    HostHealthTracker,
+    host_health_tracker,
+    host_of,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_tracker(clock):
+    config = HostHealthConfig(
+        failure_threshold=3, cooldown_seconds=60, max_cooldown_seconds=200
+    )
+    return HostHealthTracker(config, clock=clock)
+
+
+def test_circuit_opens_after_consecutive_failures():
+    tracker = make_tracker(FakeClock())
+    for _ in range(2):
+        tracker.record_failure("down.example.com", "ConnectTimeout")
+    tracker.record_success("down.example.com", latency_ms=50)
+    for _ in range(2):
+        tracker.record_failure("down.example.com", "ConnectTimeout")
+    assert tracker.allow_request("down.example.com")
+
+    tracker.record_failure("down.example.com", "ConnectTimeout")
+
+    assert not tracker.allow_request("down.example.com")
+    assert tracker.allow_request("up.example.com")
+    stats = tracker.get_stats()
+    assert stats["open_circuits"] == 1
+    assert stats["unhealthy_hosts"]["down.example.com"]["retry_in_seconds"] == 60
+
+
+def test_half_open_allows_single_trial_and_backs_off():
+    clock = FakeClock()
+    tracker = make_tracker(clock)
+    for _ in range(3):
+        tracker.record_failure("flaky.example.com")
+
+    clock.now = 61
+    assert tracker.allow_request("flaky.example.com")  # the trial
+    assert not tracker.allow_request("flaky.example.com")  # others wait
+
+    tracker.record_failure("flaky.example.com", "HTTP 503")
+    assert tracker.get_host("flaky.example.com")["retry_in_seconds"] == 120
+
+    clock.now = 61 + 121
+    assert tracker.allow_request("flaky.example.com")
+    tracker.record_success("flaky.example.com", latency_ms=20)
+    assert tracker.get_host("flaky.example.com")["state"] == "closed"
+    assert tracker.allow_request("flaky.example.com")
+
+
+def test_tracked_hosts_are_bounded():
+    tracker = HostHealthTracker(HostHealthConfig(max_hosts=10))
+    for i in range(50):
+        tracker.record_success(f"host{i}.example.com")
+    assert tracker.get_stats()["tracked_hosts"] == 10
+
+
+def test_host_of_normalizes_case_and_port():
+    assert host_of("https://Bitcoin.ORG:443/en/") == "bitcoin.org"
+    assert host_of("not a url") is None
+
+
+def test_check_url_accessibility_short_circuits_down_host():
+    error = requests.exceptions.ConnectionError("connection refused")
+    with patch("requests.Session.head", side_effect=error) as head:
+        for i in range(5):
+            assert not url_utils.check_url_accessibility(
+                f"https://down.example.com/page{i}", max_retries=0
+            )
+
+    assert head.call_count == host_health_tracker.config.failure_threshold
+    assert host_health_tracker.get_host("down.example.com")["state"] == "open"
+
+
+def test_client_errors_do_not_trip_circuit():
+    response = MagicMock(status_code=404, headers={}, url="https://example.org/x")
+    with patch("requests.Session.head", return_value=response) as head:
+        for i in range(5):
+            url_utils.check_url_accessibility(f"https://example.org/missing{i}")
+
+    assert head.call_count == 5
+    assert host_health_tracker.get_host("example.org")["state"] == "closed"
+
+
+def test_monitor_retries_with_get_only_when_head_is_unsupported():
+    from btc_max_knowledge_agent.monitoring.url_metadata_monitor import (
+        URLMetadataMonitor,
+    )
+
+    dropped = requests.exceptions.ConnectionError(
+        ProtocolError("Connection aborted.", RemoteDisconnected("closed"))
+    )
+    head_results = {
+        "https://no-head.example.com/": MagicMock(status_code=405),
+        "https://dropped.example.com/": dropped,
+        "https://slow.example.com/": requests.exceptions.Timeout("timed out"),
+        "https://refused.example.com/": requests.exceptions.ConnectionError(
+            "connection refused"
+        ),
+    }
+
+    def head(url, **kwargs):
+        result = head_results[url]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    monitor = URLMetadataMonitor()
+    try:
+        with patch("requests.head", side_effect=head), patch(
+            "requests.get", return_value=MagicMock(status_code=200)
+        ) as get:
+            results = {
+                url: monitor.check_url_accessibility(url) for url in head_results
+            }
+    finally:
+        monitor.shutdown()
+
+    assert {c.args[0] for c in get.call_args_list} == {
+        "https://no-head.example.com/",
+        "https://dropped.example.com/",
+    }
+    assert results["https://no-head.example.com/"] == (True, None)
+    assert results["https://dropped.example.com/"] == (True, None)
+    assert not results["https://slow.example.com/"][0]
+    assert not results["https://refused.example.com/"][0]
+
+
+def test_every_import_path_shares_one_tracker():
+    legacy_url_utils = importlib.import_module("src.utils.url_utils")
+    legacy_checker = importlib.import_module("src.utils.async_url_checker")
+    monitor = importlib.import_module("monitoring.url_metadata_monitor")
+    scanner = importlib.import_module("knowledge.link_rot_scanner")
+
+    for module in (url_utils, legacy_url_utils, legacy_checker, monitor, scanner):
+        assert module.host_health_tracker is host_health_tracker
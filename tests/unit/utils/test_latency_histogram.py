@@ -0,0 +1,88 @@
+"""
+Unit tests for the mergeable latency histogram.
+"""
+
+import json
+import random
+import threading
+
+import pytest
+
+from btc_max_knowledge_agent.utils.latency_histogram import (
+    LatencyHistogram,
+    merge_histograms,
+)
+
+
+def _exact(sorted_values, p):
+    return sorted_values[int(round(p / 100 * (len(sorted_values) - 1)))]
+
+
+def test_percentiles_within_relative_error():
+    rng = random.Random(3)
+    values = [rng.lognormvariate(3, 1.5) for _ in range(20000)]
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+
+    values.sort()
+    for p in (50, 90, 99):
+        assert histogram.percentile(p) == pytest.approx(_exact(values, p), rel=0.02)
+    assert histogram.percentile(0) == values[0]
+    assert histogram.percentile(100) == values[-1]
+    assert histogram.mean() == pytest.approx(sum(values) / len(values))
+    # Memory follows the dynamic range, not the sample count
+    assert len(histogram._counts) < 600
+
+
+def test_merged_workers_match_single_histogram():
+    rng = random.Random(5)
+    values = [rng.expovariate(1 / 200) for _ in range(9000)]
+    single = LatencyHistogram()
+    workers = [LatencyHistogram() for _ in range(3)]
+    for i, value in enumerate(values):
+        single.record(value)
+        workers[i % 3].record(value)
+
+    # Ship each worker's histogram as JSON, as a metrics endpoint would
+    shipped = [
+        LatencyHistogram.from_dict(json.loads(json.dumps(w.to_dict()))) for w in workers
+    ]
+    merged = merge_histograms(shipped)
+
+    assert merged.count == single.count
+    assert merged._counts == single._counts
+    assert merged.percentiles(50, 90, 99) == single.percentiles(50, 90, 99)
+
+
+def test_ignores_non_finite_and_handles_zero():
+    histogram = LatencyHistogram()
+    for value in (0.0, float("nan"), float("inf"), 5.0, 0.0):
+        histogram.record(value)
+
+    assert histogram.count == 3
+    assert histogram.percentile(50) == 0.0
+    assert histogram.summary()["max"] == 5.0
+    assert LatencyHistogram().percentile(50) is None
+
+
+def test_concurrent_records_are_not_lost():
+    histogram = LatencyHistogram()
+
+    def work():
+        for i in range(5000):
+            histogram.record(float(i % 100 + 1))
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert histogram.count == 20000
+    assert sum(histogram._counts.values()) == 20000
+
+
+def test_merge_rejects_different_precision():
+    with pytest.raises(ValueError):
+        LatencyHistogram(precision_bits=5).merge(LatencyHistogram(precision_bits=7))
@@ -0,0 +1,98 @@
+"""
+Unit tests for the bounded LRU+TTL caches used by URL validation.
+"""
+
+import threading
+
+import pytest
+
+from btc_max_knowledge_agent.utils import url_utils
+from btc_max_knowledge_agent.utils.lru_cache import LRUCache, ShardedLRUCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LRUCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.put("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = LRUCache(max_entries=10, ttl_seconds=60, clock=clock)
+    cache.put("url", False)
+    cache.put("short", True, ttl_seconds=5)
+
+    clock.now = 10
+    assert cache.get("url") is False
+    assert cache.get("short") is None
+
+    clock.now = 61
+    assert cache.get("url") is None
+    stats = cache.get_stats()
+    assert stats["expirations"] == 2
+    assert stats["hits"] == 1 and stats["misses"] == 2
+    assert len(cache) == 0
+
+
+def test_sharded_cache_respects_total_capacity():
+    cache = ShardedLRUCache(max_entries=64, shards=8)
+    for i in range(1000):
+        cache.put(f"https://example.com/{i}", True)
+
+    stats = cache.get_stats()
+    assert len(cache) <= 64
+    assert stats["evictions"] == 1000 - stats["size"]
+    assert stats["shards"] == 8
+
+
+def test_sharded_cache_is_thread_safe():
+    cache = ShardedLRUCache(max_entries=500, shards=4)
+
+    def worker(offset):
+        for i in range(2000):
+            key = f"k{(offset + i) % 700}"
+            if cache.get(key) is None:
+                cache.put(key, i)
+
+    threads = [threading.Thread(target=worker, args=(n * 100,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = cache.get_stats()
+    assert stats["hits"] + stats["misses"] == 8 * 2000
+    assert len(cache) <= 500
+
+
+def test_invalid_capacity_rejected():
+    with pytest.raises(ValueError):
+        LRUCache(max_entries=0)
+
+
+def test_url_validation_cache_counters():
+    url_utils.clear_validation_cache()
+    before = url_utils.get_validation_cache_stats()
+
+    url_utils._cache_validation("https://example.com/a", True)
+    assert url_utils._get_cached_validation("https://example.com/a") is True
+    assert url_utils._get_cached_validation("https://example.com/missing") is None
+
+    after = url_utils.get_validation_cache_stats()
+    assert after["hits"] - before["hits"] == 1
+    assert after["misses"] - before["misses"] == 1
+    url_utils.clear_validation_cache()
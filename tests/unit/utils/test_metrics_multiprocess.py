@@ -0,0 +1,124 @@
+"""
+Unit tests for multi-process metrics aggregation.
+"""
+
+import multiprocessing
+import os
+import threading
+
+import pytest
+
+from btc_max_knowledge_agent.utils import metrics_registry
+from btc_max_knowledge_agent.utils.metrics_multiprocess import (
+    MmapValueFile,
+    mark_process_dead,
+    read_file,
+)
+from btc_max_knowledge_agent.utils.metrics_registry import REGISTRY
+
+requires_fork = pytest.mark.skipif(
+    not hasattr(os, "fork"), reason="worker processes are forked"
+)
+
+
+@pytest.fixture
+def multiprocess_dir(tmp_path):
+    metrics_registry.enable_multiprocess(str(tmp_path))
+    yield tmp_path
+    metrics_registry.disable_multiprocess()
+
+
+def _worker(requests, latencies, connection):
+    counter = REGISTRY.counter("mp_test_requests_total", "Requests", ["worker"])
+    gauge = REGISTRY.gauge("mp_test_active", "Active")
+    histogram = REGISTRY.histogram("mp_test_seconds", "Latency", buckets=(0.1, 1.0))
+    for _ in range(requests):
+        counter.labels("any").inc()
+    gauge.inc(2)
+    for value in latencies:
+        histogram.observe(value)
+    connection.send(os.getpid())
+    connection.close()
+
+
+def test_value_file_round_trip_and_growth(tmp_path):
+    path = tmp_path / "counter_1.db"
+    value_file = MmapValueFile(path)
+    keys = [f"key-{i}-" + "x" * 50 for i in range(2000)]  # forces a resize
+    for i, key in enumerate(keys):
+        value_file.write(key, float(i))
+    value_file.write(keys[0], 42.0)
+    value_file.close()
+
+    values = dict(read_file(path))
+    assert len(values) == 2000
+    assert values[keys[0]] == 42.0
+    assert values[keys[-1]] == 1999.0
+
+    reopened = MmapValueFile(path)
+    reopened.write(keys[1], 7.0)
+    reopened.close()
+    assert dict(read_file(path))[keys[1]] == 7.0
+
+
+def test_concurrent_appends_and_growth_keep_every_value(multiprocess_dir):
+    store = metrics_registry._store
+
+    def write(kind, thread):
+        for i in range(500):
+            store.write(kind, f"{thread}-{i}-" + "x" * 60, float(i))
+
+    threads = [
+        threading.Thread(target=write, args=(kind, n))
+        for kind in ("counter", "histogram")
+        for n in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    merged = store.merged()
+    for kind in ("counter", "histogram"):
+        assert len(merged[kind]) == 2000
+        assert merged[kind]["3-499-" + "x" * 60] == 499.0
+
+
+@requires_fork
+def test_workers_are_merged_on_read(multiprocess_dir):
+    context = multiprocessing.get_context("fork")
+    pids = []
+    for requests, latencies in ((3, [0.05, 0.5]), (4, [2.0])):
+        parent, child = context.Pipe()
+        process = context.Process(target=_worker, args=(requests, latencies, child))
+        process.start()
+        pids.append(parent.recv())
+        process.join(10)
+        assert process.exitcode == 0
+
+    snapshot = REGISTRY.snapshot()
+    requests = snapshot["btc_agent_mp_test_requests"]["series"]
+    assert requests == {'{worker="any"}': 7.0}
+    assert snapshot["btc_agent_mp_test_active"]["series"][""] == 4.0
+    latency = snapshot["btc_agent_mp_test_seconds"]["series"][""]
+    assert latency["count"] == 3
+    assert latency["sum"] == pytest.approx(2.55)
+    assert latency["buckets"] == {"0.1": 1, "1.0": 2, "+Inf": 3}
+
+    text = REGISTRY.render()
+    assert 'btc_agent_mp_test_requests_total{worker="any"} 7.0' in text
+    assert 'btc_agent_mp_test_seconds_bucket{le="+Inf"} 3.0' in text
+
+    # An exited worker's gauges go away, its counters stay
+    mark_process_dead(pids[0], str(multiprocess_dir))
+    snapshot = REGISTRY.snapshot()
+    assert snapshot["btc_agent_mp_test_active"]["series"][""] == 2.0
+    assert snapshot["btc_agent_mp_test_requests"]["series"] == requests
+
+
+def test_this_process_is_included(multiprocess_dir):
+    counter = REGISTRY.counter("mp_test_local_total", "Local")
+    counter.inc(5)
+
+    assert REGISTRY.snapshot()["btc_agent_mp_test_local"]["series"][""] == 5.0
+    assert metrics_registry.multiprocess_enabled()
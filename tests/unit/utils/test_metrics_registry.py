@@ -0,0 +1,112 @@
+"""
+Unit tests for the metrics registry and its text exposition.
+"""
+
+import pytest
+
+from btc_max_knowledge_agent.utils.metrics_registry import (
+    OPENMETRICS_CONTENT_TYPE,
+    PROMETHEUS_CONTENT_TYPE,
+    REGISTRY,
+    MetricsRegistry,
+    render_metrics,
+)
+from btc_max_knowledge_agent.utils.multi_tier_audio_cache import (
+    CacheConfig,
+    MultiTierAudioCache,
+)
+
+
+def _sample(text, line_prefix):
+    for line in text.splitlines():
+        if line.startswith(line_prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+
+def test_counter_and_gauge_exposition():
+    registry = MetricsRegistry(namespace="t")
+    requests = registry.counter("requests_total", "Requests", ["result"])
+    requests.labels("hit").inc()
+    requests.labels(result="hit").inc(2)
+    requests.labels("miss").inc()
+    active = registry.gauge("active", 'Active "things"')
+    active.inc(3)
+    active.dec()
+
+    text = registry.render()
+
+    assert "# TYPE t_requests_total counter" in text
+    assert 't_requests_total{result="hit"} 3.0' in text
+    assert 't_requests_total{result="miss"} 1.0' in text
+    assert '# HELP t_active Active \\"things\\"' in text
+    assert "t_active 2.0" in text
+    assert registry.counter("requests_total", "Requests", ["result"]) is requests
+    with pytest.raises(ValueError):
+        requests.labels("hit").inc(-1)
+    with pytest.raises(ValueError):
+        requests.labels("a", "b")
+    with pytest.raises(ValueError):
+        registry.gauge("requests", "clash")
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry(namespace="")
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0, float("nan")):
+        latency.observe(value)
+
+    text = registry.render()
+
+    assert _sample(text, 'latency_seconds_bucket{le="0.1"}') == 2
+    assert _sample(text, 'latency_seconds_bucket{le="1.0"}') == 3
+    assert _sample(text, 'latency_seconds_bucket{le="+Inf"}') == 4
+    assert _sample(text, "latency_seconds_count") == 4
+    assert _sample(text, "latency_seconds_sum") == pytest.approx(3.65)
+
+
+def test_openmetrics_negotiation():
+    body, content_type = render_metrics("text/plain")
+    assert content_type == PROMETHEUS_CONTENT_TYPE
+    assert "# EOF" not in body
+
+    body, content_type = render_metrics(
+        "application/openmetrics-text; version=1.0.0,text/plain;q=0.5"
+    )
+    assert content_type == OPENMETRICS_CONTENT_TYPE
+    assert body.endswith("# EOF\n")
+
+
+def test_cache_operations_update_counters(tmp_path):
+    cache = MultiTierAudioCache(
+        CacheConfig(backend="multi-tier", persistent_path=str(tmp_path))
+    )
+    events = REGISTRY.get("audio_cache_events_total")
+    hits = events.labels("memory", "hits")
+    puts = events.labels("memory", "puts")
+    before_hits, before_puts = hits.value, puts.value
+
+    cache.put("metrics registry text", b"audio")
+    assert cache.get("metrics registry text") == b"audio"
+
+    assert puts.value == before_puts + 1
+    assert hits.value == before_hits + 1
+    series = 'btc_agent_audio_cache_operation_seconds_count{tier="memory",op="get"}'
+    assert _sample(REGISTRY.render(), series) >= 1
+
+
+def test_metrics_endpoint_serves_registry():
+    from fastapi.testclient import TestClient
+
+    from src.web.bitcoin_assistant_api import app
+
+    client = TestClient(app)
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE btc_agent_sessions_active gauge" in response.text
+
+    response = client.get(
+        "/metrics", headers={"accept": "application/openmetrics-text"}
+    )
+    assert response.headers["content-type"].startswith("application/openmetrics-text")
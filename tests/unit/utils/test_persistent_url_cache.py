@@ -0,0 +1,164 @@
+"""
+Unit tests for the cross-process persistent URL cache.
+"""
+
+import importlib
+import multiprocessing
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from btc_max_knowledge_agent.utils import persistent_url_cache, url_utils
+from btc_max_knowledge_agent.utils.lru_cache import ShardedLRUCache
+from btc_max_knowledge_agent.utils.persistent_url_cache import (
+    PersistentURLCache,
+    get_persistent_url_cache,
+)
+
+
+def _write_from_child(path):
+    PersistentURLCache(path).put("accessibility", "https://child.example.com", True)
+
+
+@pytest.fixture
+def shared_cache(tmp_path, monkeypatch):
+    """Point the module-level shared cache at a temporary database."""
+    monkeypatch.setenv("URL_PERSISTENT_CACHE_PATH", str(tmp_path / "url_cache.db"))
+    monkeypatch.setattr(persistent_url_cache, "_persistent_cache", None)
+    monkeypatch.setattr(persistent_url_cache, "_persistent_cache_path", None)
+    url_utils.clear_validation_cache()
+    yield get_persistent_url_cache()
+    url_utils.clear_validation_cache()
+
+
+def test_put_get_and_wal_mode(tmp_path):
+    cache = PersistentURLCache(tmp_path / "cache.db")
+    cache.put("validation", "https://example.com", True)
+    cache.put("accessibility", "https://gone.example.com", False, "HTTP 404")
+
+    assert cache.get("validation", "https://example.com") == (True, None)
+    assert cache.get("accessibility", "https://gone.example.com") == (False, "HTTP 404")
+    assert cache.get("accessibility", "https://example.com") is None
+    mode = cache._connect().execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode.lower() == "wal"
+
+
+def test_failures_use_shorter_negative_ttl(tmp_path):
+    cache = PersistentURLCache(
+        tmp_path / "cache.db", ttl_seconds=60, negative_ttl_seconds=0.05
+    )
+    cache.put("accessibility", "https://up.example.com", True)
+    cache.put("accessibility", "https://down.example.com", False, "timeout")
+
+    time.sleep(0.1)
+
+    assert cache.get("accessibility", "https://up.example.com") == (True, None)
+    assert cache.get("accessibility", "https://down.example.com") is None
+    assert cache.purge_expired() == 1
+
+
+def test_get_many_and_stats(tmp_path):
+    cache = PersistentURLCache(tmp_path / "cache.db")
+    for i in range(3):
+        cache.put("validation", f"https://example.com/{i}", i != 1)
+
+    urls = [f"https://example.com/{i}" for i in range(5)]
+    found = cache.get_many("validation", urls)
+
+    assert found == {
+        "https://example.com/0": (True, None),
+        "https://example.com/1": (False, None),
+        "https://example.com/2": (True, None),
+    }
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (3, 2, 3)
+
+
+def test_results_are_shared_between_processes(tmp_path):
+    path = tmp_path / "cache.db"
+    cache = PersistentURLCache(path)
+
+    process = multiprocessing.get_context("fork").Process(
+        target=_write_from_child, args=(path,)
+    )
+    process.start()
+    process.join(10)
+
+    assert process.exitcode == 0
+    assert cache.get("accessibility", "https://child.example.com") == (True, None)
+
+
+def test_disabled_without_environment(monkeypatch):
+    monkeypatch.delenv("URL_PERSISTENT_CACHE_PATH", raising=False)
+    assert get_persistent_url_cache() is None
+
+
+def test_url_utils_falls_back_to_shared_cache(shared_cache):
+    url_utils._cache_validation("https://bitcoin.org/en/", True)
+    url_utils.clear_validation_cache()  # simulate another worker process
+
+    assert url_utils._get_cached_validation("https://bitcoin.org/en/") is True
+    assert shared_cache.get_stats()["hits"] == 1
+
+
+def test_shared_failures_keep_the_negative_ttl_locally(shared_cache, monkeypatch):
+    now = [0.0]
+    local = ShardedLRUCache(100, ttl_seconds=3600, clock=lambda: now[0])
+    monkeypatch.setattr(url_utils, "_validation_cache", local)
+    for url, ok in (("down", False), ("batch-down", False), ("batch-up", True)):
+        shared_cache.put("validation", f"https://{url}.example.com", ok)
+
+    assert url_utils._get_cached_validation("https://down.example.com") is False
+    batch = ["https://batch-down.example.com", "https://batch-up.example.com"]
+    assert [r["valid"] for r in url_utils.validate_url_batch(batch).values()] == [
+        False,
+        True,
+    ]
+
+    now[0] = shared_cache.negative_ttl_seconds + 1
+    assert local.get("https://down.example.com") is None
+    assert local.get("https://batch-down.example.com") is None
+    assert local.get("https://batch-up.example.com") is True
+
+
+def test_configured_cache_is_returned_without_locking(shared_cache, monkeypatch):
+    lock = MagicMock()
+    monkeypatch.setattr(persistent_url_cache, "_persistent_cache_lock", lock)
+
+    assert get_persistent_url_cache() is shared_cache
+    lock.__enter__.assert_not_called()
+
+
+def test_accessibility_check_reuses_shared_result(shared_cache):
+    shared_cache.put("accessibility", "https://bitcoin.org/en/", True)
+
+    with patch.object(url_utils, "_probe_url_accessibility") as probe:
+        assert url_utils.check_url_accessibility("https://bitcoin.org/en/") is True
+    probe.assert_not_called()
+
+
+def test_monitor_reuses_shared_broken_link_result(shared_cache):
+    from btc_max_knowledge_agent.monitoring.url_metadata_monitor import (
+        URLMetadataMonitor,
+    )
+
+    shared_cache.put("accessibility", "https://gone.example.com", False, "HTTP 404")
+    monitor = URLMetadataMonitor()
+    try:
+        with patch("requests.head") as head:
+            result = monitor.check_url_accessibility("https://gone.example.com")
+        head.assert_not_called()
+        assert result == (False, "HTTP 404")
+        # The failure keeps the shared negative TTL rather than the local hour
+        assert "https://gone.example.com" not in monitor.broken_urls_cache
+    finally:
+        monitor.shutdown()
+
+
+def test_every_import_path_shares_one_cache():
+    legacy_url_utils = importlib.import_module("src.utils.url_utils")
+    checker = importlib.import_module("src.utils.async_url_checker")
+
+    for module in (url_utils, legacy_url_utils, checker):
+        assert module.get_persistent_url_cache is get_persistent_url_cache
@@ -0,0 +1,118 @@
+"""
+Unit tests for the staged pipeline framework.
+"""
+
+import threading
+import time
+
+import pytest
+
+from btc_max_knowledge_agent.utils.pipeline import PipelineStage, StagedPipeline
+
+
+def test_items_flow_through_all_stages():
+    pipeline = StagedPipeline(
+        [
+            PipelineStage("double", lambda x: x * 2, concurrency=3),
+            PipelineStage("inc", lambda x: x + 1, concurrency=2),
+        ]
+    )
+
+    result = pipeline.run(range(50))
+
+    assert sorted(result.outputs) == [x * 2 + 1 for x in range(50)]
+    assert result.errors == []
+    stages = result.stats["stages"]
+    assert stages["double"]["items_in"] == 50
+    assert stages["inc"]["items_out"] == 50
+
+
+def test_none_drops_and_fan_out_expands():
+    pipeline = StagedPipeline(
+        [
+            PipelineStage("even", lambda x: x if x % 2 == 0 else None),
+            PipelineStage("split", lambda x: [x, x], fan_out=True),
+        ]
+    )
+
+    result = pipeline.run(range(6))
+
+    assert sorted(result.outputs) == [0, 0, 2, 2, 4, 4]
+
+
+def test_batched_stage_receives_lists():
+    batches = []
+
+    def record(batch):
+        batches.append(len(batch))
+        return batch
+
+    pipeline = StagedPipeline(
+        [PipelineStage("batch", record, batch_size=10, batch_timeout=0.5)]
+    )
+
+    result = pipeline.run(range(25))
+
+    assert sorted(result.outputs) == list(range(25))
+    assert max(batches) <= 10
+    assert sum(batches) == 25
+
+
+def test_failures_are_isolated_and_reported():
+    def flaky(x):
+        if x == 3:
+            raise ValueError("bad item")
+        return x
+
+    pipeline = StagedPipeline([PipelineStage("flaky", flaky, concurrency=2)])
+
+    result = pipeline.run(range(5))
+
+    assert sorted(result.outputs) == [0, 1, 2, 4]
+    assert result.errors == [
+        {"stage": "flaky", "items": 1, "error": "bad item", "error_type": "ValueError"}
+    ]
+    assert result.stats["stages"]["flaky"]["failures"] == 1
+
+
+def test_slow_stage_applies_backpressure():
+    produced = []
+    release = threading.Event()
+
+    def slow(x):
+        release.wait(timeout=5)
+        return x
+
+    def source():
+        for i in range(100):
+            produced.append(i)
+            yield i
+
+    pipeline = StagedPipeline(
+        [
+            PipelineStage("fast", lambda x: x, queue_size=2),
+            PipelineStage("slow", slow, queue_size=2),
+        ]
+    )
+
+    runner = threading.Thread(target=pipeline.run, args=(source(),))
+    runner.start()
+    time.sleep(0.2)
+    # Bounded queues cap how far the producer can run ahead of the slow stage
+    assert len(produced) < 10
+    stats = pipeline.get_stats()
+    assert stats["running"]
+    assert stats["stages"]["slow"]["queue_depth"] <= 2
+
+    release.set()
+    runner.join(timeout=5)
+    assert len(produced) == 100
+
+
+def test_invalid_configuration():
+    with pytest.raises(ValueError):
+        StagedPipeline([])
+    with pytest.raises(ValueError):
+        PipelineStage("bad", lambda x: x, concurrency=0)
+    with pytest.raises(ValueError):
+        StagedPipeline([PipelineStage("a", str), PipelineStage("a", str)])
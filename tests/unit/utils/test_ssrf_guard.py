@@ -0,0 +1,107 @@
+"""
+Unit tests for the private-IP range matcher and the DNS resolution cache.
+"""
+
+import ipaddress
+import random
+import socket
+from unittest.mock import patch
+
+from btc_max_knowledge_agent.utils import url_utils
+from btc_max_knowledge_agent.utils.ssrf_guard import (
+    HostResolver,
+    IPRangeMatcher,
+    find_blocked_address,
+)
+
+
+def _fake_getaddrinfo(table, calls):
+    def getaddrinfo(host, port, proto=0):
+        calls.append(host)
+        if host not in table:
+            raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+        return [
+            (socket.AF_INET6 if ":" in a else socket.AF_INET, 1, 6, "", (a, 0))
+            for a in table[host]
+        ]
+
+    return getaddrinfo
+
+
+def test_matcher_agrees_with_network_membership():
+    matcher = IPRangeMatcher(url_utils.PRIVATE_IP_RANGES)
+    rng = random.Random(7)
+    samples = [ipaddress.IPv4Address(rng.getrandbits(32)) for _ in range(5000)]
+    samples += [ipaddress.IPv6Address(rng.getrandbits(128)) for _ in range(500)]
+    edges = ["10.0.0.0", "10.255.255.255", "11.0.0.0", "172.31.255.255"]
+    edges += ["172.32.0.0", "fc00::1", "fdff::1", "fe00::1", "::1", "::2"]
+    samples += [ipaddress.ip_address(a) for a in edges]
+
+    for address in samples:
+        expected = any(address in net for net in url_utils.PRIVATE_IP_RANGES)
+        assert (address in matcher) is expected, address
+
+
+def test_matcher_merges_overlaps_and_maps_ipv4_in_ipv6():
+    matcher = IPRangeMatcher(["10.0.0.0/8", "10.1.0.0/16", "11.0.0.0/8"])
+    assert matcher._starts[4] == [int(ipaddress.ip_address("10.0.0.0"))]
+    assert "11.200.0.1" in matcher
+    assert "::ffff:10.0.0.1" in matcher
+    assert "12.0.0.0" not in matcher
+    assert "not-an-ip" not in matcher
+
+
+def test_resolver_caches_lookups_and_failures():
+    calls = []
+    resolver = HostResolver(
+        getaddrinfo=_fake_getaddrinfo({"a.example.com": ["93.184.216.34"]}, calls)
+    )
+
+    for _ in range(3):
+        assert resolver.resolve("A.example.com") == (
+            ipaddress.ip_address("93.184.216.34"),
+        )
+        assert resolver.resolve("missing.example.com") == ()
+    assert resolver.resolve("127.0.0.1") == (ipaddress.ip_address("127.0.0.1"),)
+
+    assert calls == ["a.example.com", "missing.example.com"]
+
+
+def test_every_resolved_address_is_checked():
+    table = {
+        "mixed.example.com": ["93.184.216.34", "10.0.0.5"],
+        "public.example.com": ["93.184.216.34", "2606:2800:220:1::1"],
+        "local.example.com": ["127.0.0.1"],
+    }
+    resolver = HostResolver(getaddrinfo=_fake_getaddrinfo(table, []))
+    matcher = IPRangeMatcher(url_utils.PRIVATE_IP_RANGES)
+
+    assert str(find_blocked_address("mixed.example.com", resolver, matcher)) == (
+        "10.0.0.5"
+    )
+    assert find_blocked_address("public.example.com", resolver, matcher) is None
+    assert find_blocked_address("local.example.com", resolver, matcher) is not None
+    assert (
+        find_blocked_address(
+            "local.example.com", resolver, matcher, allow_loopback=True
+        )
+        is None
+    )
+
+
+def test_accessibility_check_refuses_private_resolution(monkeypatch):
+    monkeypatch.setenv("URL_RESOLVE_HOSTNAMES", "true")
+    calls = []
+    resolver = HostResolver(
+        getaddrinfo=_fake_getaddrinfo({"intranet.example.com": ["192.168.1.10"]}, calls)
+    )
+    with patch.object(url_utils, "_host_resolver", resolver), patch.object(
+        url_utils, "_probe_url_accessibility"
+    ) as probe:
+        for path in ("a", "b", "c"):
+            assert not url_utils.check_url_accessibility(
+                f"https://intranet.example.com/{path}"
+            )
+
+    probe.assert_not_called()
+    assert calls == ["intranet.example.com"]
@@ -0,0 +1,61 @@
+"""
+Unit tests for the precompiled text normalizer.
+"""
+
+import pytest
+
+from btc_max_knowledge_agent.utils.text_normalizer import (
+    clean_markdown_for_speech,
+    normalize_article_text,
+    normalize_pdf_text,
+    pdf_text_normalizer,
+)
+
+PDF_SAMPLE = (
+    "Bitcoin is a peer-to-\npeer  system.The network   \n\n\n\ntimestamps"
+    "\\ntransactions â\x80\x99s\x01 in 2009Satoshi"
+)
+
+
+def test_pdf_text_rules():
+    assert normalize_pdf_text(PDF_SAMPLE) == (
+        "Bitcoin is a peer-topeer system. The networktimestamps\n"
+        "transactions 's in 2 009 Satoshi"
+    )
+
+
+def test_pdf_text_line_endings_and_escapes():
+    # Escapes are expanded last, after camelCase spacing saw "nT" and "tF"
+    assert normalize_pdf_text("One.\r\nTwo\\r\\nThree\\tFour\r") == (
+        "One.\nTwo\n Three\t Four"
+    )
+
+
+@pytest.mark.parametrize("min_chunk_size", [1, 7, 64, 4096])
+def test_stream_matches_whole_text(min_chunk_size):
+    text = (PDF_SAMPLE + " and more words follow here, ending. ") * 20
+    chunks = [text[i : i + 5] for i in range(0, len(text), 5)]
+
+    streamed = "".join(
+        pdf_text_normalizer.normalize_stream(chunks, min_chunk_size=min_chunk_size)
+    )
+
+    assert streamed == normalize_pdf_text(text)
+
+
+def test_stream_of_whitespace_is_empty():
+    assert list(pdf_text_normalizer.normalize_stream([" ", "\n", "  "], 1)) == []
+
+
+def test_article_text_keeps_numbers_and_words_intact():
+    text = (
+        "Price hit  $100,000 in 2024.\r\n\r\n\r\n\r\nNext  â\x80\x9cquoteâ\x80\x9d \x07"
+    )
+    assert normalize_article_text(text) == 'Price hit $100,000 in 2024.\n\nNext "quote"'
+
+
+def test_markdown_for_speech():
+    text = (
+        "# Title\n**Bold** see [docs](https://x.org)\nSources:\n- item one\nResult 1: x"
+    )
+    assert clean_markdown_for_speech(text) == "Title. Bold see docs item one"
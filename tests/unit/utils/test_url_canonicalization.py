@@ -0,0 +1,77 @@
+"""
+Unit tests for memoized URL canonicalization.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from btc_max_knowledge_agent.utils import url_utils
+from btc_max_knowledge_agent.utils.result_formatter import QueryResultFormatter
+from btc_max_knowledge_agent.utils.url_utils import (
+    canonicalize_url,
+    canonicalize_urls,
+    sanitize_url_for_storage,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    url_utils.clear_validation_cache()
+    yield
+    url_utils.clear_validation_cache()
+
+
+def test_structured_result_for_valid_url():
+    result = canonicalize_url("HTTPS://Bitcoin.ORG/en/")
+
+    assert result.is_valid
+    assert result.verdict == "valid"
+    assert (result.scheme, result.host) == ("https", "bitcoin.org")
+    assert result.normalized == sanitize_url_for_storage("HTTPS://Bitcoin.ORG/en/")
+
+
+@pytest.mark.parametrize(
+    "url, verdict",
+    [
+        ("", "empty"),
+        (None, "empty"),
+        ("javascript:alert(1)", "unsanitizable"),
+        ("http://10.0.0.1/admin", "insecure"),
+    ],
+)
+def test_rejections_report_first_failing_step(url, verdict):
+    result = canonicalize_url(url)
+    assert not result.is_valid
+    assert result.verdict == verdict
+    assert result.normalized is None
+
+
+def test_repeated_calls_are_served_from_cache():
+    hits_before = url_utils.get_canonical_cache_stats()["hits"]
+    with patch.object(
+        url_utils, "normalize_url_rfc3986", wraps=url_utils.normalize_url_rfc3986
+    ) as normalize:
+        for _ in range(5):
+            assert sanitize_url_for_storage("https://bitcoin.org/bitcoin.pdf")
+            QueryResultFormatter._validate_url("https://bitcoin.org/bitcoin.pdf")
+
+    assert normalize.call_count == 1
+    assert url_utils.get_canonical_cache_stats()["hits"] - hits_before == 9
+
+
+def test_batch_dedupes_input():
+    urls = ["https://a.example.com/x"] * 3 + ["https://b.example.com/", "bad url"]
+
+    with patch.object(
+        url_utils, "_canonicalize_uncached", wraps=url_utils._canonicalize_uncached
+    ) as uncached:
+        results = canonicalize_urls(urls)
+
+    assert list(results) == [
+        "https://a.example.com/x",
+        "https://b.example.com/",
+        "bad url",
+    ]
+    assert uncached.call_count == 3
+    assert not results["bad url"].is_valid